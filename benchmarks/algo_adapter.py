@@ -0,0 +1,148 @@
+"""Benchmark the stages of the algorithm adapters on synthetic tables and relationships.
+
+Prints the time of a single call for each size:
+
+    python benchmarks/algo_adapter.py relationships [--sizes 1000 5000 12000]
+
+Benchmarks:
+    relationships: `make_up_relationships`, with 0.75 relationships per table
+    unique-refs: `get_unique_refs`, a third of the relationships being duplicates
+    enrich: `enrich_tables_from_relationships` with 20 columns and a 200-line raw SQL per table,
+        along with the memory peak measured by tracemalloc
+    columns: `get_table` with N manifest columns, half of them also in the catalog
+"""
+
+import argparse
+import logging
+import random
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable
+
+from dbterd.adapters.algos.test_relationship import TestRelationshipAlgo
+from dbterd.core.models import Column, Ref, Table
+from dbterd.helpers.log import logger
+
+
+RELATIONSHIPS_PER_TABLE = 0.75
+
+
+def make_tables(count: int, columns: int = 1, raw_sql_lines: int = 0) -> list[Table]:
+    """Make tables named `model.pkg.t<i>`, each with an `id` column and `columns - 1` other ones."""
+    return [
+        Table(
+            name=f"model.pkg.t{i}",
+            node_name=f"model.pkg.t{i}",
+            database="db",
+            schema="analytics",
+            columns=[Column(name="id", data_type="int")] + [Column(name=f"c{j}") for j in range(1, columns)],
+            raw_sql="\n".join(f"select {j} as c{j}, * from db.analytics.t{i}" for j in range(raw_sql_lines)),
+        )
+        for i in range(count)
+    ]
+
+
+def make_relationships(tables: list[Table], seed: int = 0) -> list[Ref]:
+    """Make `RELATIONSHIPS_PER_TABLE` relationships per table, each one from a random table to another."""
+    rng = random.Random(seed)
+    relationships = []
+    for i in range(int(len(tables) * RELATIONSHIPS_PER_TABLE)):
+        child, parent = rng.sample(tables, 2)
+        relationships.append(
+            Ref(
+                name=f"test.pkg.relationships_{i}",
+                table_map=(parent.node_name, child.node_name),
+                column_map=("id", f"{parent.node_name.split('.')[-1]}_id"),
+            )
+        )
+    return relationships
+
+
+def measure(func: Callable[[], object], rounds: int = 1) -> float:
+    """Get the mean time of a function call over the rounds, in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def bench_relationships(size: int) -> str:
+    algo = TestRelationshipAlgo()
+    tables = make_tables(size)
+    relationships = make_relationships(tables)
+    elapsed = measure(lambda: algo.make_up_relationships(relationships=relationships, tables=tables))
+    return f"{size:>8,} tables {elapsed:>12.1f} ms"
+
+
+def bench_unique_refs(size: int) -> str:
+    algo = TestRelationshipAlgo()
+    distinct = make_relationships(make_tables(int(size * 2 / 3 / RELATIONSHIPS_PER_TABLE)))
+    duplicates = random.Random(0).choices(distinct, k=size - len(distinct))
+    refs = [Ref(name=f"{x.name}_dup", table_map=x.table_map, column_map=x.column_map) for x in duplicates]
+    refs = distinct + refs
+    random.Random(0).shuffle(refs)
+    elapsed = measure(lambda: algo.get_unique_refs(refs=refs))
+    return f"{len(refs):>8,} refs {elapsed:>12.1f} ms"
+
+
+def bench_enrich(size: int) -> str:
+    algo = TestRelationshipAlgo()
+    tables = make_tables(size, columns=20, raw_sql_lines=200)
+    relationships = make_relationships(tables)
+    tracemalloc.start()
+    elapsed = measure(lambda: algo.enrich_tables_from_relationships(tables=tables, relationships=relationships))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return f"{size:>8,} tables {elapsed:>12.1f} ms, peak {peak / 1024 / 1024:.1f} MiB"
+
+
+def bench_columns(size: int) -> str:
+    algo = TestRelationshipAlgo()
+    manifest_node = SimpleNamespace(
+        database="db",
+        schema_="analytics",
+        identifier="t0",
+        description="",
+        meta={},
+        compiled_code="select 1",
+        columns={f"C{i}": SimpleNamespace(data_type="text", description=f"column {i}") for i in range(size)},
+    )
+    catalog_node = SimpleNamespace(
+        columns={f"c{i}": SimpleNamespace(type="TEXT", comment="") for i in range(0, size, 2)},
+    )
+    elapsed = measure(
+        lambda: algo.get_table(
+            node_name="model.pkg.t0",
+            manifest_node=manifest_node,
+            catalog_node=catalog_node,
+            entity_name_format="resource.package.model",
+        ),
+        rounds=10,
+    )
+    return f"{size:>8,} columns {elapsed:>11.2f} ms"
+
+
+BENCHMARKS: dict[str, tuple[Callable[[int], str], list[int]]] = {
+    "relationships": (bench_relationships, [1_000, 5_000, 12_000, 25_000, 50_000]),
+    "unique-refs": (bench_unique_refs, [1_500, 7_500, 15_000, 75_000]),
+    "enrich": (bench_enrich, [1_000, 5_000]),
+    "columns": (bench_columns, [100, 800, 3_000]),
+}
+"""Benchmark functions by name, along with their default sizes."""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=list(BENCHMARKS))
+    parser.add_argument("--sizes", type=int, nargs="+", help="Sizes to measure, the quoted ones by default")
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    bench, default_sizes = BENCHMARKS[args.benchmark]
+    for size in args.sizes or default_sizes:
+        print(bench(size), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark the decoding and encoding of the sample artifacts with each installed JSON backend.
+
+Prints the mean time of in-process rounds, in milliseconds, for each artifact file and backend.
+The stdlib `json` backend gives the figures from before the pluggable backends:
+
+    python benchmarks/json_backends.py [--rounds 10] [--samples shopify dbtresto]
+"""
+
+import argparse
+from pathlib import Path
+import time
+
+from dbterd.helpers import json_backend
+
+
+SAMPLES_DIR = Path(__file__).parents[1] / "samples"
+
+
+def measure(func, rounds: int) -> float:
+    """Get the mean time of a function call over the rounds, in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=10, help="Rounds per measurement")
+    parser.add_argument("--samples", nargs="+", default=["shopify", "dbtresto"], help="Projects of samples/")
+    args = parser.parse_args()
+
+    backends = json_backend.get_available_backends()
+    print(f"{'artifact':<28}" + "".join(f"{x + ' decode/encode':>26}" for x in backends))
+    for sample in args.samples:
+        for filename in ("manifest.json", "catalog.json"):
+            content = (SAMPLES_DIR / sample / filename).read_bytes()
+            results = []
+            for name in backends:
+                backend = json_backend.resolve_backend(name)
+                data = content if backend.binary else content.decode("utf-8")
+                decoded = backend.loads(data)
+                decode_ms = measure(lambda backend=backend, data=data: backend.loads(data), args.rounds)
+                encode_ms = measure(lambda backend=backend, decoded=decoded: backend.dumps(decoded), args.rounds)
+                results.append(f"{decode_ms:.1f}/{encode_ms:.1f}")
+            label = f"{sample} {filename.split('.')[0]} ({len(content) / 1024 / 1024:.1f}MB)"
+            print(f"{label:<28}" + "".join(f"{x:>26}" for x in results))
+
+
+if __name__ == "__main__":
+    main()
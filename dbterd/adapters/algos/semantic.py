@@ -4,11 +4,11 @@ This module extracts tables and relationships from dbt artifacts
 using dbt's Semantic Layer entities to determine connections.
 """
 
-from typing import Optional, Union
+from functools import partial
 
 from dbterd.constants import TEST_META_RELATIONSHIP_TYPE
 from dbterd.core.adapters.algo import BaseAlgoAdapter
-from dbterd.core.models import Ref, SemanticEntity, Table
+from dbterd.core.models import Ref, RelationshipGraph, SemanticEntity, Table
 from dbterd.core.registry.decorators import register_algo
 from dbterd.helpers.log import logger
 from dbterd.types import Catalog, Manifest
@@ -22,24 +22,18 @@ class SemanticAlgo(BaseAlgoAdapter):
     (primary/foreign entities) to determine table connections.
     """
 
+    supports_artifact_cache = True
+
     def parse_artifacts(self, manifest: Manifest, catalog: Catalog, **kwargs) -> tuple[list[Table], list[Ref]]:
         """Parse from file-based manifest/catalog artifacts."""
-        # Parse Table
-        tables = self.get_tables(manifest=manifest, catalog=catalog, **kwargs)
-        tables = self.filter_tables_based_on_selection(tables=tables, **kwargs)
+        tables, relationships = self.extract_artifacts(manifest=manifest, catalog=catalog, **kwargs)
+        return self.select_parsed(tables=tables, relationships=relationships, **kwargs)
 
-        # Parse Ref
+    def extract_artifacts(self, manifest: Manifest, catalog: Catalog, **kwargs) -> tuple[list[Table], list[Ref]]:
+        """Extract all tables and semantic relationships, before applying the selection."""
+        tables = self.get_tables(manifest=manifest, catalog=catalog, **kwargs)
         relationships = self.get_relationships(manifest=manifest)
-        relationships = self.make_up_relationships(relationships=relationships, tables=tables)
-
-        # Fulfill columns in Tables (due to `select *`)
-        tables = self.enrich_tables_from_relationships(tables=tables, relationships=relationships)
-
-        logger.info(f"Collected {len(tables)} table(s) and {len(relationships)} relationship(s)")
-        return (
-            sorted(tables, key=lambda tbl: tbl.node_name),
-            sorted(relationships, key=lambda rel: rel.name),
-        )
+        return tables, relationships
 
     def parse_metadata(self, data: dict, **kwargs) -> tuple[list[Table], list[Ref]]:
         """Parse from dbt Cloud metadata API response."""
@@ -47,11 +41,13 @@ class SemanticAlgo(BaseAlgoAdapter):
 
         # Parse Table
         tables = self.get_tables_from_metadata(data=data_list, **kwargs)
-        tables = self.filter_tables_based_on_selection(tables=tables, **kwargs)
 
         # Parse Ref
         relationships = self.get_relationships_from_metadata(data=data_list)
-        relationships = self.make_up_relationships(relationships=relationships, tables=tables)
+        tables = self.filter_tables_based_on_selection(tables=tables, relationships=relationships, **kwargs)
+        relationships = self.make_up_relationships(
+            relationships=relationships, tables=tables, table_index=self.get_table_index(tables=tables)
+        )
 
         logger.info(f"Collected {len(tables)} table(s) and {len(relationships)} relationship(s)")
         return (
@@ -59,37 +55,27 @@ class SemanticAlgo(BaseAlgoAdapter):
             sorted(relationships, key=lambda rel: rel.name),
         )
 
-    def find_related_nodes_by_id(
-        self,
-        manifest: Union[Manifest, dict],
-        node_unique_id: str,
-        type: Optional[str] = None,
-        **kwargs,
-    ) -> list[str]:
-        """Find FK/PK nodes linked to the given node.
+    def get_relationship_graph(self, manifest: Manifest, **kwargs) -> RelationshipGraph:
+        """Get the graph of the models linked through their Semantic Entities.
+
+        The graph is one of the manifest indexes (see `use_manifest_indexes`), so that
+        the single-model ERDs of the same manifest link its entities once.
 
         Args:
             manifest: Manifest data
-            node_unique_id: Manifest model node unique ID
-            type: Manifest type (local file or metadata)
             **kwargs: Additional options
 
         Returns:
-            List of manifest node unique IDs
+            Graph of the manifest node unique IDs
 
         """
-        found_nodes = [node_unique_id]
-        if type == "metadata":  # pragma: no cover
-            return found_nodes  # not supported yet, return input only
-
-        entities = self.get_linked_semantic_entities(manifest=manifest)
-        for foreign, primary in entities:
-            if primary.model == node_unique_id:
-                found_nodes.append(foreign.model)
-            if foreign.model == node_unique_id:
-                found_nodes.append(primary.model)
+        return self.get_manifest_index(manifest, "semantic_graph", partial(self._build_relationship_graph, manifest))
 
-        return list(set(found_nodes))
+    def _build_relationship_graph(self, manifest: Manifest) -> RelationshipGraph:
+        graph = RelationshipGraph()
+        for foreign, primary in self.get_linked_semantic_entities(manifest=manifest):
+            graph.link(primary.model, foreign.model)
+        return graph
 
     def get_semantic_nodes(self, manifest: Manifest) -> list:
         """Extract the Semantic Models.
@@ -101,13 +87,14 @@ class SemanticAlgo(BaseAlgoAdapter):
             List of Semantic Models
 
         """
-        if not hasattr(manifest, "semantic_models"):
+        semantic_models = self.get_manifest_scan(manifest=manifest).semantic_models
+        if semantic_models is None:
             logger.warning(
                 "No relationships will be captured since dbt version is NOT supported for the Semantic Models"
             )
             return []
 
-        return [x for x in manifest.semantic_models if len(manifest.semantic_models[x].depends_on.nodes)]
+        return [x for x in semantic_models if len(manifest.semantic_models[x].depends_on.nodes)]
 
     def get_semantic_entities(
         self,
@@ -200,6 +187,31 @@ class SemanticAlgo(BaseAlgoAdapter):
             [x for x in semantic_entities if x.entity_type == pk_type],
         )
 
+    def link_semantic_entities(
+        self,
+        foreigns: list[SemanticEntity],
+        primaries: list[SemanticEntity],
+    ) -> list[tuple[SemanticEntity, SemanticEntity]]:
+        """Join the FK entities to the PK entities having the same entity name.
+
+        Args:
+            foreigns: FK entities
+            primaries: PK entities
+
+        Returns:
+            List of (FK, PK) entity tuples, in the FK then PK order
+
+        """
+        primaries_by_name: dict[str, list[SemanticEntity]] = {}
+        for primary_entity in primaries:
+            primaries_by_name.setdefault(primary_entity.entity_name, []).append(primary_entity)
+
+        return [
+            (foreign_entity, primary_entity)
+            for foreign_entity in foreigns
+            for primary_entity in primaries_by_name.get(foreign_entity.entity_name, [])
+        ]
+
     def get_linked_semantic_entities(
         self,
         manifest: Manifest,
@@ -214,12 +226,7 @@ class SemanticAlgo(BaseAlgoAdapter):
 
         """
         foreigns, primaries = self.get_semantic_entities(manifest=manifest)
-        linked_entities = []
-        for foreign_entity in foreigns:
-            for primary_entity in primaries:
-                if foreign_entity.entity_name == primary_entity.entity_name:
-                    linked_entities.append((foreign_entity, primary_entity))
-        return linked_entities
+        return self.link_semantic_entities(foreigns=foreigns, primaries=primaries)
 
     def get_linked_semantic_entities_from_metadata(
         self,
@@ -235,12 +242,7 @@ class SemanticAlgo(BaseAlgoAdapter):
 
         """
         foreigns, primaries = self.get_semantic_entities_from_metadata(data=data)
-        linked_entities = []
-        for foreign_entity in foreigns:
-            for primary_entity in primaries:
-                if foreign_entity.entity_name == primary_entity.entity_name:
-                    linked_entities.append((foreign_entity, primary_entity))
-        return linked_entities
+        return self.link_semantic_entities(foreigns=foreigns, primaries=primaries)
 
     def get_relationships(self, manifest: Manifest) -> list[Ref]:
         """Extract relationships from dbt artifacts based on Semantic Entities.
@@ -4,7 +4,11 @@ This module extracts tables and relationships from dbt artifacts
 using dbt's relationship tests to determine connections.
 """
 
-from typing import Optional, Union
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+import re
+from typing import ClassVar, Optional
 
 import click
 
@@ -14,7 +18,8 @@ from dbterd.constants import (
     TEST_META_RELATIONSHIP_TYPE,
 )
 from dbterd.core.adapters.algo import BaseAlgoAdapter
-from dbterd.core.models import Ref, Table
+from dbterd.core.manifest_scan import ManifestScan
+from dbterd.core.models import Ref, RelationshipGraph, Table
 from dbterd.core.registry.decorators import register_algo
 from dbterd.helpers.log import logger
 from dbterd.types import Catalog, Manifest
@@ -24,6 +29,178 @@ from dbterd.types import Catalog, Manifest
 MAX_TEST_PARENTS = 2
 
 
+@dataclass(frozen=True, eq=False)
+class AlgoRule(Mapping):
+    """Parsed rule of the `test_relationship` algorithm, see `TestRelationshipAlgo.get_algo_rule`.
+
+    It is also a read-only mapping of the rule keys, e.g. `rule["c_from"]` or
+    `rule.get("c_to")`, equal to the dict formerly returned by `get_algo_rule`.
+    """
+
+    KEYS: ClassVar[tuple[str, ...]] = ("name", "c_from", "c_to", "t_to")
+
+    name: str = "relationship"
+    c_from: str = "column_name"
+    c_to: str = "field"
+    t_to: str = "to"
+    extras: tuple[tuple[str, str], ...] = ()
+    """(key, value) of the rule keys unknown to the algorithm, kept for the subclasses reading them."""
+
+    @classmethod
+    def parse(cls, rule: Optional[str] = None) -> "AlgoRule":
+        """Parse and validate a rule string e.g. `(name:foreign_key|c_to:pk_column_name)`.
+
+        Unknown keys are kept in `extras`, with a warning.
+
+        Args:
+            rule: Rule string, the default rule if empty
+
+        Raises:
+            ValueError: Malformed rule
+
+        Returns:
+            Rule object, with the defaults for the keys not given
+        """
+        rule = (rule or DEFAULT_ALGO_RULE).replace(" ", "")
+        if not (rule.startswith("(") and rule.endswith(")")):
+            raise ValueError(f"Rule must be enclosed in brackets e.g. {DEFAULT_ALGO_RULE}, got {rule!r}")
+
+        values = {}
+        extras = {}
+        for arg in rule[1:-1].split("|"):
+            key, _, value = arg.partition(":")
+            if not value:
+                raise ValueError(f"Missing value of the rule key {key!r} in {rule!r}")
+            if key in cls.KEYS:
+                values[key] = value
+            else:
+                logger.warning(f"Unknown rule key {key!r} in {rule!r}, expected one of: {', '.join(cls.KEYS)}")
+                extras[key] = value
+        values["name"] = values.get("name", cls.name).lower()
+        return cls(**values, extras=tuple(extras.items()))
+
+    def __getitem__(self, key: str) -> str:
+        if key in self.KEYS:
+            return getattr(self, key)
+        for extra_key, value in self.extras:
+            if extra_key == key:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.KEYS
+        yield from (x for x, _ in self.extras)
+
+    def __len__(self) -> int:
+        return len(self.KEYS) + len(self.extras)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.items()))
+
+
+@lru_cache(maxsize=32)
+def _parse_algo_option(algo: str) -> AlgoRule:
+    """Parse the rule of an --algo option value, once per value."""
+    _, _, rule = algo.partition(":")
+    return AlgoRule.parse(rule)
+
+
+class RelationshipTestIndex:
+    """Index of the test nodes of a manifest, built from the test node IDs of its `ManifestScan`.
+
+    For each rule name, it holds the matching test nodes and the graph
+    of the models linked by these tests, which turns the lookups into dictionary hits.
+    """
+
+    __slots__ = ("_by_rule_name", "_tests", "manifest")
+
+    def __init__(self, manifest_scan: ManifestScan):
+        self.manifest = manifest_scan.manifest
+        self._tests: list[tuple[str, str]] = [(x, x.lower()) for x in manifest_scan.tests]
+        self._by_rule_name: dict[str, tuple[list[str], RelationshipGraph]] = {}
+
+    def _get_rule_index(self, rule_name: str) -> tuple[list[str], RelationshipGraph]:
+        if rule_name not in self._by_rule_name:
+            test_nodes = []
+            graph = RelationshipGraph()
+            for unique_id, lower_unique_id in self._tests:
+                if rule_name not in lower_unique_id:
+                    continue
+                node = self.manifest.nodes[unique_id]
+                if node.meta.get(TEST_META_IGNORE_IN_ERD, "0") != "0":
+                    continue
+                test_nodes.append(unique_id)
+                graph.link(*(node.depends_on.nodes or []))
+            self._by_rule_name[rule_name] = (test_nodes, graph)
+        return self._by_rule_name[rule_name]
+
+    def get_test_nodes(self, rule_name: str) -> list[str]:
+        """Get the test nodes whose unique ID contains the rule name, in the manifest order."""
+        return list(self._get_rule_index(rule_name)[0])
+
+    def get_graph(self, rule_name: str) -> RelationshipGraph:
+        """Get the graph of the nodes linked by the test nodes of the rule name."""
+        return self._get_rule_index(rule_name)[1]
+
+
+_REF_TARGET_PATTERN = re.compile(r"\s*(ref|source)\s*\((.*)\)\s*")
+
+
+def _parse_ref_target(value: str) -> Optional[tuple[str, ...]]:
+    """Parse a `ref(...)` or `source(...)` call, e.g. the `to` kwarg of a relationship test.
+
+    Args:
+        value: Call string, e.g. `ref('orders')` or `source("shop", "orders")`
+
+    Returns:
+        Function name followed by the unquoted arguments e.g. ("ref", "orders"),
+        or None if the value isn't such a call with quoted arguments only
+    """
+    match = _REF_TARGET_PATTERN.fullmatch(value)
+    if not match:
+        return None
+    arguments = [x.strip() for x in match.group(2).split(",")]
+    if not all(len(x) > 1 and x[0] == x[-1] and x[0] in "'\"" for x in arguments):
+        return None
+    return (match.group(1), *(x[1:-1] for x in arguments))
+
+
+def _get_ref_targets(unique_id: str) -> tuple[tuple[str, ...], ...]:
+    """Get the parsed `ref(...)` or `source(...)` calls referring to a node, see `_parse_ref_target`.
+
+    Args:
+        unique_id: Node unique ID e.g. `model.package.orders` or `source.package.shop.orders`
+
+    Returns:
+        Parsed calls e.g. (("ref", "orders", "orders"), ("ref", "orders"))
+    """
+    parts = unique_id.split(".")
+    function = "source" if parts[0] == "source" else "ref"
+    return (function, parts[2], parts[-1]), (function, parts[-1])
+
+
+class RefTargetIndex:
+    """Memo of the parsed `ref(...)` or `source(...)` calls of a metadata parse.
+
+    It lives as long as the parse, so that each distinct `to` value and
+    parent node is parsed once however many relationship tests refer to it.
+    """
+
+    __slots__ = ("_node_targets", "_parsed_targets")
+
+    def __init__(self):
+        self._parsed_targets: dict[str, Optional[tuple[str, ...]]] = {}
+        self._node_targets: dict[str, tuple[tuple[str, ...], ...]] = {}
+
+    def refers_to(self, value: str, unique_id: str) -> bool:
+        """Check whether a call string e.g. `ref('orders')` refers to a node, see `_get_ref_targets`."""
+        if value not in self._parsed_targets:
+            self._parsed_targets[value] = _parse_ref_target(value)
+        if unique_id not in self._node_targets:
+            self._node_targets[unique_id] = _get_ref_targets(unique_id)
+        return self._parsed_targets[value] in self._node_targets[unique_id]
+
+
 def _extract_column_name(kwargs: dict, rule_key: str) -> str:
     """Extract and normalize column name from test metadata kwargs.
 
@@ -46,34 +223,30 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
     to determine table connections in the ERD.
     """
 
+    supports_artifact_cache = True
+
     def parse_artifacts(self, manifest: Manifest, catalog: Catalog, **kwargs) -> tuple[list[Table], list[Ref]]:
         """Parse from file-based manifest/catalog artifacts."""
-        # Parse Table
-        tables = self.get_tables(manifest=manifest, catalog=catalog, **kwargs)
-        tables = self.filter_tables_based_on_selection(tables=tables, **kwargs)
+        tables, relationships = self.extract_artifacts(manifest=manifest, catalog=catalog, **kwargs)
+        return self.select_parsed(tables=tables, relationships=relationships, **kwargs)
 
-        # Parse Ref
+    def extract_artifacts(self, manifest: Manifest, catalog: Catalog, **kwargs) -> tuple[list[Table], list[Ref]]:
+        """Extract all tables and test relationships, before applying the selection."""
+        tables = self.get_tables(manifest=manifest, catalog=catalog, **kwargs)
         relationships = self.get_relationships(manifest=manifest, **kwargs)
-        relationships = self.make_up_relationships(relationships=relationships, tables=tables)
-
-        # Fulfill columns in Tables (due to `select *`)
-        tables = self.enrich_tables_from_relationships(tables=tables, relationships=relationships)
-
-        logger.info(f"Collected {len(tables)} table(s) and {len(relationships)} relationship(s)")
-        return (
-            sorted(tables, key=lambda tbl: tbl.node_name),
-            sorted(relationships, key=lambda rel: rel.name),
-        )
+        return tables, relationships
 
     def parse_metadata(self, data: dict, **kwargs) -> tuple[list[Table], list[Ref]]:
         """Parse from dbt Cloud metadata API response."""
         # Parse Table
         tables = self.get_tables_from_metadata(data=data, **kwargs)
-        tables = self.filter_tables_based_on_selection(tables=tables, **kwargs)
 
         # Parse Ref
         relationships = self.get_relationships_from_metadata(data=data, **kwargs)
-        relationships = self.make_up_relationships(relationships=relationships, tables=tables)
+        tables = self.filter_tables_based_on_selection(tables=tables, relationships=relationships, **kwargs)
+        relationships = self.make_up_relationships(
+            relationships=relationships, tables=tables, table_index=self.get_table_index(tables=tables)
+        )
 
         logger.info(f"Collected {len(tables)} table(s) and {len(relationships)} relationship(s)")
         return (
@@ -81,38 +254,19 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
             sorted(relationships, key=lambda rel: rel.name),
         )
 
-    def find_related_nodes_by_id(
-        self,
-        manifest: Union[Manifest, dict],
-        node_unique_id: str,
-        type: Optional[str] = None,
-        **kwargs,
-    ) -> list[str]:
-        """Find FK models related to the input model ID.
+    def get_relationship_graph(self, manifest: Manifest, **kwargs) -> RelationshipGraph:
+        """Get the graph of the models linked by the relationship tests of the algo rule.
 
         Args:
             manifest: Manifest data
-            node_unique_id: Manifest node unique ID
-            type: Manifest type (local file or metadata)
             **kwargs: Additional options
 
         Returns:
-            List of manifest node unique IDs
+            Graph of the manifest node unique IDs
 
         """
-        found_nodes = [node_unique_id]
-        if type == "metadata":
-            return found_nodes  # not supported yet, return input only
-
         rule = self.get_algo_rule(**kwargs)
-        test_nodes = self.get_test_nodes_by_rule_name(manifest=manifest, rule_name=rule.get("name").lower())
-
-        for test_node in test_nodes:
-            nodes = manifest.nodes[test_node].depends_on.nodes or []
-            if node_unique_id in nodes:
-                found_nodes.extend(nodes)
-
-        return list(set(found_nodes))
+        return self.get_test_index(manifest=manifest).get_graph(rule_name=rule.name)
 
     def get_relationships(self, manifest: Manifest, **kwargs) -> list[Ref]:
         """Extract relationships from dbt artifacts based on test relationship.
@@ -132,18 +286,18 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
         refs = [
             Ref(
                 name=x,
-                table_map=self.get_table_map(test_node=manifest.nodes[x], **kwargs),
+                table_map=self.get_table_map(test_node=manifest.nodes[x], rule=rule, **kwargs),
                 column_map=[
-                    _extract_column_name(manifest.nodes[x].test_metadata.kwargs, rule.get("c_to")),
+                    _extract_column_name(manifest.nodes[x].test_metadata.kwargs, rule.c_to),
                     (
                         str(manifest.nodes[x].test_metadata.kwargs.get("column_name") or "").replace('"', "").lower()
-                        or _extract_column_name(manifest.nodes[x].test_metadata.kwargs, rule.get("c_from"))
+                        or _extract_column_name(manifest.nodes[x].test_metadata.kwargs, rule.c_from)
                     ),
                 ],
                 type=self.get_relationship_type(manifest.nodes[x].meta.get(TEST_META_RELATIONSHIP_TYPE, "")),
                 relationship_label=manifest.nodes[x].meta.get("relationship_label"),
             )
-            for x in self.get_test_nodes_by_rule_name(manifest=manifest, rule_name=rule.get("name").lower())
+            for x in self.get_test_nodes_by_rule_name(manifest=manifest, rule_name=rule.name)
         ]
 
         return self.get_unique_refs(refs=refs)
@@ -165,27 +319,31 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
             data = []
         refs = []
         rule = self.get_algo_rule(**kwargs)
+        ref_targets = RefTargetIndex()
 
         for data_item in data:
             for test in data_item.get("tests", {}).get("edges", []):
-                test_id = test.get("node", {}).get("uniqueId", "")
-                test_meta = test.get("node", {}).get("meta", {})
+                test_node = test.get("node", {})
+                test_id = test_node.get("uniqueId", "")
+                test_meta = test_node.get("meta", {})
                 if (
                     test_id.startswith("test")
-                    and rule.get("name").lower() in test_id.lower()
+                    and rule.name in test_id.lower()
                     and test_meta is not None
                     and test_meta.get(TEST_META_IGNORE_IN_ERD, "0") == "0"
                 ):
-                    test_metadata_kwargs = test.get("node", {}).get("testMetadata", {}).get("kwargs", {})
+                    test_metadata_kwargs = test_node.get("testMetadata", {}).get("kwargs", {})
                     refs.append(
                         Ref(
                             name=test_id,
-                            table_map=self.get_table_map_from_metadata(test_node=test, **kwargs),
+                            table_map=self.get_table_map_from_metadata(
+                                test_node=test, rule=rule, ref_targets=ref_targets, **kwargs
+                            ),
                             column_map=[
-                                _extract_column_name(test_metadata_kwargs, rule.get("c_to")),
+                                _extract_column_name(test_metadata_kwargs, rule.c_to),
                                 (
                                     str(test_metadata_kwargs.get("columnName") or "").replace('"', "").lower()
-                                    or _extract_column_name(test_metadata_kwargs, rule.get("c_from"))
+                                    or _extract_column_name(test_metadata_kwargs, rule.c_from)
                                 ),
                             ],
                             type=self.get_relationship_type(test_meta.get(TEST_META_RELATIONSHIP_TYPE, "")),
@@ -195,8 +353,26 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
 
         return self.get_unique_refs(refs=refs)
 
-    def get_algo_rule(self, **kwargs) -> dict[str, str]:
-        """Extract rule from the --algo option.
+    def compile_rule(self, rule: Optional[str] = None) -> AlgoRule:
+        """Parse and validate the rule of the --algo option.
+
+        Args:
+            rule (str, optional): Rule string following the algorithm name
+
+        Raises:
+            ValueError: Malformed rule
+
+        Returns:
+            AlgoRule: Rule object
+
+        """
+        return AlgoRule.parse(rule)
+
+    def get_algo_rule(self, **kwargs) -> AlgoRule:
+        """Get the rule of the --algo option.
+
+        This is the rule compiled when loading the algorithm, or else
+        the one parsed from the `algo` option.
 
         Args:
             **kwargs: Additional options including:
@@ -215,7 +391,7 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
             )
 
         Returns:
-            dict: Rule object (
+            AlgoRule: Rule object (
                 name [default 'relationship', use contains],
                 c_from [default 'column_name'],
                 c_to [default 'field'],
@@ -223,14 +399,9 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
             )
 
         """
-        algo_parts = (kwargs.get("algo") or "").replace(" ", "").split(":", 1)
-        rules, _ = (
-            algo_parts[1] if len(algo_parts) > 1 else DEFAULT_ALGO_RULE,
-            algo_parts[0],
-        )
-        rules = rules[1:-1]  # remove brackets
-        rules = dict(arg.split(":") for arg in rules.split("|"))
-        return rules
+        if self.rule is not None:
+            return self.rule
+        return _parse_algo_option(kwargs.get("algo") or "")
 
     def get_test_nodes_by_rule_name(self, manifest: Manifest, rule_name: str) -> list:
         """Get manifest nodes given the algo rule name.
@@ -246,21 +417,33 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
             List: List of manifest nodes
 
         """
-        return [
-            x
-            for x in manifest.nodes
-            if (
-                x.startswith("test")
-                and rule_name in x.lower()
-                and manifest.nodes[x].meta.get(TEST_META_IGNORE_IN_ERD, "0") == "0"
-            )
-        ]
+        return self.get_test_index(manifest=manifest).get_test_nodes(rule_name=rule_name)
+
+    def get_test_index(self, manifest: Manifest) -> RelationshipTestIndex:
+        """Get the test node index of the manifest.
+
+        The index is one of the manifest indexes (see `use_manifest_indexes`), so that
+        the single-model ERDs finding the related nodes then extracting the relationships scan it once.
 
-    def get_table_map(self, test_node, **kwargs) -> list[str]:
+        Args:
+            manifest (Manifest): Manifest data
+
+        Returns:
+            RelationshipTestIndex: Test node index
+
+        """
+        return self.get_manifest_index(
+            manifest,
+            "test_index",
+            lambda: RelationshipTestIndex(manifest_scan=self.get_manifest_scan(manifest=manifest)),
+        )
+
+    def get_table_map(self, test_node, rule: Optional[AlgoRule] = None, **kwargs) -> list[str]:
         """Get the table map with order of [to, from] guaranteed.
 
         Args:
             test_node (dict): Manifest Test node
+            rule (AlgoRule, optional): Algo rule, see `get_algo_rule` if not given
             **kwargs: Additional options passed from parent functions
 
         Returns:
@@ -274,20 +457,28 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
         if len(map) == 1:
             return [map[0], map[0]]
 
-        rule = self.get_algo_rule(**kwargs)
-        to_model = str(test_node.test_metadata.kwargs.get(rule.get("t_to", "to"), {}))
+        rule = rule or self.get_algo_rule(**kwargs)
+        to_model = str(test_node.test_metadata.kwargs.get(rule.t_to, {}))
         if f'("{map[1].split(".")[-1]}")'.lower() in to_model.replace("'", '"').lower():
             return [map[1], map[0]]
 
         return map
 
-    def get_table_map_from_metadata(self, test_node, **kwargs) -> list[str]:
+    def get_table_map_from_metadata(
+        self,
+        test_node,
+        rule: Optional[AlgoRule] = None,
+        ref_targets: Optional[RefTargetIndex] = None,
+        **kwargs,
+    ) -> list[str]:
         """Get the table map with order of [to, from] guaranteed.
 
         (for Metadata)
 
         Args:
             test_node (dict): Metadata test node
+            rule (AlgoRule, optional): Algo rule, see `get_algo_rule` if not given
+            ref_targets (RefTargetIndex, optional): Parsed calls of the current parse, a new one if not given
             **kwargs: Additional options passed from parent functions
 
         Raises:
@@ -297,12 +488,14 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
             list: [to model, from model]
 
         """
-        rule = self.get_algo_rule(**kwargs)
+        rule = rule or self.get_algo_rule(**kwargs)
 
+        node = test_node.get("node", {})
+        resource_types = kwargs.get("resource_type", [])
         test_parents = []
-        for parent in test_node.get("node", {}).get("parents", []):
+        for parent in node.get("parents", []):
             parent_id = parent.get("uniqueId", "")
-            if parent_id.split(".")[0] in kwargs.get("resource_type", []):
+            if parent_id.split(".")[0] in resource_types:
                 test_parents.append(parent_id)
 
         if len(test_parents) == 0:
@@ -315,21 +508,9 @@ class TestRelationshipAlgo(BaseAlgoAdapter):
             logger.debug(f"Collected test parents: {test_parents}")
             raise click.BadParameter("Relationship test unexpectedly doesn't have >2 parents")
 
-        test_metadata_to = (
-            test_node.get("node", {}).get("testMetadata", {}).get("kwargs", {}).get(rule.get("t_to", "to"), "")
-        )
-
-        first_test_parent_parts = test_parents[0].split(".")
-        first_test_parent_resource_type = (
-            "ref" if first_test_parent_parts[0] != "source" else first_test_parent_parts[0]
-        )
-        to_model_possible_values = [
-            f"{first_test_parent_resource_type}('{first_test_parent_parts[2]}', '{first_test_parent_parts[-1]}')",
-            f"{first_test_parent_resource_type}('{first_test_parent_parts[-1]}')",
-            f'{first_test_parent_resource_type}("{first_test_parent_parts[2]}", "{first_test_parent_parts[-1]}")',
-            f'{first_test_parent_resource_type}("{first_test_parent_parts[-1]}")',
-        ]
-        if test_metadata_to in to_model_possible_values:
+        test_metadata_to = node.get("testMetadata", {}).get("kwargs", {}).get(rule.t_to, "")
+        ref_targets = ref_targets or RefTargetIndex()
+        if isinstance(test_metadata_to, str) and ref_targets.refers_to(test_metadata_to, test_parents[0]):
             return test_parents
 
         return list(reversed(test_parents))
@@ -4,12 +4,13 @@ This module converts parsed dbt artifacts into DrawDB JSON format
 for visualization with DrawDB tools.
 """
 
+from itertools import count
 import json
 from typing import ClassVar
 
 from dbterd.core.adapters.target import BaseTargetAdapter
 from dbterd.core.builder.json_builder import JsonERDBuilder
-from dbterd.core.models import Ref, Table
+from dbterd.core.models import ColumnIndex, Ref, Table
 from dbterd.core.registry.decorators import register_target
 
 
@@ -57,9 +58,11 @@ class DrawdbAdapter(BaseTargetAdapter):
                 "types": [],
             }
         )
-        builder.add_tables(tables, lambda t: self.format_table_dict(t, tables.index(t), graphic_tables))
+        # IDs follow the list order, as the builder formats the items one by one
+        table_ids, relationship_ids = count(), count()
+        builder.add_tables(tables, lambda t: self.format_table_dict(t, next(table_ids), graphic_tables))
         builder.add_relationships(
-            relationships, lambda r: self.format_relationship_dict(r, relationships.index(r), graphic_tables)
+            relationships, lambda r: self.format_relationship_dict(r, next(relationship_ids), graphic_tables)
         )
 
         # DrawDB schema - defines exact output structure
@@ -118,20 +121,17 @@ class DrawdbAdapter(BaseTargetAdapter):
             tables: List of parsed tables
 
         Returns:
-            Indexed and layouted tables dict
+            Indexed and layouted tables dict, with the field ids by lowercased column name
 
         """
         graphic_tables: dict = {}
         for idx, table in enumerate(tables):
-            idx_fields: dict = {}
             graphic_tables[table.name] = {
                 "id": idx,
                 "x": 500 * (idx % 4),
                 "y": self.get_y(tables, idx, graphic_tables),
-                "fields": idx_fields,
+                "fields": {name: {"id": idc} for name, idc in ColumnIndex(table.columns).positions().items()},
             }
-            for idc, col in enumerate(table.columns):
-                idx_fields[col.name] = {"id": idc}
 
         return graphic_tables
 
@@ -173,13 +173,13 @@ class DrawdbAdapter(BaseTargetAdapter):
             "startFieldId": (
                 graphic_tables.get(relationship.table_map[1], {})
                 .get("fields", {})
-                .get(relationship.column_map[1], {})
+                .get(relationship.column_map[1].lower(), {})
                 .get("id")
             ),
             "endFieldId": (
                 graphic_tables.get(relationship.table_map[0], {})
                 .get("fields", {})
-                .get(relationship.column_map[0], {})
+                .get(relationship.column_map[0].lower(), {})
                 .get("id")
             ),
             "updateConstraint": "No action",
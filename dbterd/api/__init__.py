@@ -1,5 +1,6 @@
 import logging
 from pathlib import Path
+from typing import Optional
 
 from click import Command, Context
 
@@ -44,6 +45,16 @@ class DbtErd:
         node_fqn="model.jaffle_shop.my_model"
     )
     ```
+
+    ## Get a model's ERD including the models up to 2 relationship levels away
+
+    ```python
+    from dbterd.api import DbtErd
+
+    erd = DbtErd().get_model_erd(
+        node_unique_id="model.jaffle_shop.my_model", depth=2
+    )
+    ```
     """
 
     def __init__(self, **kwargs) -> None:
@@ -70,6 +81,7 @@ class DbtErd:
 
         self.params["select"] = self.params.get("select", [])
         self.params["exclude"] = self.params.get("exclude", [])
+        self.params["select_neighbors"] = self.params.get("select_neighbors", default.default_select_neighbors())
         self.params["resource_type"] = self.params.get("resource_type", default.default_resource_types())
         self.params["algo"] = self.params.get("algo", default.default_algo())
         self.params["entity_name_format"] = self.params.get("entity_name_format", default.default_entity_name_format())
@@ -94,11 +106,11 @@ class DbtErd:
         """
         return self.executor.run(**self.params)
 
-    def get_model_erd(self, node_unique_id: str) -> str:
+    def get_model_erd(self, node_unique_id: str, depth: Optional[int] = 1) -> str:
         """
         Generate ERD code for a model.
 
-        Result contains the input model and 1 level relationship model(s) (if any).
+        Result contains the input model and the relationship model(s) up to `depth` level(s) (if any).
 
         Usage:
 
@@ -106,13 +118,17 @@ class DbtErd:
             from dbterd.api import DbtErd
 
             erd = DbtErd().get_model_erd(node_unique_id="model.jaffle_shop.my_model")
+            erd_2_levels = DbtErd().get_model_erd(
+                node_unique_id="model.jaffle_shop.my_model", depth=2
+            )
             ```
 
         Args:
             - node_unique_id (str): Manifest node unique ID
+            - depth (int): Number of relationship levels around the model, unlimited if None. Default to 1
 
         Returns:
             str: ERD text
 
         """
-        return self.executor.run(node_unique_id=node_unique_id, **self.params)
+        return self.executor.run(node_unique_id=node_unique_id, **{**self.params, "select_neighbors": depth})
@@ -224,6 +224,13 @@ def get_yaml_template(template_type: str = "dbt-core") -> str:
         default_manifest_version=default.default_manifest_version() or "",
         default_catalog_version=default.default_catalog_version() or "",
         default_bypass_validation=str(default.default_bypass_validation()).lower(),
+        default_fast_parse=str(default.default_fast_parse()).lower(),
+        default_stream_parse=str(default.default_stream_parse()).lower(),
+        default_cache=str(default.default_cache()).lower(),
+        default_read_concurrency=default.default_read_concurrency(),
+        default_jobs=default.default_jobs(),
+        default_json_backend=default.default_json_backend(),
+        default_select_neighbors=default.default_select_neighbors(),
         default_algo=default.default_algo(),
         default_entity_name_format=default.default_entity_name_format(),
         default_omit_entity_name_quotes=str(default.default_omit_entity_name_quotes()).lower(),
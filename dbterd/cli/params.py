@@ -3,6 +3,7 @@ import functools
 import click
 
 from dbterd import default
+from dbterd.helpers.json_backend import JSON_BACKENDS
 
 
 def common_params(func):
@@ -22,6 +23,13 @@ def common_params(func):
         multiple=True,
         type=click.STRING,
     )
+    @click.option(
+        "--select-neighbors",
+        help="Add the models within this number of relationship hops from the selected ones",
+        default=default.default_select_neighbors(),
+        show_default=True,
+        type=click.IntRange(min=0),
+    )
     @click.option(
         "--target",
         "-t",
@@ -143,6 +151,50 @@ def run_params(func):
         default=default.default_bypass_validation(),
         show_default=True,
     )
+    @click.option(
+        "--fast-parse",
+        help="Flag to read artifacts as lightweight views, validating only the fields used for the ERD",
+        is_flag=True,
+        default=default.default_fast_parse(),
+        show_default=True,
+    )
+    @click.option(
+        "--stream-parse",
+        help=(
+            "Flag to read manifest.json incrementally, keeping only the fields used for the ERD (implies --fast-parse)"
+        ),
+        is_flag=True,
+        default=default.default_stream_parse(),
+        show_default=True,
+    )
+    @click.option(
+        "--cache",
+        help="Flag to cache the parsed artifacts, reused while manifest.json and catalog.json are unchanged",
+        is_flag=True,
+        default=default.default_cache(),
+        show_default=True,
+    )
+    @click.option(
+        "--read-concurrency",
+        help="Read catalog.json in a worker process while reading manifest.json (auto: on large artifacts only)",
+        type=click.Choice(["auto", "on", "off"], case_sensitive=False),
+        default=default.default_read_concurrency(),
+        show_default=True,
+    )
+    @click.option(
+        "--jobs",
+        help="Number of worker processes building the tables, 0 for all CPUs (large projects only)",
+        default=default.default_jobs(),
+        show_default=True,
+        type=click.IntRange(min=0),
+    )
+    @click.option(
+        "--json-backend",
+        help="JSON library used to decode the artifacts (auto: the fastest installed of orjson, msgspec, json)",
+        type=click.Choice(JSON_BACKENDS, case_sensitive=False),
+        default=default.default_json_backend(),
+        show_default=True,
+    )
     @click.option(
         "--catalog-version",
         "-cv",
@@ -282,6 +334,43 @@ def debug_params(func):
         default=default.default_bypass_validation(),
         show_default=True,
     )
+    @click.option(
+        "--fast-parse",
+        help="Flag to read artifacts as lightweight views, validating only the fields used for the ERD",
+        is_flag=True,
+        default=default.default_fast_parse(),
+        show_default=True,
+    )
+    @click.option(
+        "--stream-parse",
+        help=(
+            "Flag to read manifest.json incrementally, keeping only the fields used for the ERD (implies --fast-parse)"
+        ),
+        is_flag=True,
+        default=default.default_stream_parse(),
+        show_default=True,
+    )
+    @click.option(
+        "--cache",
+        help="Flag to cache the parsed artifacts, reused while manifest.json and catalog.json are unchanged",
+        is_flag=True,
+        default=default.default_cache(),
+        show_default=True,
+    )
+    @click.option(
+        "--read-concurrency",
+        help="Read catalog.json in a worker process while reading manifest.json (auto: on large artifacts only)",
+        type=click.Choice(["auto", "on", "off"], case_sensitive=False),
+        default=default.default_read_concurrency(),
+        show_default=True,
+    )
+    @click.option(
+        "--json-backend",
+        help="JSON library used to decode the artifacts (auto: the fastest installed of orjson, msgspec, json)",
+        type=click.Choice(JSON_BACKENDS, case_sensitive=False),
+        default=default.default_json_backend(),
+        show_default=True,
+    )
     @click.option(
         "--catalog-version",
         "-cv",
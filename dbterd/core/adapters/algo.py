@@ -6,14 +6,90 @@ and defines the interface that subclasses must implement.
 """
 
 from abc import ABC, abstractmethod
-import copy
-from typing import Optional, Union
-
+from collections.abc import Hashable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import fields
+from functools import partial
+from itertools import starmap
+import os
+from sys import intern
+from typing import Any, Callable, ClassVar, Optional, TypeVar, Union
+
+from dbterd.core.artifact_view import CatalogColumns
 from dbterd.core.filter import is_selected_table
-from dbterd.core.models import Column, Ref, Table
+from dbterd.core.manifest_scan import ManifestIndexes, ManifestScan
+from dbterd.core.models import Column, ColumnIndex, LazyValue, Ref, RelationshipGraph, Table
+from dbterd.helpers.log import logger
 from dbterd.types import Catalog, Manifest
 
 
+T = TypeVar("T")
+
+TABLE_JOB_MIN_SIZE = 2000
+"""Minimum number of tables per worker process when building the tables with `--jobs`."""
+
+
+def get_table_jobs(jobs: Optional[int], table_count: int) -> int:
+    """
+    Get the number of worker processes building the tables.
+
+    Args:
+        jobs: Requested number of processes, all the CPUs if 0, a single one if None
+        table_count: Number of tables to build
+
+    Returns:
+        int: Number of processes, capped so that each one builds TABLE_JOB_MIN_SIZE tables at least
+
+    """
+    if jobs is None:
+        return 1
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    return max(1, min(jobs, table_count // TABLE_JOB_MIN_SIZE))
+
+
+TableRecord = tuple[tuple, list[tuple[str, str, str]], bool]
+"""Compact table sent back by the workers: (field values but columns, columns values, whether raw SQL is lazy)."""
+
+_TABLE_RECORD_FIELDS = tuple(x.name for x in fields(Table) if x.name != "columns")
+
+
+def _get_table_shard(
+    adapter_class: type["BaseAlgoAdapter"],
+    rule: Optional[Any],
+    table_nodes: list[tuple[str, Any, Any]],
+    exposure_index: dict[str, list[str]],
+    kwargs: dict,
+) -> list[TableRecord]:
+    """Build a shard of tables in a worker process, see `BaseAlgoAdapter.get_tables_in_workers`.
+
+    Tables are returned as plain tuples, which are much cheaper to pickle than the
+    dataclasses. A lazy raw SQL is left out. The strings interned here stay
+    shared once unpickled, since pickle keeps a single copy of each object.
+    """
+    adapter = adapter_class()
+    adapter.rule = rule
+    records = []
+    for node_name, manifest_node, catalog_node in table_nodes:
+        table = adapter.get_table(
+            node_name=node_name,
+            manifest_node=manifest_node,
+            catalog_node=catalog_node,
+            exposure_index=exposure_index,
+            **kwargs,
+        )
+        lazy_raw_sql = getattr(table, "_lazy_raw_sql", None) is not None
+        records.append(
+            (
+                tuple(None if lazy_raw_sql and x == "raw_sql" else getattr(table, x) for x in _TABLE_RECORD_FIELDS),
+                [(x.name, x.data_type, x.description) for x in table.columns or []],
+                lazy_raw_sql,
+            )
+        )
+    return records
+
+
 class BaseAlgoAdapter(ABC):
     """Base class for all algorithm adapters.
 
@@ -28,8 +104,37 @@ class BaseAlgoAdapter(ABC):
     The parse() method automatically dispatches to parse_metadata() when
     catalog == "metadata", otherwise it calls parse_artifacts().
 
+    Subclasses implementing extract_artifacts also set `supports_artifact_cache`,
+    which enables the --cache option for them.
+
     """
 
+    supports_artifact_cache: ClassVar[bool] = False
+    """Whether `extract_artifacts` is implemented, so that its result can be cached (see `dbterd.core.cache`)."""
+
+    rule: Optional[Any] = None
+    """Rule of the --algo option, set by `Executor.load_algo` with `compile_rule`."""
+
+    _manifest_indexes: Optional[ManifestIndexes] = None
+
+    def compile_rule(self, rule: Optional[str] = None) -> Optional[Any]:
+        """
+        Parse and validate the rule of the --algo option, e.g. `test_relationship:<rule>`.
+
+        Algorithms without rules ignore it.
+
+        Args:
+            rule: Rule string following the algorithm name
+
+        Raises:
+            ValueError: Malformed rule
+
+        Returns:
+            Compiled rule object
+
+        """
+        return None
+
     def parse(self, manifest: Manifest, catalog: Union[str, Catalog], **kwargs) -> tuple[list[Table], list[Ref]]:
         """
         Parse dbt artifacts to extract tables and relationships.
@@ -53,7 +158,50 @@ class BaseAlgoAdapter(ABC):
         """
         if catalog == "metadata":
             return self.parse_metadata(data=manifest, **kwargs)
-        return self.parse_artifacts(manifest=manifest, catalog=catalog, **kwargs)
+        with self.use_manifest_indexes(ManifestIndexes(manifest=manifest)):
+            return self.parse_artifacts(manifest=manifest, catalog=catalog, **kwargs)
+
+    @contextmanager
+    def use_manifest_indexes(self, indexes: ManifestIndexes) -> Iterator[None]:
+        """
+        Look the indexes of the manifest up in the given ones within the block.
+
+        The indexes already in use for the same manifest are kept, e.g. the ones
+        of the executor while it parses this manifest. Outside of such a block,
+        the indexes are built on each request.
+
+        Args:
+            indexes: Indexes of the manifest
+
+        """
+        previous = self._manifest_indexes
+        if previous is not None and previous.manifest is indexes.manifest:
+            yield
+            return
+
+        self._manifest_indexes = indexes
+        try:
+            yield
+        finally:
+            self._manifest_indexes = previous
+
+    def get_manifest_index(self, manifest: Manifest, name: str, build: Callable[[], T]) -> T:
+        """
+        Get an index derived from the manifest, see `use_manifest_indexes`.
+
+        Args:
+            manifest: Manifest data
+            name: Index name
+            build: Function building the index
+
+        Returns:
+            Manifest index
+
+        """
+        indexes = self._manifest_indexes
+        if indexes is None or indexes.manifest is not manifest:
+            return build()
+        return indexes.get(name, build)
 
     @abstractmethod
     def parse_artifacts(self, manifest: Manifest, catalog: Catalog, **kwargs) -> tuple[list[Table], list[Ref]]:
@@ -71,6 +219,60 @@ class BaseAlgoAdapter(ABC):
         """
         pass
 
+    def extract_artifacts(self, manifest: Manifest, catalog: Catalog, **kwargs) -> tuple[list[Table], list[Ref]]:
+        """
+        Extract all tables and relationships from file-based artifacts, before applying the selection.
+
+        The result only depends on the artifacts and on the algo, resource types
+        and entity name format options, which makes it reusable across runs
+        with different targets or selections (see `select_parsed`).
+        Algorithms implementing it set `supports_artifact_cache`.
+
+        Args:
+            manifest: Manifest json
+            catalog: Catalog json
+            **kwargs: Additional options
+
+        Raises:
+            NotImplementedError: The algorithm doesn't support the artifact extraction
+
+        Returns:
+            Tuple of (tables, relationships) with relationships still referring to node names
+
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support the artifact extraction")
+
+    def select_parsed(self, tables: list[Table], relationships: list[Ref], **kwargs) -> tuple[list[Table], list[Ref]]:
+        """
+        Apply the selection to the extracted tables and relationships.
+
+        Args:
+            tables: Tables returned by `extract_artifacts`
+            relationships: Relationships returned by `extract_artifacts`
+            **kwargs: Additional options including:
+                select (list): Selection rules to include tables
+                exclude (list): Rules to exclude tables
+                resource_type (list): Types of resources to include
+                select_neighbors (int): Number of relationship hops to add around the selected tables
+
+        Returns:
+            Tuple of (tables, relationships)
+
+        """
+        tables = self.filter_tables_based_on_selection(tables=tables, relationships=relationships, **kwargs)
+        relationships = self.make_up_relationships(
+            relationships=relationships, tables=tables, table_index=self.get_table_index(tables=tables)
+        )
+
+        # Fulfill columns in Tables (due to `select *`)
+        tables = self.enrich_tables_from_relationships(tables=tables, relationships=relationships)
+
+        logger.info(f"Collected {len(tables)} table(s) and {len(relationships)} relationship(s)")
+        return (
+            sorted(tables, key=lambda tbl: tbl.node_name),
+            sorted(relationships, key=lambda rel: rel.name),
+        )
+
     @abstractmethod
     def parse_metadata(self, data: dict, **kwargs) -> tuple[list[Table], list[Ref]]:
         """
@@ -91,26 +293,50 @@ class BaseAlgoAdapter(ABC):
         manifest: Union[Manifest, dict],
         node_unique_id: str,
         type: Optional[str] = None,
+        depth: Optional[int] = 1,
         **kwargs,
     ) -> list[str]:
         """
         Find FK/PK models related to a given model.
 
         This is used for generating single-model ERDs that include
-        related tables. Override in subclasses to provide algorithm-specific
-        relationship discovery.
+        related tables. The relationships are looked up in the graph of
+        `get_relationship_graph`, override it in subclasses to provide
+        algorithm-specific relationship discovery.
 
         Args:
             manifest: Manifest data
             node_unique_id: Manifest node unique ID
             type: Manifest type ("metadata" or None for file-based)
+            depth: Number of relationship hops from the given model, unlimited if None
+            **kwargs: Additional options
+
+        Returns:
+            List of related manifest node unique IDs, nearest first
+
+        """
+        if type == "metadata":
+            return [node_unique_id]  # not supported yet, return input only
+
+        with self.use_manifest_indexes(ManifestIndexes(manifest=manifest)):
+            graph = self.get_relationship_graph(manifest=manifest, **kwargs)
+        return graph.get_neighborhood(nodes=[node_unique_id], depth=depth)
+
+    def get_relationship_graph(self, manifest: Union[Manifest, dict], **kwargs) -> RelationshipGraph:
+        """
+        Get the graph of the models linked by relationships in the manifest.
+
+        Override in subclasses to support single-model ERDs, the default graph has no relationship.
+
+        Args:
+            manifest: Manifest data
             **kwargs: Additional options
 
         Returns:
-            List of related manifest node unique IDs
+            Graph of the manifest node unique IDs
 
         """
-        return [node_unique_id]
+        return RelationshipGraph()
 
     # -------------------------------------------------------------------------
     # Common table extraction methods
@@ -134,14 +360,14 @@ class BaseAlgoAdapter(ABC):
         if data is None:
             data = []
         tables = []
-        table_exposures = self.get_node_exposures_from_metadata(data=data, **kwargs)
+        exposure_index = self.get_exposure_index(self.get_node_exposures_from_metadata(data=data, **kwargs))
         # Model
         if "model" in kwargs.get("resource_type", []):
             for data_item in data:
                 for model in data_item.get("models", {}).get("edges", []):
                     table = self.get_table_from_metadata(
                         model_metadata=model,
-                        exposures=table_exposures,
+                        exposure_index=exposure_index,
                         **kwargs,
                     )
                     tables.append(table)
@@ -152,7 +378,7 @@ class BaseAlgoAdapter(ABC):
                 for model in data_item.get("sources", {}).get("edges", []):
                     table = self.get_table_from_metadata(
                         model_metadata=model,
-                        exposures=table_exposures,
+                        exposure_index=exposure_index,
                         **kwargs,
                     )
                     tables.append(table)
@@ -174,68 +400,134 @@ class BaseAlgoAdapter(ABC):
             List[Table]: All tables parsed from dbt artifacts
 
         """
-        tables = []
+        exposure_index = self.get_exposure_index(self.get_node_exposures(manifest=manifest))
+        manifest_scan = self.get_manifest_scan(manifest=manifest)
+        table_nodes = [
+            (node_name, manifest.nodes[node_name], catalog.nodes.get(node_name)) for node_name in manifest_scan.tables
+        ]
+        table_nodes.extend(
+            (node_name, manifest.sources[node_name], catalog.sources.get(node_name))
+            for node_name in manifest_scan.sources
+        )
 
-        table_exposures = self.get_node_exposures(manifest=manifest)
-
-        if hasattr(manifest, "nodes"):
-            for node_name, node in manifest.nodes.items():
-                if node_name.startswith("model.") or node_name.startswith("seed.") or node_name.startswith("snapshot."):
-                    catalog_node = catalog.nodes.get(node_name)
-                    table = self.get_table(
-                        node_name=node_name,
-                        manifest_node=node,
-                        catalog_node=catalog_node,
-                        exposures=table_exposures,
-                        **kwargs,
-                    )
-                    tables.append(table)
+        jobs = get_table_jobs(jobs=kwargs.get("jobs"), table_count=len(table_nodes))
+        if jobs > 1:
+            try:
+                return self.get_tables_in_workers(
+                    table_nodes=table_nodes, exposure_index=exposure_index, **{**kwargs, "jobs": jobs}
+                )
+            except Exception as e:
+                logger.warning(f"Building the tables in worker processes failed ({e}), building them in this process")
 
-        if hasattr(manifest, "sources"):
-            for node_name, source in manifest.sources.items():
-                if node_name.startswith("source"):
-                    catalog_source = catalog.sources.get(node_name)
-                    table = self.get_table(
-                        node_name=node_name,
-                        manifest_node=source,
-                        catalog_node=catalog_source,
-                        exposures=table_exposures,
-                        **kwargs,
-                    )
-                    tables.append(table)
+        return [
+            self.get_table(
+                node_name=node_name,
+                manifest_node=manifest_node,
+                catalog_node=catalog_node,
+                exposure_index=exposure_index,
+                **kwargs,
+            )
+            for node_name, manifest_node, catalog_node in table_nodes
+        ]
+
+    def get_tables_in_workers(
+        self, table_nodes: list[tuple[str, Any, Any]], exposure_index: dict[str, list[str]], jobs: int, **kwargs
+    ) -> list[Table]:
+        """
+        Build the tables with `get_table` in worker processes, one contiguous shard of nodes per worker.
+
+        Each worker receives its slice of the manifest nodes, catalog nodes and
+        exposures only, and a fresh instance of this adapter class with the same rule.
+        The tables come back in the order of the given nodes. Their lazy `raw_sql`
+        isn't sent back: it is bound again to `get_compiled_sql` of the manifest node here.
+
+        Args:
+            table_nodes: (node name, manifest node, catalog node) of the tables to build
+            exposure_index: Exposure names by node name, see `get_exposure_index`
+            jobs: Number of worker processes
+            **kwargs: Additional options passed to `get_table`
+
+        Returns:
+            List[Table]: Parsed tables, in the order of the given nodes
+
+        """
+        shard_size = -(-len(table_nodes) // jobs)
+        shards = [table_nodes[x : x + shard_size] for x in range(0, len(table_nodes), shard_size)]
+        logger.info(f"Building {len(table_nodes)} table(s) in {len(shards)} worker process(es)")
+
+        tables = []
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [
+                pool.submit(
+                    _get_table_shard,
+                    type(self),
+                    self.rule,
+                    shard,
+                    {x[0]: exposure_index[x[0]] for x in shard if x[0] in exposure_index},
+                    kwargs,
+                )
+                for shard in shards
+            ]
+            for shard, future in zip(shards, futures):
+                for (_, manifest_node, _), (values, columns, lazy_raw_sql) in zip(shard, future.result()):
+                    table_fields = dict(zip(_TABLE_RECORD_FIELDS, values))
+                    if lazy_raw_sql:
+                        table_fields["raw_sql"] = LazyValue(partial(self.get_compiled_sql, manifest_node))
+                    tables.append(Table(**table_fields, columns=list(starmap(Column, columns))))
 
         return tables
 
-    def filter_tables_based_on_selection(self, tables: list[Table], **kwargs) -> list[Table]:
+    def filter_tables_based_on_selection(
+        self, tables: list[Table], relationships: Optional[list[Ref]] = None, **kwargs
+    ) -> list[Table]:
         """
         Filter list of tables based on the Selection Rules.
 
+        With `select_neighbors`, the tables within that number of relationship hops
+        from the selected ones are kept too, unless excluded.
+
         Args:
             tables (List[Table]): Parsed tables
+            relationships (List[Ref]): Relationships referring to the node names, used by `select_neighbors`
             **kwargs: Additional options including:
                 select (list): Selection rules to include tables
                 exclude (list): Rules to exclude tables
                 resource_type (list): Types of resources to include
+                select_neighbors (int): Number of relationship hops to add around the selected tables
 
         Returns:
             List[Table]: Filtered tables
 
         """
-        return [
-            table
-            for table in tables
-            if is_selected_table(
-                table=table,
-                select_rules=kwargs.get("select") or [],
-                resource_types=kwargs.get("resource_type", []),
-                exclude_rules=kwargs.get("exclude") or [],
-            )
-        ]
+        select_rules = kwargs.get("select") or []
+        depth = kwargs.get("select_neighbors") or 0
+        if not select_rules or not depth or not relationships:
+            return [
+                table
+                for table in tables
+                if is_selected_table(
+                    table=table,
+                    select_rules=select_rules,
+                    resource_types=kwargs.get("resource_type", []),
+                    exclude_rules=kwargs.get("exclude") or [],
+                )
+            ]
+
+        candidates = self.filter_tables_based_on_selection(tables=tables, **{**kwargs, "select": []})
+        selected = self.filter_tables_based_on_selection(tables=candidates, **{**kwargs, "exclude": []})
+        graph = RelationshipGraph.from_relationships(
+            relationships=relationships, nodes={x.node_name for x in candidates}
+        )
+        neighborhood = set(graph.get_neighborhood(nodes=[x.node_name for x in selected], depth=depth))
+        return [table for table in candidates if table.node_name in neighborhood]
 
     def enrich_tables_from_relationships(self, tables: list[Table], relationships: list[Ref]) -> list[Table]:
         """
         Fulfill columns in Table due to `select *`.
 
+        Tables missing a relationship column are copied with the column added,
+        the other ones are returned as is.
+
         Args:
             tables (List[Table]): List of Tables
             relationships (List[Ref]): List of Relationships between Tables
@@ -244,23 +536,36 @@ class BaseAlgoAdapter(ABC):
             List[Table]: Enriched tables
 
         """
-        copied_tables = copy.deepcopy(tables)
+        relationship_columns: dict[str, list[str]] = {}
         for relationship in relationships:
-            for table in copied_tables:
-                table_columns = [x.name.lower() for x in table.columns]
-                if table.name == relationship.table_map[0] and relationship.column_map[0].lower() not in table_columns:
-                    table.columns.append(Column(name=relationship.column_map[0]))
-                if table.name == relationship.table_map[1] and relationship.column_map[1].lower() not in table_columns:
-                    table.columns.append(Column(name=relationship.column_map[1]))
-        return copied_tables
+            relationship_columns.setdefault(relationship.table_map[0], []).append(relationship.column_map[0])
+            relationship_columns.setdefault(relationship.table_map[1], []).append(relationship.column_map[1])
+
+        enriched_tables = []
+        for table in tables:
+            if table.name not in relationship_columns:
+                enriched_tables.append(table)
+                continue
+
+            table_columns = table.columns or []
+            column_index = ColumnIndex(list(table_columns))
+            for column_name in relationship_columns[table.name]:
+                if column_name not in column_index:
+                    column_index.append(Column(name=column_name))
+            enriched_tables.append(
+                table.replace(columns=column_index.columns) if len(column_index) > len(table_columns) else table
+            )
+        return enriched_tables
 
-    def get_table_from_metadata(self, model_metadata, exposures=None, **kwargs) -> Table:
+    def get_table_from_metadata(self, model_metadata, exposures=None, exposure_index=None, **kwargs) -> Table:
         """
         Construct a single Table object (for Metadata).
 
         Args:
             model_metadata (dict): Metadata model node
             exposures (list, optional): List of parsed exposures. Defaults to [].
+            exposure_index (dict, optional): Exposure names by node name, see `get_exposure_index`.
+                Built from `exposures` if not given.
             **kwargs: Additional options including:
                 entity_name_format (str): Format string for entity names
                 omit_columns (bool): Whether to exclude columns from tables
@@ -269,13 +574,14 @@ class BaseAlgoAdapter(ABC):
             Table: Parsed table
 
         """
-        if exposures is None:
-            exposures = []
-        node_name = model_metadata.get("node", {}).get("uniqueId")
-        node_description = model_metadata.get("node", {}).get("description")
-        node_database = model_metadata.get("node", {}).get("database").lower()
-        node_schema = model_metadata.get("node", {}).get("schema").lower()
-        node_label = model_metadata.get("node", {}).get("meta", {}).get("label")
+        if exposure_index is None:
+            exposure_index = self.get_exposure_index(exposures or [])
+        node = model_metadata.get("node", {})
+        node_name = node.get("uniqueId")
+        node_description = node.get("description")
+        node_database = intern(node.get("database").lower())
+        node_schema = intern(node.get("schema").lower())
+        node_label = node.get("meta", {}).get("label")
         node_name_parts = node_name.split(".")
         table = Table(
             name=self.get_table_name(
@@ -285,10 +591,8 @@ class BaseAlgoAdapter(ABC):
                     "package": node_name_parts[1],
                     "model": node_name_parts[2],
                     "database": node_database,
-                    "schema": model_metadata.get("node", {}).get("schema").lower(),
-                    "table": (
-                        model_metadata.get("node", {}).get("alias") or model_metadata.get("node", {}).get("name")
-                    ).lower(),
+                    "schema": node_schema,
+                    "table": (node.get("alias") or node.get("name")).lower(),
                 },
             ),
             node_name=node_name,
@@ -296,20 +600,20 @@ class BaseAlgoAdapter(ABC):
             database=node_database,
             schema=node_schema,
             columns=[],
-            resource_type=node_name.split(".")[0],
-            exposures=[x.get("exposure_name") for x in exposures if x.get("node_name") == node_name],
+            resource_type=intern(node_name_parts[0]),
+            exposures=list(exposure_index.get(node_name, [])),
             description=node_description,
             label=node_label,
         )
 
         # columns
-        table_catalog = model_metadata.get("node", {}).get("catalog", {})
+        table_catalog = node.get("catalog", {})
         if table_catalog:
             for column in table_catalog.get("columns", []):
                 table.columns.append(
                     Column(
-                        name=column.get("name", "").lower(),
-                        data_type=column.get("type", "").lower(),
+                        name=intern(column.get("name", "").lower()),
+                        data_type=intern(column.get("type", "").lower()),
                         description=column.get("description", ""),
                     )
                 )
@@ -319,7 +623,9 @@ class BaseAlgoAdapter(ABC):
 
         return table
 
-    def get_table(self, node_name: str, manifest_node, catalog_node=None, exposures=None, **kwargs) -> Table:
+    def get_table(
+        self, node_name: str, manifest_node, catalog_node=None, exposures=None, exposure_index=None, **kwargs
+    ) -> Table:
         """
         Construct a single Table object.
 
@@ -328,6 +634,8 @@ class BaseAlgoAdapter(ABC):
             manifest_node (dict): Manifest node
             catalog_node (dict, optional): Catalog node. Defaults to None.
             exposures (List, optional): List of table-exposure mapping. Defaults to [].
+            exposure_index (dict, optional): Exposure names by node name, see `get_exposure_index`.
+                Built from `exposures` if not given.
             **kwargs: Additional options including:
                 entity_name_format (str): Format string for entity names
                 omit_columns (bool): Whether to exclude columns from tables
@@ -336,9 +644,11 @@ class BaseAlgoAdapter(ABC):
             Table: Parsed table
 
         """
-        if exposures is None:
-            exposures = []
+        if exposure_index is None:
+            exposure_index = self.get_exposure_index(exposures or [])
         node_name_parts = node_name.split(".")
+        node_database = intern(manifest_node.database.lower())
+        node_schema = intern(manifest_node.schema_.lower())
         table = Table(
             name=self.get_table_name(
                 format=kwargs.get("entity_name_format"),
@@ -346,8 +656,8 @@ class BaseAlgoAdapter(ABC):
                     "resource": node_name_parts[0],
                     "package": node_name_parts[1],
                     "model": node_name_parts[2],
-                    "database": manifest_node.database.lower(),
-                    "schema": manifest_node.schema_.lower(),
+                    "database": node_database,
+                    "schema": node_schema,
                     "table": (
                         manifest_node.identifier.lower()
                         if hasattr(manifest_node, "identifier")
@@ -356,45 +666,58 @@ class BaseAlgoAdapter(ABC):
                 },
             ),
             node_name=node_name,
-            raw_sql=self.get_compiled_sql(manifest_node),
-            database=manifest_node.database.lower(),
-            schema=manifest_node.schema_.lower(),
+            raw_sql=LazyValue(partial(self.get_compiled_sql, manifest_node)),
+            database=node_database,
+            schema=node_schema,
             columns=[],
-            resource_type=node_name.split(".")[0],
-            exposures=[x.get("exposure_name") for x in exposures if x.get("node_name") == node_name],
+            resource_type=intern(node_name_parts[0]),
+            exposures=list(exposure_index.get(node_name, [])),
             description=manifest_node.description,
             label=manifest_node.meta.get("label"),
         )
 
         if catalog_node:
-            for column, metadata in catalog_node.columns.items():
-                table.columns.append(
-                    Column(
-                        name=str(column).lower(),
-                        data_type=str(metadata.type).lower(),
-                        description=metadata.comment or "",
-                    )
-                )
+            for name, data_type, comment in self.get_catalog_columns(catalog_node):
+                table.columns.append(Column(name=name, data_type=data_type, description=comment))
 
+        column_index = ColumnIndex(table.columns)
         for original_column_name, column_metadata in manifest_node.columns.items():
             column_name = original_column_name.strip('"')
-            find_columns = [c for c in table.columns if c.name.lower() == column_name.lower()]
-            if not find_columns:
-                table.columns.append(
+            found_column = column_index.get(column_name)
+            if found_column is None:
+                column_index.append(
                     Column(
-                        name=column_name.lower(),
-                        data_type=str(column_metadata.data_type or "unknown").lower(),
+                        name=intern(column_name.lower()),
+                        data_type=intern(str(column_metadata.data_type or "unknown").lower()),
                         description=column_metadata.description or "",
                     )
                 )
             else:
-                find_columns[0].description = find_columns[0].description or column_metadata.description or ""
+                found_column.description = found_column.description or column_metadata.description or ""
 
         if not table.columns:
             table.columns.append(Column())
 
         return table
 
+    def get_catalog_columns(self, catalog_node) -> CatalogColumns:
+        """
+        Retrieve the columns of a catalog node.
+
+        Args:
+            catalog_node: Catalog node, or its columns already taken from a `CatalogIndex`
+
+        Returns:
+            CatalogColumns: Lowercased (name, data type, comment) of the columns, names and data types interned
+
+        """
+        if isinstance(catalog_node, list):
+            return catalog_node
+        return [
+            (intern(str(column).lower()), intern(str(metadata.type).lower()), metadata.comment or "")
+            for column, metadata in catalog_node.columns.items()
+        ]
+
     def get_compiled_sql(self, manifest_node):
         """
         Retrieve compiled SQL from manifest node.
@@ -414,7 +737,7 @@ class BaseAlgoAdapter(ABC):
 
         if hasattr(manifest_node, "columns"):  # nodes having no compiled but just list of columns
             columns = ",\n            ".join([str(x) for x in manifest_node.columns])
-            table = f"{manifest_node.database}.{manifest_node.schema}.undefined"
+            table = f"{manifest_node.database}.{manifest_node.schema_}.undefined"
             return f"""select
             {columns}
         from {table}"""
@@ -436,13 +759,14 @@ class BaseAlgoAdapter(ABC):
         if data is None:
             data = []
         exposures = []
+        resource_types = kwargs.get("resource_type", [])
         for data_item in data:
             for exposure in data_item.get("exposures", {}).get("edges", []):
                 name = exposure.get("node", {}).get("name")
                 parent_nodes = exposure.get("node", {}).get("parents")
                 for node in parent_nodes:
                     node_name = node.get("uniqueId", "")
-                    if node_name.split(".")[0] in kwargs.get("resource_type", []):
+                    if node_name.split(".")[0] in resource_types:
                         exposures.append(
                             {
                                 "node_name": node_name,
@@ -465,18 +789,51 @@ class BaseAlgoAdapter(ABC):
         """
         exposures = []
 
-        if hasattr(manifest, "exposures"):
-            for exposure_name, node in manifest.exposures.items():
-                for node_name in node.depends_on.nodes:
-                    exposures.append(
-                        {
-                            "node_name": node_name,
-                            "exposure_name": exposure_name.split(".")[-1],
-                        }
-                    )
+        for exposure_name in self.get_manifest_scan(manifest=manifest).exposures:
+            for node_name in manifest.exposures[exposure_name].depends_on.nodes:
+                exposures.append(
+                    {
+                        "node_name": node_name,
+                        "exposure_name": exposure_name.split(".")[-1],
+                    }
+                )
 
         return exposures
 
+    def get_manifest_scan(self, manifest: Manifest) -> ManifestScan:
+        """
+        Get the unique IDs of the manifest nodes classified by kind, see `ManifestScan`.
+
+        The scan is one of the manifest indexes (see `use_manifest_indexes`), so that
+        the tables, exposures, tests and semantic models of a manifest are classified once.
+
+        Args:
+            manifest: Manifest data
+
+        Returns:
+            Manifest scan
+
+        """
+        return self.get_manifest_index(manifest, "manifest_scan", partial(ManifestScan, manifest=manifest))
+
+    def get_exposure_index(self, exposures: list[dict[str, str]]) -> dict[str, list[str]]:
+        """
+        Invert the table-exposure mapping into the exposure names by node name.
+
+        Build it once per parse instead of scanning the whole mapping for every table.
+
+        Args:
+            exposures (list): List of mapping dict {table_name:..., exposure_name=...}
+
+        Returns:
+            dict: Exposure names by node name, in the mapping order
+
+        """
+        exposure_index: dict[str, list[str]] = {}
+        for exposure in exposures:
+            exposure_index.setdefault(exposure.get("node_name"), []).append(exposure.get("exposure_name"))
+        return exposure_index
+
     def get_table_name(self, format: str, **kwargs) -> str:
         """
         Get table name from the input format.
@@ -495,8 +852,30 @@ class BaseAlgoAdapter(ABC):
     # Common relationship methods
     # -------------------------------------------------------------------------
 
+    def get_table_index(self, tables: list[Table]) -> dict[str, Table]:
+        """
+        Index the parsed Tables by their node name.
+
+        Build it once per parse and share it with the stages resolving node names,
+        instead of scanning the table list for every lookup.
+
+        Args:
+            tables (List[Table]): Parsed tables
+
+        Returns:
+            dict[str, Table]: Tables by node name, the first one winning on duplicates
+
+        """
+        table_index: dict[str, Table] = {}
+        for table in tables:
+            table_index.setdefault(table.node_name, table)
+        return table_index
+
     def make_up_relationships(
-        self, relationships: Optional[list[Ref]] = None, tables: Optional[list[Table]] = None
+        self,
+        relationships: Optional[list[Ref]] = None,
+        tables: Optional[list[Table]] = None,
+        table_index: Optional[dict[str, Table]] = None,
     ) -> list[Ref]:
         """
         Filter Refs given by the parsed Tables & applied the entity name format.
@@ -504,37 +883,58 @@ class BaseAlgoAdapter(ABC):
         Args:
             relationships (List[Ref], optional): Parsed relationships. Defaults to [].
             tables (List[Table], optional): Parsed tables. Defaults to [].
+            table_index (dict[str, Table], optional): Tables by node name, see `get_table_index`.
+                Built from `tables` if not given.
 
         Returns:
             List[Ref]: Cooked relationships
 
         """
-        if tables is None:
-            tables = []
         if relationships is None:
             relationships = []
-        node_names = [x.node_name for x in tables]
-        relationships = [
-            Ref(
-                name=x.name,
-                table_map=[
-                    next(t for t in tables if t.node_name == x.table_map[0]).name,
-                    next(t for t in tables if t.node_name == x.table_map[1]).name,
-                ],
-                column_map=x.column_map,
-                type=x.type,
-                relationship_label=x.relationship_label,
+        if table_index is None:
+            table_index = self.get_table_index(tables=tables or [])
+
+        cooked_relationships = []
+        for x in relationships:
+            to_table = table_index.get(x.table_map[0])
+            from_table = table_index.get(x.table_map[1])
+            if to_table is None or from_table is None:
+                continue
+            cooked_relationships.append(
+                Ref(
+                    name=x.name,
+                    table_map=[to_table.name, from_table.name],
+                    column_map=x.column_map,
+                    type=x.type,
+                    relationship_label=x.relationship_label,
+                )
             )
-            for x in relationships
-            if x.table_map[0] in node_names and x.table_map[1] in node_names
-        ]
 
-        return relationships
+        return cooked_relationships
+
+    def get_ref_key(self, ref: Ref) -> Hashable:
+        """
+        Get the identity of a Relationship, used to remove duplicates.
+
+        Override to define another identity, e.g. to keep the relationships
+        of different types between the same columns.
+
+        Args:
+            ref (Ref): Parsed relationship
+
+        Returns:
+            Hashable: Normalized (table map, column map)
+
+        """
+        return (tuple(ref.table_map), tuple(ref.column_map))
 
     def get_unique_refs(self, refs: Optional[list[Ref]] = None) -> list[Ref]:
         """
         Remove duplicates in the Relationship list.
 
+        The first relationship of each identity (see `get_ref_key`) is kept, in the input order.
+
         Args:
             refs (list[Ref], optional): List of parsed relationship. Defaults to [].
 
@@ -544,13 +944,17 @@ class BaseAlgoAdapter(ABC):
         """
         if refs is None:
             refs = []
-        if not refs:
-            return []
 
-        distinct_list = [refs[0]]
+        distinct_keys = set()
+        distinct_list = []
         for ref in refs:
-            distinct_maps = [str((x.table_map, x.column_map)) for x in distinct_list]
-            if str((ref.table_map, ref.column_map)) not in distinct_maps:
+            key = self.get_ref_key(ref)
+            if key not in distinct_keys:
+                distinct_keys.add(key)
                 distinct_list.append(ref)
 
+        duplicates = len(refs) - len(distinct_list)
+        if duplicates:
+            logger.info(f"Dropped {duplicates} duplicated relationship(s)")
+
         return distinct_list
@@ -0,0 +1,564 @@
+"""Lightweight attribute-access views over raw dbt artifact dicts.
+
+This module provides thin wrappers exposing the subset of the dbt-artifacts-parser
+object interface that the algorithm adapters read, without building the full
+Pydantic model tree. Values are validated only when they are accessed.
+"""
+
+from collections.abc import Collection, Iterator, Mapping
+from datetime import datetime
+import re
+from sys import intern
+from typing import Any, Callable, Optional, Union
+
+from dbterd.helpers.json_stream import ProjectionSpec
+
+
+class ArtifactValidationError(ValueError):
+    """Raised when a field read from a raw artifact has an unexpected type."""
+
+    def __init__(self, path: str, expected: str, value: Any) -> None:
+        self.path = path
+        super().__init__(f"Invalid value at `{path}`: expected {expected}, got {type(value).__name__}")
+
+
+class _Field:
+    """Descriptor reading and validating a single key of the underlying dict.
+
+    A missing key raises AttributeError so that `hasattr` checks behave
+    like they do on the Pydantic models of the corresponding artifact version.
+    Where the `optional` predicate holds for the dict, the model defines the field,
+    so a missing key reads as None instead.
+    """
+
+    def __init__(
+        self,
+        convert: Callable[[str, Any], Any],
+        key: Optional[str] = None,
+        optional: Optional[Callable[[dict], bool]] = None,
+    ) -> None:
+        self.convert = convert
+        self.key = key
+        self.optional = optional
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+        self.key = self.key or name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            value = instance._data[self.key]
+        except KeyError:
+            if self.optional is not None and self.optional(instance._data):
+                return None
+            raise AttributeError(self.name) from None
+        return self.convert(f"{instance._path}.{self.key}", value)
+
+
+def _string(path: str, value: Any) -> Optional[str]:
+    if value is not None and not isinstance(value, str):
+        raise ArtifactValidationError(path, "string", value)
+    return value
+
+
+_MANIFEST_VERSION_PATTERN = re.compile(r"/manifest/v(\d+)\.json$")
+DATETIME_MANIFEST_MAX_VERSION = 10
+"""Last manifest version whose Pydantic model parses `metadata.generated_at` into a datetime."""
+
+_DATETIME_PATTERN = re.compile(
+    r"(?P<date>\d{4}-\d{2}-\d{2})[T ](?P<time>\d{2}:\d{2}:\d{2})(?:\.(?P<fraction>\d+))?"
+    r"(?P<offset>Z|[+-]\d{2}:?\d{2})?"
+)
+
+
+def _datetime(path: str, value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp like the Pydantic models do, e.g. `generated_at`.
+
+    `datetime.fromisoformat` only supports the `Z` suffix and fractions of any
+    length from Python 3.11, so the value is normalized first.
+    """
+    if value is None:
+        return None
+    matched = _DATETIME_PATTERN.fullmatch(value) if isinstance(value, str) else None
+    if not matched:
+        raise ArtifactValidationError(path, "ISO 8601 datetime", value)
+    fraction = f".{matched['fraction'][:6]:0<6}" if matched["fraction"] else ""
+    offset = matched["offset"] or ""
+    if offset == "Z":
+        offset = "+00:00"
+    elif offset and ":" not in offset:
+        offset = f"{offset[:3]}:{offset[3:]}"
+    try:
+        return datetime.fromisoformat(f"{matched['date']}T{matched['time']}{fraction}{offset}")
+    except ValueError:
+        raise ArtifactValidationError(path, "ISO 8601 datetime", value) from None
+
+
+def _dict(path: str, value: Any) -> dict:
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise ArtifactValidationError(path, "object", value)
+    return value
+
+
+def _string_list(path: str, value: Any) -> list[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(x, str) for x in value):
+        raise ArtifactValidationError(path, "list of strings", value)
+    return value
+
+
+def _view(view_class: type["ArtifactView"]) -> Callable[[str, Any], "ArtifactView"]:
+    def convert(path: str, value: Any) -> "ArtifactView":
+        return view_class(_dict(path, value), path=path)
+
+    return convert
+
+
+def _view_list(view_class: type["ArtifactView"]) -> Callable[[str, Any], list["ArtifactView"]]:
+    def convert(path: str, value: Any) -> list["ArtifactView"]:
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            raise ArtifactValidationError(path, "list", value)
+        return [view_class(_dict(f"{path}[{idx}]", x), path=f"{path}[{idx}]") for idx, x in enumerate(value)]
+
+    return convert
+
+
+def _view_mapping(view_class: type["ArtifactView"]) -> Callable[[str, Any], "ViewMapping"]:
+    def convert(path: str, value: Any) -> "ViewMapping":
+        return ViewMapping(_dict(path, value), view_class=view_class, path=path)
+
+    return convert
+
+
+def _enum(path: str, value: Any) -> "EnumValue":
+    return EnumValue(_string(path, value))
+
+
+class EnumValue:
+    """Mimic of the Enum fields of the Pydantic models, exposing `.value` only."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Optional[str]) -> None:
+        self.value = value
+
+
+class ArtifactView:
+    """Base attribute-access view over a raw artifact dict."""
+
+    __slots__ = ("_data", "_path")
+
+    def __init__(self, data: dict, path: str = "") -> None:
+        self._data = data
+        self._path = path
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._path or '<root>'})"
+
+    def __reduce__(self) -> tuple:
+        # Pickled as its raw dict, e.g. for the tables built in worker processes.
+        return type(self), (self._data, self._path)
+
+
+class ViewMapping(Mapping):
+    """Read-only mapping wrapping each value of a raw dict into a view on access."""
+
+    __slots__ = ("_data", "_path", "_view_class")
+
+    def __init__(self, data: dict, view_class: type[ArtifactView], path: str = "") -> None:
+        self._data = data
+        self._view_class = view_class
+        self._path = path
+
+    def __getitem__(self, key: str) -> ArtifactView:
+        path = f"{self._path}[{key!r}]"
+        return self._view_class(_dict(path, self._data[key]), path=path)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+
+class DependsOnView(ArtifactView):
+    """View of a node's `depends_on` block."""
+
+    __slots__ = ()
+
+    nodes = _Field(_string_list)
+
+
+class ConfigView(ArtifactView):
+    """View of a node's `config` block."""
+
+    __slots__ = ()
+
+    meta = _Field(_dict)
+
+
+class TestMetadataView(ArtifactView):
+    """View of a test node's `test_metadata` block."""
+
+    __slots__ = ()
+
+    name = _Field(_string)
+    kwargs = _Field(_dict)
+
+
+class ColumnView(ArtifactView):
+    """View of a manifest node column."""
+
+    __slots__ = ()
+
+    name = _Field(_string)
+    data_type = _Field(_string)
+    description = _Field(_string)
+
+
+def _has_compiled_flag(node: dict) -> bool:
+    return "compiled" in node
+
+
+def _is_compiled_resource(node: dict) -> bool:
+    return node.get("resource_type") != "seed"
+
+
+class NodeView(ArtifactView):
+    """View of a manifest node, from manifest v8.
+
+    Like on the Pydantic models, `compiled_code` is None rather than missing
+    for the node types which are compiled, i.e. all but the seeds.
+    """
+
+    __slots__ = ()
+
+    unique_id = _Field(_string)
+    name = _Field(_string)
+    resource_type = _Field(_string)
+    database = _Field(_string)
+    schema = _Field(_string)
+    schema_ = _Field(_string, key="schema")
+    identifier = _Field(_string)
+    alias = _Field(_string)
+    description = _Field(_string)
+    meta = _Field(_dict)
+    config = _Field(_view(ConfigView))
+    columns = _Field(_view_mapping(ColumnView))
+    depends_on = _Field(_view(DependsOnView))
+    test_metadata = _Field(_view(TestMetadataView))
+    compiled_sql = _Field(_string)
+    compiled_code = _Field(_string, optional=_is_compiled_resource)
+    raw_sql = _Field(_string)
+    raw_code = _Field(_string)
+
+
+class NodeViewV7(NodeView):
+    """View of a manifest v7 node.
+
+    The Pydantic models up to this version tell the compiled nodes from the parsed ones
+    by their `compiled` flag, only the former defining `compiled_code`.
+    """
+
+    __slots__ = ()
+
+    compiled_code = _Field(_string, optional=_has_compiled_flag)
+
+
+class NodeViewV6(NodeView):
+    """View of a manifest node up to manifest v6, see `NodeViewV7`."""
+
+    __slots__ = ()
+
+    compiled_sql = _Field(_string, optional=_has_compiled_flag)
+    compiled_code = _Field(_string)
+
+
+class SourceView(NodeView):
+    """View of a manifest source, never compiled."""
+
+    __slots__ = ()
+
+    compiled_sql = _Field(_string)
+    compiled_code = _Field(_string)
+
+
+class ExposureView(ArtifactView):
+    """View of a manifest exposure."""
+
+    __slots__ = ()
+
+    name = _Field(_string)
+    depends_on = _Field(_view(DependsOnView))
+
+
+class EntityView(ArtifactView):
+    """View of a semantic model entity."""
+
+    __slots__ = ()
+
+    name = _Field(_string)
+    type = _Field(_enum)
+    expr = _Field(_string)
+
+
+class SemanticModelView(ArtifactView):
+    """View of a manifest semantic model."""
+
+    __slots__ = ()
+
+    name = _Field(_string)
+    entities = _Field(_view_list(EntityView))
+    primary_entity = _Field(_string)
+    config = _Field(_view(ConfigView))
+    depends_on = _Field(_view(DependsOnView))
+
+
+class MetadataView(ArtifactView):
+    """View of an artifact's `metadata` block."""
+
+    __slots__ = ()
+
+    dbt_schema_version = _Field(_string)
+    dbt_version = _Field(_string)
+    _generated_at = _Field(_string, key="generated_at")
+
+    @property
+    def manifest_version(self) -> Optional[int]:
+        """Version of the manifest schema, None if unknown or not a manifest."""
+        version = _MANIFEST_VERSION_PATTERN.search(getattr(self, "dbt_schema_version", None) or "")
+        return int(version[1]) if version else None
+
+    @property
+    def generated_at(self) -> Union[str, datetime, None]:
+        """Generation timestamp, parsed into a datetime up to manifest v10 as the Pydantic models do."""
+        value = self._generated_at
+        version = self.manifest_version
+        if version and version <= DATETIME_MANIFEST_MAX_VERSION:
+            return _datetime(f"{self._path}.generated_at", value)
+        return value
+
+
+class ManifestView(ArtifactView):
+    """View of manifest.json exposing what the algorithm adapters read.
+
+    Nodes are viewed like the Pydantic models of the manifest version, the latest one if unknown.
+    """
+
+    __slots__ = ("_node_view_class",)
+
+    metadata = _Field(_view(MetadataView))
+    _nodes = _Field(_dict, key="nodes")
+    sources = _Field(_view_mapping(SourceView))
+    exposures = _Field(_view_mapping(ExposureView))
+    semantic_models = _Field(_view_mapping(SemanticModelView))
+
+    @property
+    def nodes(self) -> ViewMapping:
+        """Nodes of the manifest, see `NodeView`, `NodeViewV7` and `NodeViewV6`."""
+        return ViewMapping(self._nodes, view_class=self._get_node_view_class(), path=f"{self._path}.nodes")
+
+    def _get_node_view_class(self) -> type[NodeView]:
+        try:
+            return self._node_view_class
+        except AttributeError:
+            pass
+        version = self.metadata.manifest_version if "metadata" in self._data else None
+        if version and version <= 6:
+            self._node_view_class = NodeViewV6
+        elif version == 7:
+            self._node_view_class = NodeViewV7
+        else:
+            self._node_view_class = NodeView
+        return self._node_view_class
+
+
+class CatalogColumnView(ArtifactView):
+    """View of a catalog column."""
+
+    __slots__ = ()
+
+    name = _Field(_string)
+    type = _Field(_string)
+    comment = _Field(_string)
+
+
+class CatalogTableView(ArtifactView):
+    """View of a catalog node or source."""
+
+    __slots__ = ()
+
+    unique_id = _Field(_string)
+    columns = _Field(_view_mapping(CatalogColumnView))
+
+
+class CatalogView(ArtifactView):
+    """View of catalog.json exposing what the algorithm adapters read."""
+
+    __slots__ = ()
+
+    metadata = _Field(_view(MetadataView))
+    nodes = _Field(_view_mapping(CatalogTableView))
+    sources = _Field(_view_mapping(CatalogTableView))
+
+
+CatalogColumns = list[tuple[str, str, str]]
+"""Catalog columns of a node, as (name, data type, comment) tuples rendered for the ERD."""
+
+
+class CatalogIndex:
+    """Compact index of catalog.json keeping only the columns name, type and comment.
+
+    Columns are materialized upfront as lowercased (name, data type, comment) tuples,
+    mirroring the `nodes` and `sources` mappings of the catalog for `.get` lookups.
+    Names and data types are interned, as they repeat across tables.
+    """
+
+    __slots__ = ("nodes", "sources")
+
+    def __init__(
+        self, nodes: Optional[dict[str, CatalogColumns]] = None, sources: Optional[dict[str, CatalogColumns]] = None
+    ) -> None:
+        self.nodes = nodes or {}
+        self.sources = sources or {}
+
+    @classmethod
+    def from_catalog(
+        cls,
+        data: dict,
+        unique_ids: Optional[Collection[str]] = None,
+        path: str = "catalog",
+        resource_types: Optional[Collection[str]] = None,
+    ) -> "CatalogIndex":
+        """Index a raw catalog dict.
+
+        Args:
+            data: Raw (or projected) catalog.json content
+            unique_ids: Node and source unique IDs to keep, all of them if None
+            path: Path of the catalog, used in validation errors
+            resource_types: Resource types of the nodes and sources to keep, all of them if None
+
+        Raises:
+            ArtifactValidationError: A read value has an unexpected type
+
+        Returns:
+            Catalog index
+        """
+        data = _dict(path, data)
+        prefixes = tuple(f"{x}." for x in resource_types) if resource_types else None
+        return cls(
+            nodes=_index_catalog_tables(f"{path}.nodes", data.get("nodes"), unique_ids, prefixes),
+            sources=_index_catalog_tables(f"{path}.sources", data.get("sources"), unique_ids, prefixes),
+        )
+
+
+def _index_catalog_tables(
+    path: str,
+    tables: Any,
+    unique_ids: Optional[Collection[str]] = None,
+    prefixes: Optional[tuple[str, ...]] = None,
+) -> dict[str, CatalogColumns]:
+    index = {}
+    for unique_id, table in _dict(path, tables).items():
+        if unique_ids is not None and unique_id not in unique_ids:
+            continue
+        if prefixes is not None and not unique_id.startswith(prefixes):
+            continue
+        table_path = f"{path}[{unique_id!r}]"
+        columns_path = f"{table_path}.columns"
+        columns = []
+        for name, raw_column in _dict(columns_path, _dict(table_path, table).get("columns")).items():
+            column_path = f"{columns_path}[{name!r}]"
+            column = _dict(column_path, raw_column)
+            columns.append(
+                (
+                    intern(name.lower()),
+                    intern(str(_string(f"{column_path}.type", column.get("type"))).lower()),
+                    _string(f"{column_path}.comment", column.get("comment")) or "",
+                )
+            )
+        index[unique_id] = columns
+    return index
+
+
+_DEPENDS_ON_PROJECTION: ProjectionSpec = {"nodes": True}
+_NODE_PROJECTION: ProjectionSpec = {
+    "unique_id": True,
+    "name": True,
+    "resource_type": True,
+    "database": True,
+    "schema": True,
+    "identifier": True,
+    "alias": True,
+    "description": True,
+    "meta": True,
+    "config": {"meta": True},
+    "columns": {"*": {"name": True, "data_type": True, "description": True}},
+    "depends_on": _DEPENDS_ON_PROJECTION,
+    "test_metadata": {"name": True, "kwargs": True},
+}
+_TABLE_NODE_PROJECTION: ProjectionSpec = {
+    **_NODE_PROJECTION,
+    "compiled": True,
+    "compiled_sql": True,
+    "compiled_code": True,
+}
+
+MANIFEST_STREAM_PROJECTION: ProjectionSpec = {
+    "metadata": {"dbt_schema_version": True, "dbt_version": True, "generated_at": True},
+    "nodes": {
+        "model.*": _TABLE_NODE_PROJECTION,
+        "seed.*": _TABLE_NODE_PROJECTION,
+        "snapshot.*": _TABLE_NODE_PROJECTION,
+        "test.*": _NODE_PROJECTION,
+    },
+    "sources": {"*": _NODE_PROJECTION},
+    "exposures": {"*": {"name": True, "depends_on": _DEPENDS_ON_PROJECTION}},
+    "semantic_models": {
+        "*": {
+            "name": True,
+            "entities": True,
+            "primary_entity": True,
+            "config": {"meta": True},
+            "depends_on": _DEPENDS_ON_PROJECTION,
+        }
+    },
+}
+"""Subset of manifest.json read by the views, leaving out the unused nodes and SQL bodies.
+
+The compiled SQL of the models, seeds and snapshots is kept, as it makes the `raw_sql` of their tables.
+"""
+
+
+_CATALOG_TABLE_PROJECTION: ProjectionSpec = {"columns": {"*": {"type": True, "comment": True}}}
+
+
+def get_catalog_projection(
+    unique_ids: Optional[Collection[str]] = None, resource_types: Optional[Collection[str]] = None
+) -> ProjectionSpec:
+    """Get the subset of catalog.json read by the catalog index.
+
+    Args:
+        unique_ids: Node and source unique IDs to keep, all of them if None
+        resource_types: Resource types of the nodes and sources to keep, all of them if None
+
+    Returns:
+        Projection spec keeping the columns type and comment of the given tables only
+    """
+    if unique_ids is not None:
+        tables: ProjectionSpec = dict.fromkeys(unique_ids, _CATALOG_TABLE_PROJECTION)
+    elif resource_types:
+        tables = {f"{x}.*": _CATALOG_TABLE_PROJECTION for x in resource_types}
+    else:
+        tables = {"*": _CATALOG_TABLE_PROJECTION}
+    return {"nodes": tables, "sources": tables}
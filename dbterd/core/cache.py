@@ -0,0 +1,149 @@
+"""On-disk cache of the tables and relationships extracted from dbt artifacts.
+
+This module persists the result of `BaseAlgoAdapter.extract_artifacts`, which
+doesn't depend on the target or on the selection, so that subsequent runs over
+the same artifact files skip the JSON decoding and parsing entirely.
+"""
+
+import dataclasses
+import hashlib
+import importlib.metadata
+import json
+import os
+from pathlib import Path
+from sys import intern
+from typing import Optional
+
+from dbterd.core.models import Column, Ref, Table
+from dbterd.helpers import json_backend
+from dbterd.helpers.log import logger
+
+
+CACHE_DIR_NAME = ".dbterd_cache"
+CACHE_FORMAT_VERSION = 1
+CACHE_MAX_ENTRIES = 8
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclasses.dataclass
+class ParsedArtifacts:
+    """Cached extraction result."""
+
+    tables: list[Table]
+    relationships: list[Ref]
+    generated_at: Optional[str] = None
+
+
+def get_file_fingerprint(path: str) -> dict:
+    """Get the fingerprint of a file: path, size, modification time and content hash.
+
+    Args:
+        path: File path
+
+    Returns:
+        Fingerprint dict
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return {
+        "path": str(Path(path).absolute()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def _get_dbterd_version() -> str:
+    try:
+        return importlib.metadata.version("dbterd")
+    except importlib.metadata.PackageNotFoundError:  # pragma: no cover
+        return "unknown"
+
+
+def _load_table(data: dict) -> Table:
+    """Rebuild a cached table, interning the strings repeated across tables as the extraction does."""
+    columns = data["columns"]
+    return Table(
+        **{
+            **data,
+            "database": intern(data["database"]),
+            "schema": intern(data["schema"]),
+            "resource_type": intern(data["resource_type"]),
+            "columns": (
+                [Column(**{**x, "name": intern(x["name"]), "data_type": intern(x["data_type"])}) for x in columns]
+                if columns is not None
+                else None
+            ),
+        }
+    )
+
+
+class ArtifactCache:
+    """Cache entry of the extracted artifacts, stored next to the artifact files.
+
+    The entry key covers the fingerprints of manifest.json and catalog.json
+    together with the options the extraction depends on. Options applied
+    afterwards (target, select, exclude, ...) are not part of it.
+    """
+
+    def __init__(self, manifest_path: str, catalog_path: str, **kwargs) -> None:
+        self.cache_dir = Path(manifest_path).parent / CACHE_DIR_NAME
+        key_data = {
+            "format": CACHE_FORMAT_VERSION,
+            "dbterd": _get_dbterd_version(),
+            "manifest": get_file_fingerprint(manifest_path),
+            "catalog": get_file_fingerprint(catalog_path),
+            "algo": kwargs.get("algo"),
+            "resource_type": sorted(kwargs.get("resource_type") or []),
+            "entity_name_format": kwargs.get("entity_name_format"),
+            "parse_mode": "stream" if kwargs.get("stream_parse") else ("fast" if kwargs.get("fast_parse") else "full"),
+        }
+        self.key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()
+        self.path = self.cache_dir / f"{self.key}.json"
+
+    def load(self) -> Optional[ParsedArtifacts]:
+        """Load the cache entry.
+
+        Returns:
+            Cached extraction result, or None if missing or unreadable
+        """
+        if not self.path.is_file():
+            return None
+
+        try:
+            data = json_backend.loads(self.path.read_bytes())
+            parsed = ParsedArtifacts(
+                tables=[_load_table(x) for x in data["tables"]],
+                relationships=[Ref(**x) for x in data["relationships"]],
+                generated_at=data.get("generated_at"),
+            )
+        except (OSError, KeyError, TypeError, *json_backend.JSON_DECODE_ERRORS) as e:
+            logger.debug(f"Ignoring unreadable cache entry {self.path}: {e}")
+            return None
+
+        logger.info(f"Using cached artifacts at: {self.path}")
+        return parsed
+
+    def save(self, parsed: ParsedArtifacts) -> None:
+        """Persist the cache entry, pruning the oldest entries of the cache directory.
+
+        Args:
+            parsed: Extraction result
+        """
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.write(json_backend.dumps(dataclasses.asdict(parsed)))
+            os.replace(tmp_path, self.path)
+            self._prune()
+        except OSError as e:
+            logger.warning(f"Could not save the artifact cache: {e}")
+
+    def _prune(self) -> None:
+        entries = sorted(self.cache_dir.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True)
+        for entry in entries[CACHE_MAX_ENTRIES:]:
+            entry.unlink(missing_ok=True)
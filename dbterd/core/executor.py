@@ -4,37 +4,45 @@ This module provides the main Executor class that orchestrates
 ERD generation from dbt artifacts.
 """
 
+from concurrent.futures import Future, ProcessPoolExecutor
 import importlib
 import os
 from pathlib import Path
-import pkgutil
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Union
 
 import click
 
 from dbterd import default
-from dbterd.adapters import algos, targets
 from dbterd.core.adapters.algo import BaseAlgoAdapter
 from dbterd.core.adapters.target import BaseTargetAdapter
+from dbterd.core.artifact_view import CatalogIndex, ManifestView
+from dbterd.core.cache import ArtifactCache, ParsedArtifacts
 from dbterd.core.filter import has_unsupported_rule
+from dbterd.core.manifest_scan import ManifestIndexes
 from dbterd.core.models import Ref, Table
 from dbterd.core.registry.plugin_registry import PluginRegistry
-from dbterd.helpers import cli_messaging, file as file_handlers
+from dbterd.helpers import cli_messaging, file as file_handlers, json_backend
 from dbterd.helpers.log import logger
-from dbterd.plugins.dbt_cloud.administrative import DbtCloudArtifact
-from dbterd.plugins.dbt_cloud.discovery import DbtCloudMetadata
-from dbterd.plugins.dbt_core.dbt_invocation import DbtInvocation
 
 
-def _register_adapters() -> None:
-    """Import adapter modules to trigger plugin registration via decorators."""
-    adapter_packages = [algos, targets]
-    for package in adapter_packages:
-        for _, module_name, _ in pkgutil.iter_modules(package.__path__):
-            importlib.import_module(f"{package.__name__}.{module_name}")
+if TYPE_CHECKING:
+    from dbterd.plugins.dbt_core.dbt_invocation import DbtInvocation
 
 
-_register_adapters()
+PLUGIN_MODULES = {
+    "DbtCloudArtifact": "dbterd.plugins.dbt_cloud.administrative",
+    "DbtCloudMetadata": "dbterd.plugins.dbt_cloud.discovery",
+    "DbtInvocation": "dbterd.plugins.dbt_core.dbt_invocation",
+}
+"""Modules of the plugin classes, imported on first use: they pull in `requests` and `dbt`."""
+
+
+def load_plugin(name: str) -> type:
+    """Import a plugin class when the command needs it, keeping it out of the CLI startup."""
+    return getattr(importlib.import_module(PLUGIN_MODULES[name]), name)
+
+
+READ_CONCURRENCY_MIN_SIZE = 32 * 1024 * 1024
 
 
 class Executor:
@@ -47,7 +55,9 @@ class Executor:
         self.ctx = ctx
         self.filename_manifest = "manifest.json"
         self.filename_catalog = "catalog.json"
-        self.dbt: DbtInvocation = None
+        self.dbt: Optional[DbtInvocation] = None
+        self.algo_adapters: dict[str, BaseAlgoAdapter] = {}
+        self._artifacts: Optional[tuple] = None
 
     def run(self, node_unique_id: Optional[str] = None, **kwargs) -> tuple[list[Table], list[Ref]]:
         """Generate ERD from files."""
@@ -74,6 +84,16 @@ class Executor:
         artifacts_dir, dbt_project_dir = self._get_dir(**kwargs)
         command = self.ctx.command.name
 
+        try:
+            backend = json_backend.use_backend(kwargs.get("json_backend"))
+        except ValueError as e:
+            raise click.UsageError(str(e)) from e
+        logger.debug(f"Using JSON backend [{backend.name}]")
+
+        # Report a malformed algo rule before reading any artifact
+        if kwargs.get("algo") and PluginRegistry.has_algo(kwargs["algo"].partition(":")[0]):
+            self.load_algo(name=kwargs["algo"])
+
         select = list(kwargs.get("select")) or []
         exclude = list(kwargs.get("exclude")) or []
 
@@ -83,7 +103,7 @@ class Executor:
         if command == "run":
             if kwargs.get("dbt"):
                 logger.info(f"Using dbt project dir at: {dbt_project_dir}")
-                self.dbt = DbtInvocation(
+                self.dbt = load_plugin("DbtInvocation")(
                     dbt_project_dir=kwargs.get("dbt_project_dir"),
                     dbt_target=kwargs.get("dbt_target"),
                 )
@@ -112,10 +132,25 @@ class Executor:
         return adapter_class()
 
     def load_algo(self, name: str) -> BaseAlgoAdapter:
-        """Load and instantiate an algo adapter."""
-        module_name = name.split(":")[0]
+        """Load and instantiate an algo adapter once, with the rule following its name compiled.
+
+        Raises:
+            click.UsageError: Malformed algo rule
+
+        """
+        if name in self.algo_adapters:
+            return self.algo_adapters[name]
+
+        module_name, _, rule = name.partition(":")
         adapter_class = PluginRegistry.get_algo(module_name)
-        return adapter_class()
+        adapter = adapter_class()
+        try:
+            adapter.rule = adapter.compile_rule(rule or None)
+        except ValueError as e:
+            raise click.UsageError(f"Invalid algo rule [{name}]: {e}") from e
+
+        self.algo_adapters[name] = adapter
+        return adapter
 
     def _check_if_any_unsupported_selection(self, select: Optional[list] = None, exclude: Optional[list] = None):
         """Throw an error if detected any unsupported selections.
@@ -159,7 +194,7 @@ class Executor:
         artifact_dir = Path(artifact_dir).absolute()
         project_dir = Path(project_dir).absolute()
 
-        if not os.path.isfile(f"{artifact_dir}/{self.filename_manifest}"):
+        if not file_handlers.find_artifact_file(str(artifact_dir), self.filename_manifest):
             artifact_dir = f"{project_dir}/target"  # try child target
 
         return (str(artifact_dir), str(project_dir))
@@ -174,18 +209,37 @@ class Executor:
             exclude_rules=kwargs.get("exclude"),
         )
 
-    def _read_manifest(self, mp: str, mv: Optional[int] = None, bypass_validation: bool = False):
+    def _read_manifest(
+        self,
+        mp: str,
+        mv: Optional[int] = None,
+        bypass_validation: bool = False,
+        fast_parse: bool = False,
+        stream_parse: bool = False,
+    ):
         """Read the Manifest content.
 
         Args:
             mp: manifest.json file path
             mv: Manifest version (None for auto-detect)
             bypass_validation: Skip validation
+            fast_parse: Read a lightweight view instead of the Pydantic object
+            stream_parse: Read a lightweight view of the projected manifest, streaming the file
 
         Returns:
             Manifest object
 
         """
+        if stream_parse:
+            cli_messaging.check_existence(mp, self.filename_manifest)
+            with cli_messaging.handle_read_errors(self.filename_manifest):
+                return file_handlers.read_manifest_stream(path=mp)
+
+        if fast_parse:
+            cli_messaging.check_existence(mp, self.filename_manifest)
+            with cli_messaging.handle_read_errors(self.filename_manifest):
+                return file_handlers.read_manifest_view(path=mp)
+
         if mv is None:
             detected_version = default.default_manifest_version(artifacts_dir=mp)
             if detected_version:
@@ -197,18 +251,36 @@ class Executor:
         with cli_messaging.handle_read_errors(self.filename_manifest, conditional):
             return file_handlers.read_manifest(path=mp, version=mv, enable_compat_patch=bypass_validation)
 
-    def _read_catalog(self, cp: str, cv: Optional[int] = None, bypass_validation: bool = False):
+    def _read_catalog(
+        self,
+        cp: str,
+        cv: Optional[int] = None,
+        bypass_validation: bool = False,
+        fast_parse: bool = False,
+        stream_parse: bool = False,
+        data: Optional[dict] = None,
+        unique_ids: Optional[set[str]] = None,
+    ):
         """Read the Catalog content.
 
         Args:
             cp: catalog.json file path
             cv: Catalog version (None for auto-detect)
             bypass_validation: Skip validation
+            fast_parse: Read a compact columns index instead of the Pydantic object
+            stream_parse: Read the compact columns index, streaming the file
+            data: Already decoded catalog.json content (None to read the file)
+            unique_ids: Tables to keep in the columns index (None for all)
 
         Returns:
             Catalog object
 
         """
+        if fast_parse or stream_parse:
+            cli_messaging.check_existence(cp, self.filename_catalog)
+            with cli_messaging.handle_read_errors(self.filename_catalog):
+                return file_handlers.read_catalog_index(path=cp, data=data, unique_ids=unique_ids, stream=stream_parse)
+
         if cv is None:
             detected_version = default.default_catalog_version(artifacts_dir=cp)
             if detected_version:
@@ -217,7 +289,171 @@ class Executor:
 
         cli_messaging.check_existence(cp, self.filename_catalog)
         with cli_messaging.handle_read_errors(self.filename_catalog):
-            return file_handlers.read_catalog(path=cp, version=cv, enable_compat_patch=bypass_validation)
+            return file_handlers.read_catalog(path=cp, version=cv, enable_compat_patch=bypass_validation, data=data)
+
+    def _read_artifacts(self, **kwargs) -> tuple:
+        """Read the Manifest and Catalog contents.
+
+        With the read concurrency enabled, catalog.json is decoded in a worker
+        process while the manifest is read. Only the decoded dict is sent back:
+        the Pydantic objects are built in the main process, as pickling them
+        costs more than validating them. In the fast and stream parsing modes,
+        the worker builds the compact columns index itself (streaming the file
+        in stream mode), so that the full catalog dict never reaches the main process.
+        As the manifest isn't read yet, the worker restricts the index to the selected
+        resource types rather than to the unique IDs of the manifest tables.
+
+        Returns:
+            Tuple of (manifest, catalog)
+
+        """
+        fast_parse = kwargs.get("fast_parse") or kwargs.get("stream_parse")
+        catalog_future = None
+        pool = None
+        if self._use_read_concurrency(**kwargs):
+            logger.info("Reading catalog.json concurrently")
+            pool = ProcessPoolExecutor(max_workers=1)
+            if fast_parse:
+                catalog_future = pool.submit(
+                    file_handlers.read_catalog_index,
+                    path=kwargs.get("artifacts_dir"),
+                    stream=bool(kwargs.get("stream_parse")),
+                    backend=json_backend.get_backend().name,
+                    resource_types=kwargs.get("resource_type") or None,
+                )
+            else:
+                catalog_future = pool.submit(
+                    file_handlers.open_json,
+                    file_handlers.get_artifact_path(kwargs.get("artifacts_dir"), self.filename_catalog),
+                    json_backend.get_backend().name,
+                )
+
+        try:
+            manifest = self._read_manifest(
+                mp=kwargs.get("artifacts_dir"),
+                mv=kwargs.get("manifest_version"),
+                bypass_validation=kwargs.get("bypass_validation"),
+                fast_parse=kwargs.get("fast_parse"),
+                stream_parse=kwargs.get("stream_parse"),
+            )
+            catalog_data = self._get_future_result(catalog_future)
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        if isinstance(catalog_data, CatalogIndex):
+            return manifest, catalog_data
+
+        catalog = self._read_catalog(
+            cp=kwargs.get("artifacts_dir"),
+            cv=kwargs.get("catalog_version"),
+            bypass_validation=kwargs.get("bypass_validation"),
+            fast_parse=fast_parse,
+            stream_parse=kwargs.get("stream_parse"),
+            data=catalog_data,
+            unique_ids=self._get_catalog_unique_ids(manifest, **kwargs) if fast_parse else None,
+        )
+        return manifest, catalog
+
+    def _get_artifacts(self, **kwargs) -> tuple:
+        """Read the Manifest and Catalog contents, unless the previous run read the same ones.
+
+        The last artifacts read are kept along with the manifest indexes, so that
+        the runs of the same executor, e.g. the single-model ERDs of the API,
+        read and index them once, as long as the files and read options are unchanged.
+
+        Returns:
+            Tuple of (manifest, catalog, manifest indexes)
+
+        """
+        key = self._get_artifacts_key(**kwargs)
+        if key is None or self._artifacts is None or self._artifacts[0] != key:
+            self._artifacts = None  # release the previous artifacts before reading the new ones
+            manifest, catalog = self._read_artifacts(**kwargs)
+            self._artifacts = (key, manifest, catalog, ManifestIndexes(manifest=manifest))
+        return self._artifacts[1:]
+
+    def _get_artifacts_key(self, **kwargs) -> Optional[tuple]:
+        """Get the key of the artifacts read with the given options, None if they can't be found.
+
+        Returns:
+            Paths, sizes and modification times of the artifact files along with the read options
+
+        """
+        artifacts_dir = kwargs.get("artifacts_dir")
+        files = []
+        for filename in (self.filename_manifest, self.filename_catalog):
+            path = file_handlers.find_artifact_file(artifacts_dir, filename) if artifacts_dir else None
+            if not path:
+                return None
+            stat = os.stat(path)
+            files.append((path, stat.st_size, stat.st_mtime_ns))
+
+        options = tuple(
+            kwargs.get(x)
+            for x in ("manifest_version", "catalog_version", "bypass_validation", "fast_parse", "stream_parse")
+        )
+        return (*files, options, tuple(kwargs.get("resource_type") or ()))
+
+    def _get_catalog_unique_ids(self, manifest, **kwargs) -> Optional[set[str]]:
+        """Get the unique IDs of the manifest tables which can survive the resource type selection.
+
+        Catalog entries of the other tables are never rendered, so they needn't be read.
+
+        Returns:
+            Unique IDs of the selectable models, seeds, snapshots and sources, or None for all
+
+        """
+        resource_types = kwargs.get("resource_type")
+        if not resource_types:
+            return None
+
+        prefixes = tuple(f"{x}." for x in resource_types)
+        unique_ids = set()
+        with cli_messaging.handle_view_errors():
+            for attribute in ("nodes", "sources"):
+                if hasattr(manifest, attribute):
+                    unique_ids.update(x for x in getattr(manifest, attribute) if x.startswith(prefixes))
+        return unique_ids
+
+    def _use_read_concurrency(self, **kwargs) -> bool:
+        """Decide whether the artifacts are read concurrently.
+
+        In `auto` mode, it applies when there are several CPUs and both
+        manifest.json and catalog.json exceed READ_CONCURRENCY_MIN_SIZE.
+
+        Returns:
+            True if catalog.json is to be decoded in a worker process
+
+        """
+        mode = kwargs.get("read_concurrency") or "off"
+        if mode != "auto":
+            return mode == "on"
+
+        if (os.cpu_count() or 1) < 2:
+            return False
+
+        artifacts_dir = kwargs.get("artifacts_dir")
+        for filename in (self.filename_manifest, self.filename_catalog):
+            path = file_handlers.find_artifact_file(artifacts_dir, filename)
+            if not path or os.path.getsize(path) < READ_CONCURRENCY_MIN_SIZE:
+                return False
+        return True
+
+    def _get_future_result(self, future: Optional[Future]) -> Optional[Union[dict, CatalogIndex]]:
+        """Get the worker result, or None if it failed to be read there.
+
+        The file is then read again in the main process, which reports
+        the error the same way as the sequential read does.
+        """
+        if future is None:
+            return None
+
+        try:
+            return future.result()
+        except Exception as e:
+            logger.debug(f"Concurrent read failed, reading sequentially: {e!r}")
+            return None
 
     def _save_result(self, path, data):
         """Save ERD data to file.
@@ -242,6 +478,9 @@ class Executor:
     def _set_single_node_selection(self, manifest, node_unique_id: str, type: Optional[str] = None, **kwargs) -> dict:
         """Override the Selection for the specific manifest node.
 
+        The models within `select_neighbors` relationship hops (1 by default)
+        are selected along with the node.
+
         Args:
             manifest: Manifest data
             node_unique_id: Manifest node unique ID
@@ -254,9 +493,10 @@ class Executor:
         if not node_unique_id:
             return kwargs
 
+        depth = kwargs.pop("select_neighbors", 1)
         algo_adapter = self.load_algo(name=kwargs["algo"])
         kwargs["select"] = algo_adapter.find_related_nodes_by_id(
-            manifest=manifest, node_unique_id=node_unique_id, type=type, **kwargs
+            manifest=manifest, node_unique_id=node_unique_id, type=type, depth=depth, **kwargs
         )
         kwargs["exclude"] = []
 
@@ -265,40 +505,110 @@ class Executor:
     def _run_by_strategy(self, node_unique_id: Optional[str] = None, **kwargs) -> tuple[list[Table], list[Ref]]:
         """Local File - Read artifacts and export the diagram file following the target."""
         if kwargs.get("dbt_cloud"):
-            DbtCloudArtifact(**kwargs).get(artifacts_dir=kwargs.get("artifacts_dir"))
-
-        manifest = self._read_manifest(
-            mp=kwargs.get("artifacts_dir"),
-            mv=kwargs.get("manifest_version"),
-            bypass_validation=kwargs.get("bypass_validation"),
-        )
-        catalog = self._read_catalog(
-            cp=kwargs.get("artifacts_dir"),
-            cv=kwargs.get("catalog_version"),
-            bypass_validation=kwargs.get("bypass_validation"),
-        )
+            load_plugin("DbtCloudArtifact")(**kwargs).get(artifacts_dir=kwargs.get("artifacts_dir"))
+
+        cache = self._get_artifact_cache(node_unique_id=node_unique_id, **kwargs)
+        parsed = cache.load() if cache else None
+        if parsed:
+            algo_adapter = self.load_algo(name=kwargs["algo"])
+            target_adapter = self.load_target(name=kwargs["target"])
+            tables, relationships = algo_adapter.select_parsed(
+                tables=parsed.tables, relationships=parsed.relationships, **kwargs
+            )
+            manifest = ManifestView(
+                {"metadata": {"generated_at": parsed.generated_at}} if parsed.generated_at else {}, path="manifest"
+            )
+            return self._run_target(
+                target_adapter=target_adapter,
+                tables=tables,
+                relationships=relationships,
+                manifest=manifest,
+                **kwargs,
+            )
 
-        if node_unique_id:
-            kwargs = self._set_single_node_selection(manifest=manifest, node_unique_id=node_unique_id, **kwargs)
+        manifest, catalog, manifest_indexes = self._get_artifacts(**kwargs)
 
         # Load adapters
         algo_adapter = self.load_algo(name=kwargs["algo"])
         target_adapter = self.load_target(name=kwargs["target"])
 
-        # Parse artifacts to get tables and relationships
-        tables, relationships = algo_adapter.parse(manifest=manifest, catalog=catalog, **kwargs)
+        with cli_messaging.handle_view_errors(), algo_adapter.use_manifest_indexes(manifest_indexes):
+            if node_unique_id:
+                kwargs = self._set_single_node_selection(manifest=manifest, node_unique_id=node_unique_id, **kwargs)
+
+            # Parse artifacts to get tables and relationships
+            if cache:
+                tables, relationships = algo_adapter.extract_artifacts(manifest=manifest, catalog=catalog, **kwargs)
+                cache.save(
+                    ParsedArtifacts(
+                        tables=tables, relationships=relationships, generated_at=self._get_generated_at(manifest)
+                    )
+                )
+                tables, relationships = algo_adapter.select_parsed(tables=tables, relationships=relationships, **kwargs)
+            else:
+                tables, relationships = algo_adapter.parse(manifest=manifest, catalog=catalog, **kwargs)
+
+        return self._run_target(
+            target_adapter=target_adapter,
+            tables=tables,
+            relationships=relationships,
+            manifest=manifest,
+            **kwargs,
+        )
 
-        # Generate ERD content
-        result = target_adapter.run(tables=tables, relationships=relationships, manifest=manifest, **kwargs)
+    def _run_target(self, target_adapter: BaseTargetAdapter, **kwargs):
+        """Generate the ERD content and save it unless running from the API.
+
+        Args:
+            target_adapter: Target adapter
+            **kwargs: Parsed tables, relationships, manifest and the run options
+
+        Returns:
+            ERD content
+
+        """
+        result = target_adapter.run(**kwargs)
 
         if not kwargs.get("api"):
             self._save_result(path=kwargs.get("output"), data=result)
 
         return result[1]
 
+    def _get_artifact_cache(self, node_unique_id: Optional[str] = None, **kwargs) -> Optional[ArtifactCache]:
+        """Get the parsed-artifact cache entry of the run, if the cache applies.
+
+        The cache is skipped for single-node runs, which need the manifest
+        to find the related nodes, and for algos not supporting the extraction.
+
+        Returns:
+            Cache entry, or None
+
+        """
+        if not kwargs.get("cache") or node_unique_id:
+            return None
+
+        algo_class = PluginRegistry.get_algo(kwargs["algo"].split(":")[0])
+        if not algo_class.supports_artifact_cache:
+            logger.info(f"Artifact cache is not supported by algorithm [{kwargs['algo']}]")
+            return None
+
+        artifacts_dir = kwargs.get("artifacts_dir")
+        manifest_path = file_handlers.find_artifact_file(artifacts_dir, self.filename_manifest)
+        catalog_path = file_handlers.find_artifact_file(artifacts_dir, self.filename_catalog)
+        if not manifest_path or not catalog_path:
+            return None
+
+        return ArtifactCache(manifest_path=manifest_path, catalog_path=catalog_path, **kwargs)
+
+    def _get_generated_at(self, manifest) -> Optional[str]:
+        """Get the manifest generation timestamp as rendered by the targets."""
+        if hasattr(manifest, "metadata") and hasattr(manifest.metadata, "generated_at"):
+            return str(manifest.metadata.generated_at)
+        return None
+
     def _run_metadata_by_strategy(self, **kwargs) -> tuple[list[Table], list[Ref]]:
         """Metadata - Read artifacts and export the diagram file following the target."""
-        data = DbtCloudMetadata(**kwargs).query_erd_data()
+        data = load_plugin("DbtCloudMetadata")(**kwargs).query_erd_data()
 
         # Load adapters
         algo_adapter = self.load_algo(name=kwargs["algo"])
@@ -307,10 +617,4 @@ class Executor:
         # Parse metadata to get tables and relationships
         tables, relationships = algo_adapter.parse(manifest=data, catalog="metadata", **kwargs)
 
-        # Generate ERD content
-        result = target_adapter.run(tables=tables, relationships=relationships, **kwargs)
-
-        if not kwargs.get("api"):
-            self._save_result(path=kwargs.get("output"), data=result)
-
-        return result[1]
+        return self._run_target(target_adapter=target_adapter, tables=tables, relationships=relationships, **kwargs)
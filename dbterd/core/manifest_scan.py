@@ -0,0 +1,71 @@
+"""Single-pass classification of the manifest nodes read by the algorithm adapters.
+
+`ManifestScan` walks the unique IDs of each manifest mapping once and sorts them
+into the buckets the algorithms need (tables, sources, tests, exposures and
+semantic models), so that the adapters look the nodes up by ID instead of
+traversing the whole manifest again for each kind of node.
+
+`ManifestIndexes` holds the scan and the other indexes derived from the same
+manifest, which the executor keeps along with the manifest it read.
+"""
+
+from typing import Callable, Optional, TypeVar
+
+from dbterd.types import Manifest
+
+
+TABLE_NODE_PREFIXES = ("model.", "seed.", "snapshot.")
+
+T = TypeVar("T")
+
+
+class ManifestScan:
+    """Unique IDs of the manifest nodes, classified in a single traversal of each mapping.
+
+    Only the keys are walked: the nodes themselves are left untouched until
+    an adapter looks them up, which matters for the lazily built views.
+    """
+
+    __slots__ = ("exposures", "manifest", "semantic_models", "sources", "tables", "tests")
+
+    def __init__(self, manifest: Manifest):
+        self.manifest = manifest
+        self.tables: list[str] = []
+        """Model, seed and snapshot nodes, in the manifest order."""
+        self.tests: list[str] = []
+        """Test nodes, in the manifest order."""
+        if hasattr(manifest, "nodes"):
+            for unique_id in manifest.nodes:
+                if unique_id.startswith(TABLE_NODE_PREFIXES):
+                    self.tables.append(unique_id)
+                elif unique_id.startswith("test"):
+                    self.tests.append(unique_id)
+
+        self.sources: list[str] = (
+            [x for x in manifest.sources if x.startswith("source")] if hasattr(manifest, "sources") else []
+        )
+        self.exposures: list[str] = list(manifest.exposures) if hasattr(manifest, "exposures") else []
+        self.semantic_models: Optional[list[str]] = (
+            list(manifest.semantic_models) if hasattr(manifest, "semantic_models") else None
+        )
+        """Semantic models, None if the manifest version doesn't support them."""
+
+
+class ManifestIndexes:
+    """Indexes derived from a manifest, e.g. its `ManifestScan`, each built on first use.
+
+    The algorithm adapters only use them while running on this manifest
+    (see `BaseAlgoAdapter.use_manifest_indexes`), so they never keep it alive.
+    """
+
+    __slots__ = ("_indexes", "manifest")
+
+    def __init__(self, manifest: Manifest):
+        self.manifest = manifest
+        self._indexes: dict[str, object] = {}
+
+    def get(self, name: str, build: Callable[[], T]) -> T:
+        """Get the index of the given name, built by calling `build` on the first request."""
+        if name not in self._indexes:
+            self._indexes[name] = build()
+        return self._indexes[name]
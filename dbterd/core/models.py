@@ -1,9 +1,15 @@
-from dataclasses import dataclass, field
+from collections.abc import Callable, Container, Iterable
+from dataclasses import dataclass, field, fields, replace
 from enum import Enum
-from typing import Optional
+import sys
+from typing import Any, Optional
 
 
-@dataclass
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+"""Dataclass options dropping the per-instance `__dict__` of the parsed objects, where supported."""
+
+
+@dataclass(**_SLOTS)
 class Column:
     """Parsed Column object."""
 
@@ -12,9 +18,68 @@ class Column:
     description: str = ""
 
 
-@dataclass
-class Table:
-    """Parsed Table object."""
+class ColumnIndex:
+    """Case-insensitive index of the columns of a table, keeping their order.
+
+    The first column wins when several names only differ by case.
+    """
+
+    __slots__ = ("_positions", "columns")
+
+    def __init__(self, columns: Optional[list[Column]] = None):
+        self.columns: list[Column] = columns if columns is not None else []
+        self._positions: dict[str, int] = {}
+        for position, column in enumerate(self.columns):
+            self._positions.setdefault(column.name.lower(), position)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._positions
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def position(self, name: str) -> Optional[int]:
+        """Get the position of a column in the table, if any."""
+        return self._positions.get(name.lower())
+
+    def get(self, name: str) -> Optional[Column]:
+        """Get a column by its case-insensitive name, if any."""
+        position = self.position(name)
+        return self.columns[position] if position is not None else None
+
+    def append(self, column: Column) -> Column:
+        """Append a column to the table & index it."""
+        self._positions.setdefault(column.name.lower(), len(self.columns))
+        self.columns.append(column)
+        return column
+
+    def positions(self) -> dict[str, int]:
+        """Get the positions of the columns by lowercased name, in the column order."""
+        return dict(self._positions)
+
+
+class LazyValue:
+    """Field value resolved on its first access, e.g. the compiled SQL of a manifest node."""
+
+    __slots__ = ("resolve",)
+
+    def __init__(self, resolve: Callable[[], Any]):
+        self.resolve = resolve
+
+
+class _LazyRawSql:
+    """Slot holding the `LazyValue` of a table's `raw_sql` until it's resolved, see `Table`."""
+
+    __slots__ = ("_lazy_raw_sql",)
+
+
+@dataclass(**_SLOTS)
+class Table(_LazyRawSql):
+    """Parsed Table object.
+
+    `raw_sql` may be given as a `LazyValue`. The attribute is then left unset
+    until it's first read, which resolves it. Copies and pickles carry the resolved value.
+    """
 
     name: str
     database: str
@@ -27,8 +92,37 @@ class Table:
     description: str = ""
     label: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        if self.raw_sql.__class__ is LazyValue:
+            self._lazy_raw_sql = self.raw_sql
+            del self.raw_sql
 
-@dataclass
+    def __getattr__(self, name: str) -> Any:
+        # Only called for the attributes which aren't set, i.e. a raw_sql not resolved yet
+        if name != "raw_sql":
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self.raw_sql = self._lazy_raw_sql.resolve()
+        del self._lazy_raw_sql
+        return self.raw_sql
+
+    def __reduce__(self) -> tuple:
+        # Copied and pickled with the resolved raw_sql, rather than the manifest node it's resolved from
+        return type(self), tuple(getattr(self, x.name) for x in fields(self))
+
+    def replace(self, **changes) -> "Table":
+        """Copy the table with the given field changes, like `dataclasses.replace` but keeping a lazy `raw_sql`."""
+        lazy_raw_sql = getattr(self, "_lazy_raw_sql", None)
+        if lazy_raw_sql is not None:
+            changes.setdefault("raw_sql", lazy_raw_sql)
+        return replace(self, **changes)
+
+
+if not _SLOTS:
+    # Without slots, the class attribute of the default would hide an unresolved raw_sql from __getattr__
+    del Table.raw_sql
+
+
+@dataclass(**_SLOTS)
 class Ref:
     """Parsed Relationship object."""
 
@@ -39,7 +133,79 @@ class Ref:
     relationship_label: Optional[str] = None
 
 
-@dataclass
+class RelationshipGraph:
+    """Undirected graph of the nodes linked by relationships, keeping the insertion order.
+
+    It is built once, then answers the neighborhood queries of any depth
+    by visiting the neighborhood only.
+    """
+
+    __slots__ = ("_adjacency",)
+
+    def __init__(self):
+        self._adjacency: dict[str, dict[str, None]] = {}
+
+    @classmethod
+    def from_relationships(
+        cls, relationships: Iterable[Ref], nodes: Optional[Container[str]] = None
+    ) -> "RelationshipGraph":
+        """Build the graph of the relationships referring to node names, see `BaseAlgoAdapter.extract_artifacts`.
+
+        Args:
+            relationships: Relationships whose table map holds node names
+            nodes: Only link these node names, all if not given
+
+        Returns:
+            Graph object
+        """
+        graph = cls()
+        for ref in relationships:
+            if nodes is None or all(x in nodes for x in ref.table_map):
+                graph.link(*ref.table_map)
+        return graph
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._adjacency
+
+    def __len__(self) -> int:
+        return len(self._adjacency)
+
+    def link(self, *nodes: str) -> None:
+        """Link the given nodes to each other."""
+        for node in nodes:
+            adjacency = self._adjacency.setdefault(node, {})
+            adjacency.update((x, None) for x in nodes if x != node)
+
+    def neighbors(self, node: str) -> list[str]:
+        """Get the nodes directly linked to the given node."""
+        return list(self._adjacency.get(node, ()))
+
+    def get_neighborhood(self, nodes: Iterable[str], depth: Optional[int] = 1) -> list[str]:
+        """Get the given nodes and the nodes within `depth` hops from them, nearest first.
+
+        Args:
+            nodes: Starting nodes, always part of the result
+            depth: Maximum number of hops, unlimited if None
+
+        Returns:
+            List of node names
+        """
+        visited = dict.fromkeys(nodes)
+        frontier = list(visited)
+        hops = 0
+        while frontier and (depth is None or hops < depth):
+            next_frontier = []
+            for node in frontier:
+                for neighbor in self._adjacency.get(node, ()):
+                    if neighbor not in visited:
+                        visited[neighbor] = None
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+            hops += 1
+        return list(visited)
+
+
+@dataclass(**_SLOTS)
 class SemanticEntity:
     """Parsed Semantic Model's Entity object."""
 
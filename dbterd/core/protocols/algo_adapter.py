@@ -47,6 +47,7 @@ class AlgoAdapter(Protocol):
         manifest: Union[Manifest, dict],
         node_unique_id: str,
         type: Optional[str] = None,
+        depth: Optional[int] = 1,
         **kwargs,
     ) -> list[str]:
         """
@@ -56,6 +57,7 @@ class AlgoAdapter(Protocol):
             manifest: Manifest data
             node_unique_id: Manifest node unique ID
             type: Manifest type (local file or metadata)
+            depth: Number of relationship hops from the given model, unlimited if None
             **kwargs: Additional options
 
         Returns:
@@ -3,17 +3,24 @@
 This module provides the central registry for target and algorithm adapters.
 """
 
+import importlib
+import pkgutil
 from typing import ClassVar
 
 from dbterd.core.registry.models import PluginInfo
 
 
+BUILTIN_ADAPTER_PACKAGES = ("dbterd.adapters.algos", "dbterd.adapters.targets")
+"""Packages of the built-in adapters, imported on the first lookup to keep them out of the CLI startup."""
+
+
 class PluginRegistry:
     """Central registry for target and algo adapters.
 
     This class maintains dictionaries of registered target and algorithm adapters.
     Adapters can be registered using the @register_target and @register_algo decorators,
-    or by calling the register methods directly.
+    or by calling the register methods directly. The built-in adapters of
+    `BUILTIN_ADAPTER_PACKAGES` are registered on the first lookup.
 
     Example:
         @register_target("dbml", description="DBML format")
@@ -28,6 +35,18 @@ class PluginRegistry:
 
     _targets: ClassVar[dict[str, PluginInfo]] = {}
     _algos: ClassVar[dict[str, PluginInfo]] = {}
+    _builtins_loaded: ClassVar[bool] = False
+
+    @classmethod
+    def _load_builtins(cls) -> None:
+        """Import the built-in adapter modules once, registering them via their decorators."""
+        if cls._builtins_loaded:
+            return
+        cls._builtins_loaded = True
+        for package_name in BUILTIN_ADAPTER_PACKAGES:
+            package = importlib.import_module(package_name)
+            for _, module_name, _ in pkgutil.iter_modules(package.__path__):
+                importlib.import_module(f"{package_name}.{module_name}")
 
     @classmethod
     def _check_registered(cls, name: str, registry: dict[str, PluginInfo], registry_name: str) -> None:
@@ -38,6 +57,7 @@ class PluginRegistry:
             registry: Registry dictionary to check in
             registry_name: Human-readable name for error message
         """
+        cls._load_builtins()
         if name not in registry:
             available = list(registry.keys())
             raise KeyError(f"{registry_name} '{name}' not registered. Available: {available}")
@@ -116,6 +136,7 @@ class PluginRegistry:
             True if registered, False otherwise
 
         """
+        cls._load_builtins()
         return name in cls._targets
 
     @classmethod
@@ -130,6 +151,7 @@ class PluginRegistry:
             True if registered, False otherwise
 
         """
+        cls._load_builtins()
         return name in cls._algos
 
     @classmethod
@@ -141,6 +163,7 @@ class PluginRegistry:
             List of registered target names
 
         """
+        cls._load_builtins()
         return list(cls._targets.keys())
 
     @classmethod
@@ -152,6 +175,7 @@ class PluginRegistry:
             List of registered algorithm names
 
         """
+        cls._load_builtins()
         return list(cls._algos.keys())
 
     @classmethod
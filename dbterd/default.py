@@ -1,9 +1,8 @@
-import json
 import os
 from pathlib import Path
 from typing import Optional
 
-from dbterd.helpers.file import extract_artifact_version_from_file
+from dbterd.helpers.file import ARTIFACT_DECOMPRESSION_ERRORS, find_artifact_file, sniff_artifact_version
 
 
 def default_artifact_path() -> str:
@@ -29,6 +28,10 @@ def default_resource_types() -> list[str]:
     return default_value
 
 
+def default_select_neighbors() -> int:
+    return int(os.environ.get("DBTERD_SELECT_NEIGHBORS", "0"))
+
+
 def default_entity_name_format() -> str:
     return os.environ.get("DBTERD_ENTITY_NAME_FORMAT", "resource.package.model")
 
@@ -97,6 +100,30 @@ def default_bypass_validation() -> bool:
     return os.environ.get("DBTERD_BYPASS_VALIDATION", "true").lower() in ["true", "yes", "1"]
 
 
+def default_fast_parse() -> bool:
+    return os.environ.get("DBTERD_FAST_PARSE", "false").lower() in ["true", "yes", "1"]
+
+
+def default_stream_parse() -> bool:
+    return os.environ.get("DBTERD_STREAM_PARSE", "false").lower() in ["true", "yes", "1"]
+
+
+def default_cache() -> bool:
+    return os.environ.get("DBTERD_CACHE", "false").lower() in ["true", "yes", "1"]
+
+
+def default_read_concurrency() -> str:
+    return os.environ.get("DBTERD_READ_CONCURRENCY", "auto")
+
+
+def default_jobs() -> int:
+    return int(os.environ.get("DBTERD_JOBS", "1"))
+
+
+def default_json_backend() -> str:
+    return os.environ.get("DBTERD_JSON_BACKEND", "auto")
+
+
 def default_init_template() -> str:
     return os.environ.get("DBTERD_INIT_TEMPLATE", "dbt-core")
 
@@ -108,6 +135,8 @@ def default_init_force() -> bool:
 def default_manifest_version(artifacts_dir: Optional[str] = None) -> Optional[str]:
     """Auto-detect manifest.json version from metadata.
 
+    Only the head of the file is read, the document itself is parsed once later on.
+
     Args:
         artifacts_dir: Optional artifacts directory path. If not provided, uses default.
 
@@ -121,16 +150,12 @@ def default_manifest_version(artifacts_dir: Optional[str] = None) -> Optional[st
     if not artifacts_dir:
         artifacts_dir = default_artifacts_dir() or default_artifact_path()
 
-    manifest_path = Path(artifacts_dir) / "manifest.json"
+    manifest_path = find_artifact_file(artifacts_dir, "manifest.json")
 
-    if manifest_path.exists():
+    if manifest_path:
         try:
-            with open(manifest_path, encoding="utf-8") as f:
-                manifest_data = json.load(f)
-                if "metadata" in manifest_data and "dbt_schema_version" in manifest_data["metadata"]:
-                    schema_version = manifest_data["metadata"]["dbt_schema_version"]
-                    return extract_artifact_version_from_file(schema_version)
-        except (json.JSONDecodeError, KeyError, OSError):
+            return sniff_artifact_version(manifest_path)
+        except (OSError, ImportError, *ARTIFACT_DECOMPRESSION_ERRORS):
             pass
 
     return None
@@ -139,6 +164,8 @@ def default_manifest_version(artifacts_dir: Optional[str] = None) -> Optional[st
 def default_catalog_version(artifacts_dir: Optional[str] = None) -> Optional[str]:
     """Auto-detect catalog.json version from metadata.
 
+    Only the head of the file is read, the document itself is parsed once later on.
+
     Args:
         artifacts_dir: Optional artifacts directory path. If not provided, uses default.
 
@@ -152,16 +179,12 @@ def default_catalog_version(artifacts_dir: Optional[str] = None) -> Optional[str
     if not artifacts_dir:
         artifacts_dir = default_artifacts_dir() or default_artifact_path()
 
-    catalog_path = Path(artifacts_dir) / "catalog.json"
+    catalog_path = find_artifact_file(artifacts_dir, "catalog.json")
 
-    if catalog_path.exists():
+    if catalog_path:
         try:
-            with open(catalog_path, encoding="utf-8") as f:
-                catalog_data = json.load(f)
-                if "metadata" in catalog_data and "dbt_schema_version" in catalog_data["metadata"]:
-                    schema_version = catalog_data["metadata"]["dbt_schema_version"]
-                    return extract_artifact_version_from_file(schema_version)
-        except (json.JSONDecodeError, KeyError, OSError):
+            return sniff_artifact_version(catalog_path)
+        except (OSError, ImportError, *ARTIFACT_DECOMPRESSION_ERRORS):
             pass
 
     return None
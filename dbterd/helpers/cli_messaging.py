@@ -4,21 +4,36 @@ from pathlib import Path
 
 import click
 
+from dbterd.core.artifact_view import ArtifactValidationError
+from dbterd.helpers.file import ARTIFACT_DECOMPRESSION_ERRORS, find_artifact_file
+from dbterd.helpers.json_backend import JSON_DECODE_ERRORS
+
 
 @contextlib.contextmanager
 def handle_read_errors(filename, conditional_msg: str = ""):
     try:
         yield
-    except (json.JSONDecodeError, ValueError) as e:
+    except (json.JSONDecodeError, *JSON_DECODE_ERRORS, *ARTIFACT_DECOMPRESSION_ERRORS) as e:
         raise click.FileError(
             filename,
             f"File {filename} is corrupted{conditional_msg}, please rebuild",
         ) from e
+    except ImportError as e:
+        raise click.FileError(filename, str(e)) from e
+
+
+@contextlib.contextmanager
+def handle_view_errors():
+    try:
+        yield
+    except ArtifactValidationError as e:
+        filename = f"{e.path.split('.')[0]}.json"
+        raise click.FileError(filename, f"File {filename} is corrupted: {e!s}") from e
 
 
 def check_existence(path_str: str, filename: str) -> None:
     path = Path(path_str)
     if not path.is_dir():
         raise click.FileError(filename, f"Path {path_str} does not exist")
-    elif not (path / filename).is_file():
+    elif find_artifact_file(path_str, filename) is None:
         raise click.FileError(filename, f"File {filename} does not exist in directory {path_str}")
@@ -1,13 +1,38 @@
-import json
+from collections.abc import Collection
+import gzip
+import mmap
 import os
 import re
 import sys
-from typing import Optional
+from typing import BinaryIO, Optional
+
+from dbterd.core.artifact_view import (
+    MANIFEST_STREAM_PROJECTION,
+    CatalogIndex,
+    CatalogView,
+    ManifestView,
+    get_catalog_projection,
+)
+from dbterd.helpers import json_backend
+from dbterd.helpers.json_stream import read_projection
+from dbterd.helpers.log import logger
+from dbterd.types import Catalog, Manifest, get_artifact_schema
 
-from dbt_artifacts_parser import parser
 
-from dbterd.helpers.log import logger
-from dbterd.types import Catalog, Manifest
+# zstd support is optional, installed with the `zstd` extra
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+ARTIFACT_VERSION_SNIFF_SIZE = 64 * 1024
+ARTIFACT_SCHEMA_URL = "https://schemas.getdbt.com/dbt/{artifact}/v{version}.json"
+SCHEMA_VERSION_PATTERN = re.compile(r'"dbt_schema_version"\s*:\s*"([^"]*)"')
+ARTIFACT_COMPRESSION_SUFFIXES = (".gz", ".zst")
+ARTIFACT_DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (EOFError, gzip.BadGzipFile) + (
+    (zstandard.ZstdError,) if zstandard else ()
+)
 
 
 def extract_artifact_version_from_file(schema_version: str) -> Optional[str]:
@@ -26,6 +51,42 @@ def extract_artifact_version_from_file(schema_version: str) -> Optional[str]:
     return None
 
 
+def sniff_artifact_version(path: str, size: int = ARTIFACT_VERSION_SNIFF_SIZE) -> Optional[str]:
+    """Read the artifact version from the head of the file without parsing the whole document.
+
+    dbt writes the `metadata` block first, so `dbt_schema_version` is found
+    within the first few KB even for manifests of hundreds of MB.
+
+    Args:
+        path: Artifact file path
+        size: Number of bytes to inspect from the start of the file
+
+    Returns:
+        Version string like "12", or None if not found in the file head
+    """
+    with open_artifact(path) as handle:
+        head = handle.read(size).decode("utf-8", errors="ignore")
+
+    match = SCHEMA_VERSION_PATTERN.search(head)
+    if match:
+        return extract_artifact_version_from_file(match.group(1))
+    return None
+
+
+def get_artifact_version(artifact: dict) -> Optional[int]:
+    """Get the artifact version from an already decoded artifact dict.
+
+    Args:
+        artifact: Decoded manifest.json or catalog.json content
+
+    Returns:
+        Version number, or None if the metadata does not carry it
+    """
+    metadata = artifact.get("metadata") or {}
+    version = extract_artifact_version_from_file(str(metadata.get("dbt_schema_version") or ""))
+    return int(version) if version else None
+
+
 def get_sys_platform():  # pragma: no cover
     return sys.platform
 
@@ -37,10 +98,68 @@ else:
     c_bool = None  # pragma: no cover
 
 
-def load_file_contents(path: str, strip: bool = True) -> str:
+def find_artifact_file(directory: str, filename: str) -> Optional[str]:
+    """Find an artifact file in a directory, either as-is or compressed.
+
+    Args:
+        directory: Artifacts directory path
+        filename: Artifact file name e.g. `manifest.json`
+
+    Returns:
+        Path of the first file found among `filename`, `filename.gz` and `filename.zst`, or None
+    """
+    for suffix in ("", *ARTIFACT_COMPRESSION_SUFFIXES):
+        path = f"{directory}/{filename}{suffix}"
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def get_artifact_path(directory: str, filename: str) -> str:
+    """Get the path of an artifact file, defaulting to the uncompressed one when none is found.
+
+    Args:
+        directory: Artifacts directory path
+        filename: Artifact file name e.g. `manifest.json`
+
+    Returns:
+        Artifact file path
+    """
+    return find_artifact_file(directory, filename) or f"{directory}/{filename}"
+
+
+def open_artifact(path: str) -> BinaryIO:
+    """Open an artifact file for binary reading, decompressing on the fly by its suffix.
+
+    Compressed files (`.gz`, `.zst`) are decompressed as they are read,
+    no decompressed copy being written to disk.
+
+    Args:
+        path: Artifact file path
+
+    Raises:
+        ImportError: The file is zstd-compressed but `zstandard` is not installed
+
+    Returns:
+        Binary file handle over the decompressed content
+    """
     path = convert_path(path)
-    with open(path, "rb") as handle:
-        to_return = handle.read().decode("utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError(f'Reading {path} requires the zstandard package: pip install "dbterd[zstd]"')
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+    return open(path, "rb")
+
+
+def load_file_contents(path: str, strip: bool = True, memory_map: bool = False) -> str:
+    memory_map = memory_map and not path.endswith(ARTIFACT_COMPRESSION_SUFFIXES)
+    with open_artifact(path) as handle:
+        if memory_map and os.fstat(handle.fileno()).st_size:
+            to_return = read_mapped_text(handle)
+        else:
+            to_return = handle.read().decode("utf-8")
 
     if strip:
         to_return = to_return.strip()
@@ -48,16 +167,49 @@ def load_file_contents(path: str, strip: bool = True) -> str:
     return to_return
 
 
-def open_json(fp: str) -> dict:
+def read_mapped_text(handle) -> str:
+    """Decode a file straight from its memory mapping.
+
+    This avoids holding an intermediate bytes copy of the whole file next to the
+    decoded text: the mapped pages are backed by the file itself and released
+    as soon as the mapping is closed.
+
+    Args:
+        handle: Binary file handle of a non-empty file
+
+    Returns:
+        Decoded file content
+    """
+    with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        return str(mapped, "utf-8")
+
+
+def open_json(fp: str, backend: Optional[str] = None) -> dict:
     """Json loading utility, leveraging long path fixes.
 
+    The file is memory-mapped and decoded once, without stripping which would
+    make another full-size copy (the JSON decoder ignores surrounding whitespaces).
+    Backends decoding bytes natively read the mapping itself, skipping the text
+    decoding. Compressed files are decompressed in memory instead.
+
     Args:
         fp: File path to JSON file
+        backend: JSON backend name, the selected one if not specified
 
     Returns:
         Parsed JSON as dictionary
     """
-    return json.loads(load_file_contents(fp))
+    selected = json_backend.resolve_backend(backend) if backend else json_backend.get_backend()
+    if not selected.binary:
+        return selected.loads(load_file_contents(fp, strip=False, memory_map=True))
+
+    with open_artifact(fp) as handle:
+        if fp.endswith(ARTIFACT_COMPRESSION_SUFFIXES) or not os.fstat(handle.fileno()).st_size:
+            return selected.loads(handle.read())
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return selected.loads(view)
 
 
 def patch_parser_compatibility(artifact: str = "catalog", artifact_version: Optional[int] = None) -> None:
@@ -178,6 +330,9 @@ def read_manifest(path: str, version: Optional[int] = None, enable_compat_patch:
     """
     Reads in the manifest.json file, with optional version specification.
 
+    The file is decoded once and the resulting dict is handed to the parser,
+    falling back to the version found in its metadata when none is given.
+
     Args:
         path (str): manifest.json file path
         version (int, optional): Manifest version. Defaults to None (auto-detect).
@@ -187,55 +342,184 @@ def read_manifest(path: str, version: Optional[int] = None, enable_compat_patch:
         dict: Manifest dict
 
     """
+    _dict = open_json(get_artifact_path(path, "manifest.json"))
+    if version is None:
+        version = get_artifact_version(_dict)
+
     if enable_compat_patch and version:
         logger.info(f"Patching manifest v{version} for compatibility...")
         patch_parser_compatibility(artifact="manifest", artifact_version=version)
 
-    _dict = open_json(f"{path}/manifest.json")
-    default_parser = "parse_manifest"
-    parser_version = f"parse_manifest_v{version}" if version else default_parser
-    if not hasattr(parser, parser_version):
-        logger.warning(
-            "Manifest version is NOT SUPPORTED in current `dbt-artifacts-parser` package. \n"
-            "Please help to try `-mv {version}` option with other value, OR upgrade the package:\n"
-            "\tpip install dbt-artifacts-parser --upgrade\n"
-            "Try falling back to the latest one..."
-        )
-        parser_version = default_parser
-    parse_func = getattr(parser, parser_version)
-    return parse_func(manifest=_dict)
+    return parse_artifact(artifact="manifest", data=_dict, version=version)
 
 
-def read_catalog(path: str, version: Optional[int] = None, enable_compat_patch: bool = False) -> Catalog:
+def read_catalog(
+    path: str, version: Optional[int] = None, enable_compat_patch: bool = False, data: Optional[dict] = None
+) -> Catalog:
     """
     Reads in the catalog.json file, with optional version specification.
 
+    The file is decoded once and the resulting dict is handed to the parser,
+    falling back to the version found in its metadata when none is given.
+
     Args:
         path (str): catalog.json file path
         version (int, optional): Catalog version. Defaults to None.
         enable_compat_patch (bool, optional): Enable compatibility monkey patching. Defaults to True.
+        data (dict, optional): Already decoded catalog.json content. Defaults to None (read the file).
 
     Returns:
         dict: Catalog dict
 
     """
+    _dict = data if data is not None else open_json(get_artifact_path(path, "catalog.json"))
+    if version is None:
+        version = get_artifact_version(_dict)
+
     if enable_compat_patch and version:
         logger.info(f"Patching catalog v{version} for compatibility...")
         patch_parser_compatibility(artifact="catalog", artifact_version=version)
 
-    _dict = open_json(f"{path}/catalog.json")
-    default_parser = "parse_catalog"
-    parser_version = f"parse_catalog_v{version}" if version else default_parser
-    if not hasattr(parser, parser_version):
+    return parse_artifact(artifact="catalog", data=_dict, version=version)
+
+
+def parse_artifact(artifact: str, data: dict, version: Optional[int] = None):
+    """
+    Validate a decoded artifact with its dbt-artifacts-parser model.
+
+    Mirrors the `parse_<artifact>_v<version>` functions of dbt-artifacts-parser, but
+    imports the schema module of the parsed version only, instead of all of them.
+
+    Args:
+        artifact (str): Artifact type ('manifest' or 'catalog')
+        data (dict): Decoded artifact content
+        version (int, optional): Artifact version. Defaults to None (the one of the metadata).
+
+    Raises:
+        ValueError: The artifact doesn't match the version, or its version is not supported
+
+    Returns:
+        Pydantic model of the artifact
+
+    """
+    schema = get_artifact_schema(artifact, version) if version else None
+    if version and schema is None:
         logger.warning(
-            "Catalog version is NOT SUPPORTED in current `dbt-artifacts-parser` package. \n"
-            "Please help to try `-mv {version}` option with other value, OR upgrade the package:\n"
+            f"{artifact.capitalize()} version is NOT SUPPORTED in current `dbt-artifacts-parser` package. \n"
+            f"Please help to try `-{artifact[0]}v {version}` option with other value, OR upgrade the package:\n"
             "\tpip install dbt-artifacts-parser --upgrade\n"
             "Try falling back to the latest one..."
         )
-        parser_version = default_parser
-    parse_func = getattr(parser, parser_version)
-    return parse_func(catalog=_dict)
+    if schema is None:
+        version = get_artifact_version(data)
+        schema = get_artifact_schema(artifact, version) if version else None
+        if schema is None:
+            raise ValueError(f"Not a {artifact}.json")
+
+    schema_version = (data.get("metadata") or {}).get("dbt_schema_version")
+    if schema_version != ARTIFACT_SCHEMA_URL.format(artifact=artifact, version=version):
+        raise ValueError(f"Not a {artifact}.json v{version}")
+    return schema(**data)
+
+
+def read_manifest_view(path: str) -> ManifestView:
+    """
+    Reads in the manifest.json file as a lightweight view, skipping the Pydantic validation.
+
+    Fields are validated only when the algorithm adapters read them.
+
+    Args:
+        path (str): manifest.json file path
+
+    Returns:
+        ManifestView: Attribute-access view over the raw manifest dict
+
+    """
+    return ManifestView(open_json(get_artifact_path(path, "manifest.json")), path="manifest")
+
+
+def read_manifest_stream(path: str) -> ManifestView:
+    """
+    Reads in the manifest.json file incrementally as a lightweight view.
+
+    Only the nodes, sources, exposures and semantic models fields used by the
+    algorithm adapters are materialized, the rest of the document is skipped.
+    Compressed files are decompressed chunk by chunk along the way.
+
+    Args:
+        path (str): manifest.json file path
+
+    Returns:
+        ManifestView: Attribute-access view over the projected manifest dict
+
+    """
+    with open_artifact(get_artifact_path(path, "manifest.json")) as handle:
+        return ManifestView(read_projection(handle, spec=MANIFEST_STREAM_PROJECTION), path="manifest")
+
+
+def read_catalog_view(path: str, data: Optional[dict] = None) -> CatalogView:
+    """
+    Reads in the catalog.json file as a lightweight view, skipping the Pydantic validation.
+
+    Fields are validated only when the algorithm adapters read them.
+
+    Args:
+        path (str): catalog.json file path
+        data (dict, optional): Already decoded catalog.json content. Defaults to None (read the file).
+
+    Returns:
+        CatalogView: Attribute-access view over the raw catalog dict
+
+    """
+    return CatalogView(data if data is not None else open_json(get_artifact_path(path, "catalog.json")), path="catalog")
+
+
+def read_catalog_index(
+    path: str,
+    data: Optional[dict] = None,
+    unique_ids: Optional[Collection[str]] = None,
+    stream: bool = False,
+    backend: Optional[str] = None,
+    resource_types: Optional[Collection[str]] = None,
+) -> CatalogIndex:
+    """
+    Reads in the catalog.json file as a compact index of the columns name, type and comment.
+
+    Stats, metadata and the other column attributes are never materialized.
+    In streaming mode, the file is read incrementally and the tables which are
+    not kept are skipped without being decoded.
+
+    Args:
+        path (str): catalog.json file path
+        data (dict, optional): Already decoded catalog.json content. Defaults to None (read the file).
+        unique_ids (Collection[str], optional): Node and source unique IDs to keep. Defaults to None (all).
+        stream (bool, optional): Read the file incrementally. Defaults to False.
+        backend (str, optional): JSON backend name. Defaults to None (the selected one).
+        resource_types (Collection[str], optional): Resource types of the nodes and sources to keep,
+            for the callers which don't know the unique IDs yet. Defaults to None (all).
+
+    Returns:
+        CatalogIndex: Columns of the catalog nodes and sources
+
+    """
+    if data is None:
+        if stream:
+            with open_artifact(get_artifact_path(path, "catalog.json")) as handle:
+                data = read_projection(handle, spec=get_catalog_projection(unique_ids, resource_types))
+        else:
+            data = open_json(get_artifact_path(path, "catalog.json"), backend=backend)
+    return CatalogIndex.from_catalog(data, unique_ids=unique_ids, resource_types=resource_types)
+
+
+def write_artifact(data: bytes, path: str) -> None:
+    """Persist the raw content of an artifact file, as downloaded.
+
+    Args:
+        data: Artifact file content
+        path: File path
+    """
+    with open(path, "wb") as file:
+        file.write(data)
 
 
 def write_json(data: str, path: str) -> None:
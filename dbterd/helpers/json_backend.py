@@ -0,0 +1,144 @@
+"""Pluggable JSON backend used to decode the artifacts and to encode the artifact cache entries.
+
+The fastest installed library is used by default: orjson, then msgspec,
+falling back to the stdlib `json` module. A backend can also be selected
+explicitly, e.g. via the `--json-backend` option. The ERD outputs are
+always encoded with the stdlib `json` module, whose separators and escaping
+don't depend on the installed libraries.
+"""
+
+import dataclasses
+import json
+from typing import Any, Callable, Optional, Union
+
+
+# orjson and msgspec are optional, installed with the `fast-json` extra
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+JSON_BACKENDS = ["auto", "orjson", "msgspec", "json"]
+
+JSON_DECODE_ERRORS: tuple[type[Exception], ...] = (ValueError,) + ((msgspec.DecodeError,) if msgspec else ())
+"""Errors raised by the backends on malformed documents (orjson and stdlib ones being ValueError)."""
+
+
+@dataclasses.dataclass(frozen=True)
+class JsonBackend:
+    """JSON library binding.
+
+    Attributes:
+        name: Backend name
+        loads: Decode a document, given as bytes-like when `binary` is set, as string otherwise
+        dumps: Encode an object to a string, indented with 2 spaces when `pretty` is set
+        binary: Whether `loads` decodes bytes-like objects (including memory views) natively
+    """
+
+    name: str
+    loads: Callable[[Union[str, bytes, memoryview]], Any]
+    dumps: Callable[..., str]
+    binary: bool = False
+
+
+def _json_dumps(obj: Any, pretty: bool = False) -> str:
+    return json.dumps(obj, indent=2 if pretty else None)
+
+
+def _orjson_dumps(obj: Any, pretty: bool = False) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None).decode("utf-8")
+
+
+def _msgspec_dumps(obj: Any, pretty: bool = False) -> str:
+    encoded = msgspec.json.encode(obj)
+    return (msgspec.json.format(encoded, indent=2) if pretty else encoded).decode("utf-8")
+
+
+def _get_backends() -> dict[str, JsonBackend]:
+    backends = {}
+    if orjson is not None:
+        backends["orjson"] = JsonBackend(name="orjson", loads=orjson.loads, dumps=_orjson_dumps, binary=True)
+    if msgspec is not None:
+        backends["msgspec"] = JsonBackend(name="msgspec", loads=msgspec.json.decode, dumps=_msgspec_dumps, binary=True)
+    backends["json"] = JsonBackend(name="json", loads=json.loads, dumps=_json_dumps)
+    return backends
+
+
+_BACKENDS = _get_backends()
+_current: Optional[JsonBackend] = None
+
+
+def get_available_backends() -> list[str]:
+    """Get the names of the installed backends, fastest first."""
+    return list(_BACKENDS)
+
+
+def resolve_backend(name: Optional[str] = "auto") -> JsonBackend:
+    """Get a backend by name.
+
+    Args:
+        name: Backend name, `auto` (or None) for the fastest installed one
+
+    Raises:
+        ValueError: The backend is unknown or not installed
+
+    Returns:
+        JSON backend
+    """
+    name = (name or "auto").lower()
+    if name == "auto":
+        return next(iter(_BACKENDS.values()))
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend `{name}`, expected one of {JSON_BACKENDS}")
+    if name not in _BACKENDS:
+        raise ValueError(f'JSON backend `{name}` is not installed, please run: pip install "dbterd[fast-json]"')
+    return _BACKENDS[name]
+
+
+def use_backend(name: Optional[str] = "auto") -> JsonBackend:
+    """Select the backend used by `loads` and `dumps`.
+
+    Args:
+        name: Backend name, `auto` (or None) for the fastest installed one
+
+    Raises:
+        ValueError: The backend is unknown or not installed
+
+    Returns:
+        Selected JSON backend
+    """
+    global _current  # noqa: PLW0603
+    _current = resolve_backend(name)
+    return _current
+
+
+def get_backend() -> JsonBackend:
+    """Get the selected backend, defaulting to the fastest installed one."""
+    return _current or resolve_backend()
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document with the selected backend."""
+    backend = get_backend()
+    if not backend.binary and isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data)
+    return backend.loads(data)
+
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """Encode an object to a JSON string with the selected backend.
+
+    Args:
+        obj: Object made of dicts, lists, strings, numbers, booleans and None
+        pretty: Indent the output with 2 spaces
+
+    Returns:
+        JSON string
+    """
+    return get_backend().dumps(obj, pretty=pretty)
@@ -0,0 +1,291 @@
+"""Incremental JSON reader projecting a document onto a subset of its keys.
+
+This module walks a JSON document chunk by chunk and materializes only the
+values selected by a projection spec. Values outside of the projection are
+skipped by scanning over their text, so large blocks such as `macros`, `docs`
+or `compiled_code` never get decoded into Python objects.
+
+A projection spec is a dict mapping object keys to either:
+    - `True`: keep the whole value
+    - a nested spec: walk into the object and keep only the listed keys
+
+Keys can be given literally, as a prefix pattern (`"model.*"`) or as the
+`"*"` wildcard matching any key.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Optional, Union
+
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+ProjectionSpec = dict[str, Union[bool, "ProjectionSpec"]]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(?P<end>")?', re.DOTALL)
+_STRUCTURE = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*(?P<end>[{}\[\]])?', re.DOTALL)
+_SCALAR = re.compile(r"[^,}\]\s]*")
+_KEY = re.compile(r'[ \t\n\r]*(?P<comma>,)?[ \t\n\r]*"(?P<key>[^"\\]*(?:\\.[^"\\]*)*)"[ \t\n\r]*:[ \t\n\r]*')
+
+
+class JsonStream:
+    """Pull-based reader over a JSON document stored in a binary file handle."""
+
+    def __init__(self, handle: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+
+    def error(self, message: str, pos: Optional[int] = None) -> json.JSONDecodeError:
+        """Build a decoding error located at the given (or current) buffer position."""
+        return json.JSONDecodeError(message, self._buf, self._pos if pos is None else pos)
+
+    def _more(self, keep_from: int) -> int:
+        """Append the next chunk to the buffer, dropping the text before `keep_from`.
+
+        Args:
+            keep_from: Buffer index of the first character still needed
+
+        Returns:
+            Number of dropped characters, or -1 when the end of file is reached
+        """
+        chunk = self._handle.read(self._chunk_size)
+        text = self._decoder.decode(chunk, final=not chunk)
+        if not chunk and not text:
+            return -1
+        self._buf = self._buf[keep_from:] + text
+        self._pos = max(self._pos - keep_from, 0)
+        return keep_from
+
+    def peek(self) -> str:
+        """Skip whitespaces and return the next character without consuming it.
+
+        Returns:
+            Next significant character, or an empty string at end of file
+        """
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._more(self._pos) < 0:
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the next significant character, which must be `char`."""
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _token_end(self, pattern: re.Pattern, idx: int, discard: bool) -> re.Match:
+        """Search the next token from `idx`, refilling the buffer until the token is complete.
+
+        Args:
+            pattern: Token pattern, strings being complete only when their `end` group is set
+            idx: Buffer index to search from
+            discard: Drop the text before the token when refilling
+
+        Returns:
+            Match of the complete token
+        """
+        while True:
+            match = pattern.search(self._buf, idx)
+            complete = match is not None and (match.group()[:1] != '"' or match.group("end") is not None)
+            if complete and match.end() < len(self._buf):
+                return match
+            size = len(self._buf) if match is None else match.start()
+            shift = self._more(size if discard else self._pos)
+            if shift < 0:
+                if complete:
+                    return match
+                raise self.error("Unterminated value", idx)
+            idx = size - shift
+
+    def _value_end(self, discard: bool = False) -> int:
+        """Get the buffer index right after the value starting at the current position.
+
+        Args:
+            discard: Drop the scanned text from the buffer while scanning
+
+        Returns:
+            Index of the end of the value in the (possibly refilled) buffer
+        """
+        first = self._buf[self._pos]
+        if first == '"':
+            return self._token_end(_STRING, self._pos, discard).end()
+        if first not in "{[":
+            return self._token_end(_SCALAR, self._pos, discard).end()
+
+        idx = self._pos
+        depth = 0
+        while True:
+            match = _STRUCTURE.match(self._buf, idx)
+            char = match.group("end")
+            if char is None:
+                # scanned text has no bracket outside of strings, resume after it
+                size = match.end()
+                shift = self._more(size if discard else self._pos)
+                if shift < 0:
+                    raise self.error("Unterminated value", idx)
+                idx = size - shift
+                continue
+
+            idx = match.end()
+            if char in ("{", "["):
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return idx
+
+    def _at_value(self) -> bool:
+        """Whether the current position is on a significant character, skipping whitespaces if needed."""
+        if self._pos < len(self._buf) and self._buf[self._pos] not in " \t\n\r":
+            return True
+        return bool(self.peek())
+
+    def read_value(self) -> Any:
+        """Decode and consume the next value."""
+        if not self._at_value():
+            raise self.error("Expecting value")
+        end = self._value_end()
+        value, decoded_end = self._json_decoder.raw_decode(self._buf, self._pos)
+        if decoded_end != end:
+            raise self.error("Invalid value", decoded_end)
+        self._pos = end
+        return value
+
+    def skip_value(self) -> None:
+        """Consume the next value without decoding it."""
+        if not self._at_value():
+            raise self.error("Expecting value")
+        self._pos = self._value_end(discard=True)
+
+    def next_key(self, first: bool) -> Optional[str]:
+        """Consume the next key of the current object, up to its colon.
+
+        Args:
+            first: Whether this is the first key right after the opening brace
+
+        Returns:
+            The key, or None when the closing brace is reached (and consumed)
+        """
+        match = _KEY.match(self._buf, self._pos)
+        if match is not None and (match.group("comma") is None) == first and match.end() < len(self._buf):
+            self._pos = match.end()
+            key = match.group("key")
+            return json.loads(f'"{key}"') if "\\" in key else key
+
+        char = self.peek()
+        if char == "}":
+            self._pos += 1
+            return None
+        if not first:
+            self.expect(",")
+            char = self.peek()
+        if char != '"':
+            raise self.error("Expecting property name enclosed in double quotes")
+        key = self.read_value()
+        self.expect(":")
+        return key
+
+    def read_projection(self, spec: ProjectionSpec) -> Any:
+        """Read the next value keeping only the keys selected by the spec.
+
+        Args:
+            spec: Projection spec to apply on the next object
+
+        Returns:
+            Projected value. Non-object values are returned as-is.
+        """
+        return self._read_projection(_Projection(spec))
+
+    def _read_projection(self, projection: "_Projection") -> Any:
+        if self.peek() != "{":
+            return self.read_value()
+
+        self._pos += 1
+        result = {}
+        key = self.next_key(first=True)
+        while key is not None:
+            key_projection = projection.get(key)
+            if key_projection is True:
+                result[key] = self.read_value()
+            elif key_projection is not None:
+                result[key] = self._read_projection(key_projection)
+            else:
+                self.skip_value()
+            key = self.next_key(first=False)
+        return result
+
+
+class _Projection:
+    """Projection spec compiled for lookups, literal keys taking precedence over patterns."""
+
+    __slots__ = ("keys", "patterns")
+
+    def __init__(self, spec: ProjectionSpec) -> None:
+        self.keys: dict[str, Union[bool, _Projection]] = {}
+        self.patterns: list[tuple[str, Union[bool, _Projection]]] = []
+        for key, key_spec in spec.items():
+            compiled = key_spec if isinstance(key_spec, bool) else _Projection(key_spec)
+            if not compiled:
+                continue
+            if key.endswith("*"):
+                self.patterns.append((key[:-1], compiled))
+            else:
+                self.keys[key] = compiled
+
+    def get(self, key: str) -> Union[bool, "_Projection", None]:
+        """Get the projection of a key, or None if the key is not selected."""
+        found = self.keys.get(key)
+        if found is None:
+            for prefix, compiled in self.patterns:
+                if key.startswith(prefix):
+                    return compiled
+        return found
+
+
+def read_projection(handle: BinaryIO, spec: ProjectionSpec, chunk_size: int = STREAM_CHUNK_SIZE) -> Any:
+    """Read a JSON document from a binary file handle keeping only the keys selected by the spec.
+
+    Args:
+        handle: Binary file handle, read chunk by chunk
+        spec: Projection spec applied on the document root
+        chunk_size: Number of bytes read from the handle at a time
+
+    Raises:
+        json.JSONDecodeError: The document is malformed or its root is not an object
+
+    Returns:
+        Projected document
+    """
+    stream = JsonStream(handle, chunk_size=chunk_size)
+    if stream.peek() != "{":
+        raise stream.error("Expecting '{'")
+    result = stream.read_projection(spec)
+    if stream.peek():
+        raise stream.error("Extra data")
+    return result
+
+
+def load_projection(path: str, spec: ProjectionSpec, chunk_size: int = STREAM_CHUNK_SIZE) -> Any:
+    """Read a JSON file keeping only the keys selected by the spec.
+
+    Args:
+        path: JSON file path
+        spec: Projection spec applied on the document root
+        chunk_size: Number of bytes read from the file at a time
+
+    Raises:
+        json.JSONDecodeError: The document is malformed or its root is not an object
+
+    Returns:
+        Projected document
+    """
+    with open(path, "rb") as handle:
+        return read_projection(handle, spec=spec, chunk_size=chunk_size)
@@ -1,4 +1,3 @@
-import json
 import os
 from typing import Optional
 
@@ -78,10 +77,7 @@ class DbtCloudArtifact:
                 logger.error(f"Failed to retrieve artifacts [error: {vars(r)}]")
                 return False
 
-            file.write_json(
-                data=json.dumps(r.json(), indent=2),
-                path=f"{artifacts_dir}/{artifact}.json",
-            )
+            file.write_artifact(data=r.content, path=f"{artifacts_dir}/{artifact}.json")
         except (requests.RequestException, OSError) as e:
             logger.error(f"Error occurred while downloading [error: {e!s}]")
             return False
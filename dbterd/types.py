@@ -1,34 +1,58 @@
-from typing import Union
-
-from dbt_artifacts_parser.parsers.catalog.catalog_v1 import CatalogV1
-from dbt_artifacts_parser.parsers.manifest.manifest_v1 import ManifestV1
-from dbt_artifacts_parser.parsers.manifest.manifest_v2 import ManifestV2
-from dbt_artifacts_parser.parsers.manifest.manifest_v3 import ManifestV3
-from dbt_artifacts_parser.parsers.manifest.manifest_v4 import ManifestV4
-from dbt_artifacts_parser.parsers.manifest.manifest_v5 import ManifestV5
-from dbt_artifacts_parser.parsers.manifest.manifest_v6 import ManifestV6
-from dbt_artifacts_parser.parsers.manifest.manifest_v7 import ManifestV7
-from dbt_artifacts_parser.parsers.manifest.manifest_v8 import ManifestV8
-from dbt_artifacts_parser.parsers.manifest.manifest_v9 import ManifestV9
-from dbt_artifacts_parser.parsers.manifest.manifest_v10 import ManifestV10
-from dbt_artifacts_parser.parsers.manifest.manifest_v11 import ManifestV11
-from dbt_artifacts_parser.parsers.manifest.manifest_v12 import ManifestV12
-
-
-Manifest = Union[
-    ManifestV1,
-    ManifestV2,
-    ManifestV3,
-    ManifestV4,
-    ManifestV5,
-    ManifestV6,
-    ManifestV7,
-    ManifestV8,
-    ManifestV9,
-    ManifestV10,
-    ManifestV11,
-    ManifestV12,
-]
-
-# If a new version of Catalog is added, replace with `Union[CatalogV1, CatalogV2, ...]`.
-Catalog = CatalogV1
+import importlib
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+
+if TYPE_CHECKING:
+    from dbt_artifacts_parser.parsers.catalog.catalog_v1 import CatalogV1
+    from dbt_artifacts_parser.parsers.manifest.manifest_v1 import ManifestV1
+    from dbt_artifacts_parser.parsers.manifest.manifest_v2 import ManifestV2
+    from dbt_artifacts_parser.parsers.manifest.manifest_v3 import ManifestV3
+    from dbt_artifacts_parser.parsers.manifest.manifest_v4 import ManifestV4
+    from dbt_artifacts_parser.parsers.manifest.manifest_v5 import ManifestV5
+    from dbt_artifacts_parser.parsers.manifest.manifest_v6 import ManifestV6
+    from dbt_artifacts_parser.parsers.manifest.manifest_v7 import ManifestV7
+    from dbt_artifacts_parser.parsers.manifest.manifest_v8 import ManifestV8
+    from dbt_artifacts_parser.parsers.manifest.manifest_v9 import ManifestV9
+    from dbt_artifacts_parser.parsers.manifest.manifest_v10 import ManifestV10
+    from dbt_artifacts_parser.parsers.manifest.manifest_v11 import ManifestV11
+    from dbt_artifacts_parser.parsers.manifest.manifest_v12 import ManifestV12
+
+    Manifest = Union[
+        ManifestV1,
+        ManifestV2,
+        ManifestV3,
+        ManifestV4,
+        ManifestV5,
+        ManifestV6,
+        ManifestV7,
+        ManifestV8,
+        ManifestV9,
+        ManifestV10,
+        ManifestV11,
+        ManifestV12,
+    ]
+
+    # If a new version of Catalog is added, replace with `Union[CatalogV1, CatalogV2, ...]`.
+    Catalog = CatalogV1
+else:
+    # Each schema module takes hundreds of ms to import: at runtime the aliases are
+    # annotations only, the schema of the parsed version is imported by `get_artifact_schema`
+    Manifest = Any
+    Catalog = Any
+
+
+def get_artifact_schema(artifact: str, version: int) -> Optional[type]:
+    """Import the dbt-artifacts-parser model of a single artifact version.
+
+    Args:
+        artifact: Artifact type ('manifest' or 'catalog')
+        version: Artifact schema version (e.g., 12 for v12)
+
+    Returns:
+        Pydantic model class, or None if the installed package doesn't support the version
+    """
+    try:
+        module = importlib.import_module(f"dbt_artifacts_parser.parsers.{artifact}.{artifact}_v{version}")
+    except ImportError:
+        return None
+    return getattr(module, f"{artifact.capitalize()}V{version}", None)
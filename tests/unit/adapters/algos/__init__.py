@@ -21,7 +21,7 @@ class DummyManifestError:
 class DummyManifestHasColumns:
     columns: ClassVar[dict[str, None]] = {"col1": None, "col2": None}
     database = "database_dummy"
-    schema = "schema_dummy"
+    schema_ = "schema_dummy"
 
 
 @dataclass
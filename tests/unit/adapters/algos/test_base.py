@@ -1,8 +1,12 @@
 from unittest import mock
 
+import pytest
+
 from dbterd.adapters.algos.test_relationship import TestRelationshipAlgo
-from dbterd.core.adapters.algo import BaseAlgoAdapter
-from dbterd.core.models import Ref, Table
+from dbterd.core.adapters.algo import BaseAlgoAdapter, get_table_jobs
+from dbterd.core.artifact_view import CatalogIndex, CatalogView, ManifestView
+from dbterd.core.models import Column, LazyValue, Ref, Table
+from tests.unit.adapters.algos import DummyCatalogTable, DummyManifestTable
 
 
 class TestAlgoBase:
@@ -58,6 +62,127 @@ class TestAlgoBase:
         )
         assert isinstance(result, Table)
         assert result.exposures == []
+        mock_get_compiled_sql.assert_not_called()
+        assert result.raw_sql == "SELECT * FROM test"
+        mock_get_compiled_sql.assert_called_once_with(manifest_node)
+
+    def test_get_exposure_index(self):
+        """Test that get_exposure_index groups the exposure names by node name, in the mapping order."""
+        exposures = [
+            {"node_name": "model.pkg.t1", "exposure_name": "e1"},
+            {"node_name": "model.pkg.t2", "exposure_name": "e1"},
+            {"node_name": "model.pkg.t1", "exposure_name": "e2"},
+        ]
+        algo = TestRelationshipAlgo()
+        assert algo.get_exposure_index(exposures) == {"model.pkg.t1": ["e1", "e2"], "model.pkg.t2": ["e1"]}
+        assert algo.get_exposure_index([]) == {}
+
+    @mock.patch(
+        "dbterd.core.adapters.algo.BaseAlgoAdapter.get_table_name",
+        return_value="test_table",
+    )
+    def test_get_table_with_exposure_index(self, mock_get_table_name):
+        """Test that get_table takes the exposures of its node from the exposure index."""
+        manifest_node = mock.MagicMock()
+        manifest_node.database = "test_db"
+        manifest_node.schema_ = "test_schema"
+        manifest_node.columns = {}
+
+        algo = TestRelationshipAlgo()
+        exposure_index = {"model.package.model_name": ["e1", "e2"], "model.package.other": ["e3"]}
+        result = algo.get_table(
+            node_name="model.package.model_name", manifest_node=manifest_node, exposure_index=exposure_index
+        )
+        assert result.exposures == ["e1", "e2"]
+        assert result.exposures is not exposure_index["model.package.model_name"]
+
+    @pytest.mark.parametrize(
+        "jobs, table_count, expected",
+        [
+            (None, 10000, 1),
+            (1, 10000, 1),
+            (4, 10000, 4),
+            (4, 5000, 2),
+            (4, 100, 1),
+            (0, 10000, 3),
+        ],
+    )
+    def test_get_table_jobs(self, jobs, table_count, expected):
+        with mock.patch("os.cpu_count", return_value=3):
+            assert get_table_jobs(jobs=jobs, table_count=table_count) == expected
+
+    def test_get_tables_in_workers(self):
+        """Test that the tables built in worker processes are the ones built in a single process."""
+        manifest = ManifestView(
+            {
+                "nodes": {
+                    **{
+                        f"model.pkg.table{i}": {
+                            "database": "DB",
+                            "schema": "Sc",
+                            "identifier": f"Table{i}",
+                            "description": f"Table {i}",
+                            "meta": {"label": f"T{i}"} if i % 2 else {},
+                            "compiled_code": f"select {i}",
+                            "columns": {"ID": {"data_type": "int", "description": "Key"}},
+                        }
+                        for i in range(5)
+                    },
+                    "test.pkg.relationships_table1": {"database": "DB", "schema": "Sc"},
+                },
+                "sources": {
+                    "source.pkg.src.table": {
+                        "database": "DB",
+                        "schema": "Src",
+                        "identifier": "table",
+                        "description": "",
+                        "meta": {},
+                        "columns": {},
+                    }
+                },
+                "exposures": {"exposure.pkg.dashboard": {"depends_on": {"nodes": ["model.pkg.table3"]}}},
+            },
+            path="manifest",
+        )
+        catalog = CatalogIndex(nodes={"model.pkg.table1": [("id", "integer", ""), ("name", "varchar", "")]})
+        kwargs = {"entity_name_format": "resource.package.model"}
+        expected = TestRelationshipAlgo().get_tables(manifest=manifest, catalog=catalog, **kwargs)
+
+        with (
+            mock.patch("dbterd.core.adapters.algo.TABLE_JOB_MIN_SIZE", 2),
+            mock.patch("dbterd.core.adapters.algo.logger.warning") as mock_warning,
+        ):
+            tables = TestRelationshipAlgo().get_tables(manifest=manifest, catalog=catalog, jobs=3, **kwargs)
+
+        mock_warning.assert_not_called()
+        assert all(isinstance(x._lazy_raw_sql, LazyValue) for x in tables[:5])
+        assert [x.node_name for x in tables] == [x.node_name for x in expected]
+        assert tables == expected
+        assert tables[3].exposures == ["dashboard"]
+        assert tables[1].raw_sql == "select 1"
+
+    def test_get_tables_in_workers_failing(self):
+        """Test that the tables are built in the main process when the worker processes fail."""
+        algo = TestRelationshipAlgo()
+        with (
+            mock.patch("dbterd.core.adapters.algo.TABLE_JOB_MIN_SIZE", 1),
+            mock.patch("dbterd.core.adapters.algo.ProcessPoolExecutor", side_effect=OSError("no fork")),
+            mock.patch("dbterd.core.adapters.algo.logger.warning") as mock_warning,
+        ):
+            tables = algo.get_tables(
+                manifest=DummyManifestTable(), catalog=DummyCatalogTable(), jobs=2, entity_name_format="model"
+            )
+        assert [x.name for x in tables] == ["table1", "table_dummy_columns", "table2", "source_table"]
+        assert "no fork" in mock_warning.call_args.args[0]
+
+    def test_get_catalog_columns(self):
+        """Test that get_catalog_columns reads catalog nodes and catalog index entries alike."""
+        catalog_node = CatalogView(
+            {"nodes": {"model.x.y": {"columns": {"ID": {"type": "INT", "comment": None}}}}}, path="catalog"
+        ).nodes["model.x.y"]
+        algo = TestRelationshipAlgo()
+        assert algo.get_catalog_columns(catalog_node) == [("id", "int", "")]
+        assert algo.get_catalog_columns([("id", "int", "Key")]) == [("id", "int", "Key")]
 
     def test_get_node_exposures_from_metadata_with_none_data(self):
         """Test that get_node_exposures_from_metadata handles None data by initializing an empty list."""
@@ -89,6 +214,58 @@ class TestAlgoBase:
         assert isinstance(result, list)
         assert result == []
 
+    def test_get_table_index(self):
+        """Test that get_table_index keys the tables by node name, keeping the first one on duplicates."""
+        first = Table(name="first", database="db", schema="sc", node_name="model.pkg.table1")
+        second = Table(name="second", database="db", schema="sc", node_name="model.pkg.table1")
+        other = Table(name="other", database="db", schema="sc", node_name="model.pkg.table2")
+        algo = TestRelationshipAlgo()
+        assert algo.get_table_index(tables=[first, second, other]) == {
+            "model.pkg.table1": first,
+            "model.pkg.table2": other,
+        }
+
+    def test_make_up_relationships_with_table_index(self):
+        """Test that make_up_relationships resolves the node names through the given table index."""
+        tables = [
+            Table(name="db.sc.table1", database="db", schema="sc", node_name="model.pkg.table1"),
+            Table(name="db.sc.table2", database="db", schema="sc", node_name="model.pkg.table2"),
+        ]
+        relationships = [
+            Ref(name="ref1", table_map=("model.pkg.table1", "model.pkg.table2"), column_map=("col1", "col2")),
+            Ref(name="ref2", table_map=("model.pkg.table1", "model.pkg.table3"), column_map=("col1", "col3")),
+        ]
+        algo = TestRelationshipAlgo()
+        expected = [
+            Ref(name="ref1", table_map=["db.sc.table1", "db.sc.table2"], column_map=("col1", "col2")),
+        ]
+        assert algo.make_up_relationships(relationships=relationships, tables=tables) == expected
+        assert (
+            algo.make_up_relationships(relationships=relationships, table_index=algo.get_table_index(tables=tables))
+            == expected
+        )
+
+    def test_enrich_tables_from_relationships(self):
+        """Test that only the tables missing relationship columns are copied, with the columns added once."""
+        tables = [
+            Table(name="t1", database="db", schema="sc", columns=[Column(name="ID")]),
+            Table(name="t2", database="db", schema="sc", columns=[Column(name="name")]),
+            Table(name="t3", database="db", schema="sc", columns=[Column(name="id")]),
+        ]
+        relationships = [
+            Ref(name="ref1", table_map=("t1", "t2"), column_map=("id", "t1_id")),
+            Ref(name="ref2", table_map=("t1", "t2"), column_map=("id", "T1_ID")),
+            Ref(name="ref3", table_map=("t2", "t2"), column_map=("parent_id", "parent_id")),
+        ]
+        algo = TestRelationshipAlgo()
+        result = algo.enrich_tables_from_relationships(tables=tables, relationships=relationships)
+
+        assert result[0] is tables[0]
+        assert result[2] is tables[2]
+        assert result[1] is not tables[1]
+        assert [x.name for x in result[1].columns] == ["name", "t1_id", "parent_id"]
+        assert [x.name for x in tables[1].columns] == ["name"]
+
     def test_get_unique_refs_with_none_refs(self):
         """Test that get_unique_refs handles None refs by initializing an empty list."""
         algo = TestRelationshipAlgo()
@@ -96,6 +273,33 @@ class TestAlgoBase:
         assert isinstance(result, list)
         assert result == []
 
+    def test_get_unique_refs(self):
+        """Test that get_unique_refs keeps the first relationship of each table & column maps, in order."""
+        refs = [
+            Ref(name="ref1", table_map=("model.pkg.t1", "model.pkg.t2"), column_map=("id", "t1_id")),
+            Ref(name="ref2", table_map=("model.pkg.t1", "model.pkg.t3"), column_map=("id", "t1_id")),
+            Ref(name="ref3", table_map=["model.pkg.t1", "model.pkg.t2"], column_map=["id", "t1_id"], type="11"),
+            Ref(name="ref4", table_map=("model.pkg.t1", "model.pkg.t2"), column_map=("id", "t1_id2")),
+        ]
+        algo = TestRelationshipAlgo()
+        with mock.patch("dbterd.core.adapters.algo.logger.info") as mock_info:
+            assert [x.name for x in algo.get_unique_refs(refs=refs)] == ["ref1", "ref2", "ref4"]
+        mock_info.assert_called_once_with("Dropped 1 duplicated relationship(s)")
+
+    def test_get_unique_refs_with_custom_key(self):
+        """Test that get_unique_refs uses the relationship identity defined by get_ref_key."""
+
+        class TypedAlgo(TestRelationshipAlgo):
+            def get_ref_key(self, ref):
+                return (*super().get_ref_key(ref), ref.type)
+
+        refs = [
+            Ref(name="ref1", table_map=("model.pkg.t1", "model.pkg.t2"), column_map=("id", "t1_id")),
+            Ref(name="ref2", table_map=("model.pkg.t1", "model.pkg.t2"), column_map=("id", "t1_id"), type="11"),
+            Ref(name="ref3", table_map=("model.pkg.t1", "model.pkg.t2"), column_map=("id", "t1_id"), type="11"),
+        ]
+        assert [x.name for x in TypedAlgo().get_unique_refs(refs=refs)] == ["ref1", "ref2"]
+
     def test_find_related_nodes_by_id_default(self):
         """Test base implementation of find_related_nodes_by_id returns just the node id."""
 
@@ -110,3 +314,66 @@ class TestAlgoBase:
         algo = MinimalAlgo()
         result = algo.find_related_nodes_by_id(manifest={}, node_unique_id="model.pkg.test_table")
         assert result == ["model.pkg.test_table"]
+
+    def test_extract_artifacts_not_supported_by_default(self):
+        """Test base implementation of extract_artifacts requires an override."""
+
+        class MinimalAlgo(BaseAlgoAdapter):
+            def parse_artifacts(self, manifest, catalog, **kwargs):
+                return [], []
+
+            def parse_metadata(self, data, **kwargs):
+                return [], []
+
+        assert MinimalAlgo.supports_artifact_cache is False
+        with pytest.raises(NotImplementedError):
+            MinimalAlgo().extract_artifacts(manifest={}, catalog={})
+
+    def test_select_parsed(self):
+        """Test the selection is applied on the extracted tables and relationships."""
+        algo = TestRelationshipAlgo()
+        tables = [
+            Table(name="orders", database="db", schema="sch", columns=[], node_name="model.pkg.orders"),
+            Table(name="customers", database="db", schema="sch", columns=[], node_name="model.pkg.customers"),
+        ]
+        relationships = [
+            Ref(name="test.x", table_map=["model.pkg.customers", "model.pkg.orders"], column_map=["id", "cid"])
+        ]
+        selected_tables, selected_relationships = algo.select_parsed(
+            tables=tables, relationships=relationships, select=["exact:model.pkg.orders"], resource_type=["model"]
+        )
+        assert [x.name for x in selected_tables] == ["orders"]
+        assert selected_relationships == []
+
+        selected_tables, selected_relationships = algo.select_parsed(
+            tables=tables, relationships=relationships, resource_type=["model"]
+        )
+        assert [x.name for x in selected_tables] == ["customers", "orders"]
+        assert selected_relationships[0].table_map == ["customers", "orders"]
+        assert [x.name for x in selected_tables[1].columns] == ["cid"]
+        assert tables[1].columns == []
+
+    @pytest.mark.parametrize(
+        "kwargs, expected",
+        [
+            ({"select": ["exact:model.pkg.a"]}, ["a"]),
+            ({"select": ["exact:model.pkg.a"], "select_neighbors": 1}, ["a", "b"]),
+            ({"select": ["exact:model.pkg.a"], "select_neighbors": 2}, ["a", "b", "c"]),
+            ({"select": ["exact:model.pkg.a"], "select_neighbors": 9}, ["a", "b", "c", "d"]),
+            ({"select": ["exact:model.pkg.a"], "select_neighbors": 9, "exclude": ["model.pkg.c"]}, ["a", "b"]),
+            ({"select": ["exact:model.pkg.c"], "select_neighbors": 1}, ["b", "c", "d"]),
+            ({"select_neighbors": 1}, ["a", "b", "c", "d", "e"]),
+        ],
+    )
+    def test_filter_tables_based_on_selection_with_neighbors(self, kwargs, expected):
+        """Test the neighbors of the selected tables are added, following the relationships."""
+        algo = TestRelationshipAlgo()
+        tables = [Table(name=x, database="db", schema="sch", columns=[], node_name=f"model.pkg.{x}") for x in "abcde"]
+        relationships = [
+            Ref(name=f"test.{x}_{y}", table_map=[f"model.pkg.{x}", f"model.pkg.{y}"], column_map=["id", "id"])
+            for x, y in [("b", "a"), ("c", "b"), ("d", "c")]
+        ]
+        selected_tables = algo.filter_tables_based_on_selection(
+            tables=tables, relationships=relationships, resource_type=["model"], **kwargs
+        )
+        assert [x.name for x in selected_tables] == expected
@@ -4,7 +4,8 @@ from unittest.mock import MagicMock
 import pytest
 
 from dbterd.adapters.algos.semantic import SemanticAlgo
-from dbterd.core.models import Ref
+from dbterd.core.manifest_scan import ManifestIndexes
+from dbterd.core.models import Ref, SemanticEntity
 from tests.unit.adapters.algos import DummyManifestRel, DummyManifestTable
 
 
@@ -144,6 +145,60 @@ class TestAlgoSemantic:
             manifest=DummyManifestRel(), node_unique_id="model.dbt_resto.not-exists"
         ) == ["model.dbt_resto.not-exists"]
 
+    def test_link_semantic_entities(self):
+        def entity(model, name, type):
+            return SemanticEntity(
+                semantic_model=f"semantic_model.p.{model}",
+                model=f"model.p.{model}",
+                entity_name=name,
+                entity_type=type,
+                column_name=name,
+                relationship_type="",
+            )
+
+        foreigns = [entity("orders", "customer", "foreign"), entity("orders", "store", "foreign")]
+        primaries = [
+            entity("customers", "customer", "primary"),
+            entity("stores", "location", "primary"),
+            entity("customers_v2", "customer", "primary"),
+        ]
+        algo = SemanticAlgo()
+        assert algo.link_semantic_entities(foreigns=foreigns, primaries=primaries) == [
+            (foreigns[0], primaries[0]),
+            (foreigns[0], primaries[2]),
+        ]
+
+    def test_get_relationship_graph_is_kept_in_the_manifest_indexes(self):
+        algo = SemanticAlgo()
+        manifest = DummyManifestRel()
+        with mock.patch.object(
+            SemanticAlgo, "get_linked_semantic_entities", wraps=algo.get_linked_semantic_entities
+        ) as mock_get_linked_semantic_entities:
+            with algo.use_manifest_indexes(ManifestIndexes(manifest=manifest)):
+                graph = algo.get_relationship_graph(manifest=manifest)
+                algo.find_related_nodes_by_id(manifest=manifest, node_unique_id="model.dbt_resto.table1")
+                assert mock_get_linked_semantic_entities.call_count == 1
+
+                algo.get_relationship_graph(manifest=DummyManifestRel())
+                assert mock_get_linked_semantic_entities.call_count == 2
+
+            algo.get_relationship_graph(manifest=manifest)
+            assert mock_get_linked_semantic_entities.call_count == 3
+
+        assert sorted(graph.neighbors("model.dbt_resto.table1")) == ["model.dbt_resto.table2", "model.dbt_resto.tablex"]
+
+    def test_find_related_nodes_by_id_with_depth(self):
+        algo = SemanticAlgo()
+        manifest = DummyManifestRel()
+        assert algo.find_related_nodes_by_id(manifest=manifest, node_unique_id="model.dbt_resto.table2", depth=0) == [
+            "model.dbt_resto.table2"
+        ]
+        assert algo.find_related_nodes_by_id(manifest=manifest, node_unique_id="model.dbt_resto.table2", depth=2) == [
+            "model.dbt_resto.table2",
+            "model.dbt_resto.table1",
+            "model.dbt_resto.tablex",
+        ]
+
     def test_parse(self):
         with (
             mock.patch.object(
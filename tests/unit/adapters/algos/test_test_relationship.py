@@ -4,7 +4,14 @@ from unittest.mock import MagicMock
 import click
 import pytest
 
-from dbterd.adapters.algos.test_relationship import TestRelationshipAlgo
+from dbterd.adapters.algos.test_relationship import (
+    AlgoRule,
+    RefTargetIndex,
+    RelationshipTestIndex,
+    TestRelationshipAlgo,
+    _parse_ref_target,
+)
+from dbterd.core.manifest_scan import ManifestIndexes, ManifestScan
 from dbterd.core.models import Column, Ref, Table
 from tests.unit.adapters.algos import (
     DummyCatalogTable,
@@ -170,6 +177,67 @@ class TestAlgoTestRelationship:
         algo = TestRelationshipAlgo()
         assert algo.get_relationships(manifest=manifest, algo=algorithm) == expected
 
+    def test_get_relationships_with_compiled_rule(self):
+        algo = TestRelationshipAlgo()
+        algo.rule = algo.compile_rule("(name:foreign_key|c_to:pk_column_name)")
+        assert [x.name for x in algo.get_relationships(manifest=DummyManifestRel(), algo="test_relationship")] == [
+            "test.dbt_resto.foreign_key_table1"
+        ]
+
+    @pytest.mark.parametrize(
+        "rule, expected",
+        [
+            (None, AlgoRule()),
+            ("", AlgoRule()),
+            ("(name:relationship|c_from:column_name|c_to:field)", AlgoRule()),
+            ("(name:Foreign_Key)", AlgoRule(name="foreign_key")),
+            (
+                "( name:foreign_key | c_from:fk_column_name | c_to:pk_column_name | t_to:pk_table_name )",
+                AlgoRule(name="foreign_key", c_from="fk_column_name", c_to="pk_column_name", t_to="pk_table_name"),
+            ),
+        ],
+    )
+    def test_algo_rule_parse(self, rule, expected):
+        assert AlgoRule.parse(rule) == expected
+
+    @pytest.mark.parametrize(
+        "rule, error",
+        [
+            ("name:foreign_key", "Rule must be enclosed in brackets"),
+            ("(name:foreign_key", "Rule must be enclosed in brackets"),
+            ("(name)", "Missing value of the rule key 'name'"),
+            ("(name:foreign_key|c_to:)", "Missing value of the rule key 'c_to'"),
+        ],
+    )
+    def test_algo_rule_parse_error(self, rule, error):
+        with pytest.raises(ValueError, match=error):
+            AlgoRule.parse(rule)
+
+    def test_algo_rule_unknown_key(self):
+        with mock.patch("dbterd.adapters.algos.test_relationship.logger.warning") as mock_warning:
+            rule = AlgoRule.parse("(name:foreign_key|column:id)")
+        assert "Unknown rule key 'column'" in mock_warning.call_args.args[0]
+        assert rule.name == "foreign_key"
+        assert rule["column"] == "id"
+
+    def test_algo_rule_mapping(self):
+        rule = AlgoRule(name="foreign_key", c_to="pk_column_name", extras=(("column", "id"),))
+        assert rule["c_to"] == "pk_column_name"
+        assert rule.get("c_from", "column_name") == "column_name"
+        assert rule.get("missing") is None
+        assert rule == {
+            "name": "foreign_key",
+            "c_from": "column_name",
+            "c_to": "pk_column_name",
+            "t_to": "to",
+            "column": "id",
+        }
+        assert rule == AlgoRule.parse("(name:Foreign_Key|c_to:pk_column_name|column:id)")
+        assert hash(rule) == hash(AlgoRule.parse("(name:foreign_key|c_to:pk_column_name|column:id)"))
+        assert rule != AlgoRule(name="foreign_key", c_to="pk_column_name")
+        with pytest.raises(KeyError):
+            _ = rule["missing"]
+
     @pytest.mark.parametrize(
         "meta, type",
         [
@@ -735,6 +803,75 @@ class TestAlgoTestRelationship:
         with pytest.raises(click.BadParameter):
             algo.get_relationships_from_metadata(data=data, **kwargs)
 
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("ref('x')", ("ref", "x")),
+            ('ref("p", "x")', ("ref", "p", "x")),
+            (" source( 'src','x' ) ", ("source", "src", "x")),
+            ("ref(x)", None),
+            ("ref('x', v=2)", None),
+            ("x", None),
+            ("", None),
+        ],
+    )
+    def test_parse_ref_target(self, value, expected):
+        assert _parse_ref_target(value) == expected
+
+    @pytest.mark.parametrize(
+        "to, parents, expected",
+        [
+            ("ref('x')", ["model.p.x", "model.p.y"], ["model.p.x", "model.p.y"]),
+            ("ref('x')", ["model.p.y", "model.p.x"], ["model.p.x", "model.p.y"]),
+            ('ref("x", "x")', ["model.p.x", "model.p.y"], ["model.p.x", "model.p.y"]),
+            ("source('src','x')", ["source.p.src.x", "model.p.y"], ["source.p.src.x", "model.p.y"]),
+            ("source('src', 'x')", ["model.p.y", "source.p.src.x"], ["source.p.src.x", "model.p.y"]),
+            ("ref('src', 'x')", ["source.p.src.x", "model.p.y"], ["model.p.y", "source.p.src.x"]),
+            (None, ["model.p.x", "model.p.y"], ["model.p.y", "model.p.x"]),
+        ],
+    )
+    def test_get_table_map_from_metadata(self, to, parents, expected):
+        test_node = {
+            "node": {"testMetadata": {"kwargs": {"to": to}}, "parents": [{"uniqueId": x} for x in parents]},
+        }
+        algo = TestRelationshipAlgo()
+        assert algo.get_table_map_from_metadata(test_node=test_node, resource_type=["model", "source"]) == expected
+
+    def test_get_relationships_from_metadata_parses_the_ref_targets_once(self):
+        data = [
+            {
+                "tests": {
+                    "edges": [
+                        {
+                            "node": {
+                                "uniqueId": f"test.p.relationship_{x}",
+                                "meta": {},
+                                "testMetadata": {"kwargs": {"columnName": x, "field": "id", "to": "ref('x')"}},
+                                "parents": [{"uniqueId": "model.p.y"}, {"uniqueId": "model.p.x"}],
+                            }
+                        }
+                        for x in ("a", "b", "c")
+                    ]
+                }
+            }
+        ]
+        algo = TestRelationshipAlgo()
+        with mock.patch(
+            "dbterd.adapters.algos.test_relationship._parse_ref_target", wraps=_parse_ref_target
+        ) as mock_parse_ref_target:
+            refs = algo.get_relationships_from_metadata(data=data, resource_type=["model"])
+            assert mock_parse_ref_target.call_count == 1
+            algo.get_relationships_from_metadata(data=data, resource_type=["model"])
+            assert mock_parse_ref_target.call_count == 2
+        assert [x.table_map for x in refs] == [["model.p.x", "model.p.y"]] * 3
+
+    def test_ref_target_index(self):
+        ref_targets = RefTargetIndex()
+        assert ref_targets.refers_to("ref('x')", "model.p.x")
+        assert ref_targets.refers_to("source('src', 'x')", "source.p.src.x")
+        assert not ref_targets.refers_to("ref('x')", "model.p.y")
+        assert not ref_targets.refers_to("x", "model.p.x")
+
     def test_find_related_nodes_by_id_not_supported_type(self):
         algo = TestRelationshipAlgo()
         assert algo.find_related_nodes_by_id(manifest="irrelevant", type="metadata", node_unique_id="model.p.abc") == [
@@ -749,3 +886,57 @@ class TestAlgoTestRelationship:
         assert algo.find_related_nodes_by_id(
             manifest=DummyManifestRel(), node_unique_id="model.dbt_resto.not-exists"
         ) == ["model.dbt_resto.not-exists"]
+        assert algo.find_related_nodes_by_id(
+            manifest=DummyManifestRel(), node_unique_id="model.dbt_resto.table2", depth=0
+        ) == ["model.dbt_resto.table2"]
+
+    def test_relationship_test_index(self):
+        index = RelationshipTestIndex(manifest_scan=ManifestScan(manifest=DummyManifestRel()))
+        assert index.get_test_nodes(rule_name="relationship") == [
+            "test.dbt_resto.relationships_table1",
+            "test.dbt_resto.relationships_table2",
+            "test.dbt_resto.relationships_table3",
+            "test.dbt_resto.relationships_table4",
+            "test.dbt_resto.relationships_table1_reverse",
+            "test.dbt_resto.relationships_table1_recursive",
+        ]
+        assert index.get_test_nodes(rule_name="foreign_key") == ["test.dbt_resto.foreign_key_table1"]
+        graph = index.get_graph(rule_name="relationship")
+        assert graph is index.get_graph(rule_name="relationship")
+        assert graph.neighbors("model.dbt_resto.table1") == ["model.dbt_resto.table2"]
+        assert graph.neighbors("model.dbt_resto.x") == []
+        assert index.get_graph(rule_name="foreign_key").neighbors("model.dbt_resto.tablex") == []
+
+    def test_get_test_index_is_kept_in_the_manifest_indexes(self):
+        algo = TestRelationshipAlgo()
+        manifest = DummyManifestRel()
+        with algo.use_manifest_indexes(ManifestIndexes(manifest=manifest)):
+            index = algo.get_test_index(manifest=manifest)
+            algo.find_related_nodes_by_id(manifest=manifest, node_unique_id="model.dbt_resto.table2")
+            algo.get_relationships(manifest=manifest)
+            assert algo.get_test_index(manifest=manifest) is index
+            assert algo.get_test_index(manifest=DummyManifestRel()) is not index
+
+        assert algo.get_test_index(manifest=manifest) is not index
+        assert algo._manifest_indexes is None
+
+    def test_get_test_index_reads_the_manifest_scan(self):
+        algo = TestRelationshipAlgo()
+        manifest = DummyManifestRel()
+        indexes = ManifestIndexes(manifest=manifest)
+        with (
+            mock.patch("dbterd.core.adapters.algo.ManifestScan", side_effect=ManifestScan) as mock_manifest_scan,
+            algo.use_manifest_indexes(indexes),
+        ):
+            algo.get_tables(manifest=manifest, catalog=DummyCatalogTable(), entity_name_format="resource.package.model")
+            algo.get_test_index(manifest=manifest)
+            algo.get_node_exposures(manifest=manifest)
+        mock_manifest_scan.assert_called_once_with(manifest=manifest)
+
+    def test_parse_reads_the_manifest_scan_once(self):
+        algo = TestRelationshipAlgo()
+        manifest = DummyManifestRel()
+        with mock.patch("dbterd.core.adapters.algo.ManifestScan", side_effect=ManifestScan) as mock_manifest_scan:
+            algo.parse(manifest=manifest, catalog=DummyCatalogTable(), entity_name_format="resource.package.model")
+        mock_manifest_scan.assert_called_once_with(manifest=manifest)
+        assert algo._manifest_indexes is None
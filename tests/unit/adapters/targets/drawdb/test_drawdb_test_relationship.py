@@ -6,6 +6,7 @@ import pytest
 
 from dbterd.adapters.targets.drawdb import DrawdbAdapter
 from dbterd.core.models import Column, Ref, Table
+from dbterd.helpers import json_backend
 
 
 @dataclass
@@ -206,6 +207,30 @@ class TestDrawdbTestRelationship:
         )
         assert json.loads(drawdb) == json.loads(expected)
 
+    @pytest.mark.parametrize("backend", json_backend.get_available_backends())
+    def test_build_erd_is_independent_of_the_json_backend(self, backend):
+        tables = [
+            Table(
+                name="model.dbt_resto.table1",
+                node_name="model.dbt_resto.table1",
+                database="--database--",
+                schema="--schema--",
+                columns=[Column(name="name1", data_type="varchar", description="Désignation")],
+                description="Tables of the « resto »",
+            )
+        ]
+        kwargs = {
+            "tables": tables,
+            "relationships": [],
+            "manifest": DummyManifest(metadata=DummyManifestMetadata(generated_at="dummy")),
+        }
+        with mock.patch("dbterd.helpers.json_backend._current", json_backend.resolve_backend("json")):
+            expected = DrawdbAdapter().build_erd(**kwargs)
+        with mock.patch("dbterd.helpers.json_backend._current", json_backend.resolve_backend(backend)):
+            assert DrawdbAdapter().build_erd(**kwargs) == expected
+        assert '{"author": "dbterd", ' in expected
+        assert "\\u00e9" in expected
+
     def test_get_y(self):
         adapter = DrawdbAdapter()
         tables = [
@@ -297,3 +322,18 @@ class TestDrawdbTestRelationship:
         parsed = json.loads(result)
         assert parsed["id"] == 0
         assert parsed["cardinality"] == "Many to one"
+
+    def test_format_relationship_field_ids_are_case_insensitive(self):
+        """Test relationship field ids resolve the column names regardless of their case."""
+        adapter = DrawdbAdapter()
+        tables = [
+            Table(name="t1", database="db", schema="sc", columns=[Column(name="name"), Column(name="id")]),
+            Table(name="t2", database="db", schema="sc", columns=[Column(name="t1_id")]),
+        ]
+        relationship = Ref(name="ref", table_map=["t1", "t2"], column_map=["ID", "T1_Id"])
+        graphic_tables = adapter.get_graphic_tables(tables=tables)
+        assert graphic_tables["t1"]["fields"] == {"name": {"id": 0}, "id": {"id": 1}}
+
+        parsed = adapter.format_relationship_dict(relationship, 0, graphic_tables)
+        assert (parsed["startTableId"], parsed["startFieldId"]) == (1, 0)
+        assert (parsed["endTableId"], parsed["endFieldId"]) == (0, 1)
@@ -1,8 +1,17 @@
+import contextlib
 from pathlib import Path
 from unittest import mock
 
+import pytest
+
 from dbterd import default
+from dbterd.adapters.algos.test_relationship import RelationshipTestIndex
 from dbterd.api import DbtErd
+from dbterd.core.executor import Executor
+from dbterd.core.manifest_scan import ManifestScan
+
+
+SAMPLES_DIR = Path(__file__).parents[3] / "samples"
 
 
 class TestDbtErd:
@@ -15,6 +24,38 @@ class TestDbtErd:
     def test_get_model_erd(self, mock_executor_run):
         mock_executor_run.return_value = "expected-result"
         assert DbtErd().get_model_erd(node_unique_id="any") == "expected-result"
+        assert mock_executor_run.call_args.kwargs["select_neighbors"] == 1
+
+        DbtErd(select_neighbors=5).get_model_erd(node_unique_id="any", depth=2)
+        assert mock_executor_run.call_args.kwargs["node_unique_id"] == "any"
+        assert mock_executor_run.call_args.kwargs["select_neighbors"] == 2
+
+    @pytest.mark.parametrize("fast_parse", [False, True])
+    def test_get_model_erd_reads_and_indexes_the_artifacts_once(self, fast_parse):
+        params = {"artifacts_dir": str(SAMPLES_DIR / "dbtresto"), "target": "dbml", "fast_parse": fast_parse}
+        node_unique_ids = ["model.dbt_resto.fact_number_last_appearance", "model.dbt_resto.dim_date"]
+        expected = [DbtErd(**params).get_model_erd(node_unique_id=x) for x in node_unique_ids]
+
+        dbt_erd = DbtErd(**params)
+        with contextlib.ExitStack() as stack:
+            mock_read_artifacts = stack.enter_context(
+                mock.patch.object(Executor, "_read_artifacts", autospec=True, side_effect=Executor._read_artifacts)
+            )
+            mock_manifest_scan = stack.enter_context(
+                mock.patch("dbterd.core.adapters.algo.ManifestScan", side_effect=ManifestScan)
+            )
+            mock_test_index = stack.enter_context(
+                mock.patch(
+                    "dbterd.adapters.algos.test_relationship.RelationshipTestIndex", side_effect=RelationshipTestIndex
+                )
+            )
+            actual = [dbt_erd.get_model_erd(node_unique_id=x) for x in node_unique_ids * 2]
+
+        assert actual == expected * 2
+        assert mock_read_artifacts.call_count == 1
+        assert mock_manifest_scan.call_count == 1
+        assert mock_test_index.call_count == 1
+        assert all(x._manifest_indexes is None for x in dbt_erd.executor.algo_adapters.values())
 
     def test_init_default(self):
         actual = DbtErd()
@@ -25,6 +66,7 @@ class TestDbtErd:
                 "api": True,
                 "select": [],
                 "exclude": [],
+                "select_neighbors": default.default_select_neighbors(),
                 "resource_type": default.default_resource_types(),
                 "algo": default.default_algo(),
                 "entity_name_format": default.default_entity_name_format(),
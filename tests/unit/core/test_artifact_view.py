@@ -0,0 +1,253 @@
+from datetime import datetime
+import json
+from pathlib import Path
+import pickle
+import shutil
+
+import click
+import pytest
+
+from dbterd.adapters.algos.test_relationship import TestRelationshipAlgo
+from dbterd.adapters.targets.drawdb import DrawdbAdapter
+from dbterd.core.artifact_view import (
+    ArtifactValidationError,
+    CatalogIndex,
+    CatalogView,
+    ManifestView,
+    NodeView,
+    get_catalog_projection,
+)
+from dbterd.helpers import cli_messaging, file as file_handlers
+
+
+class TestArtifactView:
+    @pytest.fixture
+    def manifest(self):
+        return ManifestView(
+            {
+                "metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json"},
+                "nodes": {
+                    "model.dummy.orders": {
+                        "unique_id": "model.dummy.orders",
+                        "name": "orders",
+                        "resource_type": "model",
+                        "database": "db",
+                        "schema": "sch",
+                        "columns": {"id": {"name": "id", "data_type": "int", "description": None}},
+                        "depends_on": {"nodes": ["model.dummy.customers"]},
+                        "config": {"meta": None},
+                    },
+                    "test.dummy.relationships": {"test_metadata": {"name": "relationships", "kwargs": 1}},
+                },
+                "sources": {},
+                "semantic_models": {
+                    "semantic_model.dummy.orders": {"entities": [{"name": "order", "type": "primary"}]},
+                },
+            },
+            path="manifest",
+        )
+
+    def test_node_attributes(self, manifest):
+        node = manifest.nodes["model.dummy.orders"]
+        assert isinstance(node, NodeView)
+        assert node.name == "orders"
+        assert node.schema_ == "sch"
+        assert node.database == "db"
+        assert node.columns["id"].data_type == "int"
+        assert node.columns["id"].description is None
+        assert node.depends_on.nodes == ["model.dummy.customers"]
+        assert node.config.meta == {}
+
+    def test_missing_key_behaves_as_missing_attribute(self, manifest):
+        node = manifest.nodes["model.dummy.orders"]
+        assert not hasattr(node, "test_metadata")
+        assert not hasattr(manifest, "exposures")
+        with pytest.raises(AttributeError):
+            _ = node.test_metadata
+
+    @pytest.mark.parametrize(
+        "version, node, expected",
+        [
+            (12, {"resource_type": "model"}, {"compiled_code": None}),
+            (12, {"resource_type": "seed"}, {}),
+            (None, {"resource_type": "snapshot"}, {"compiled_code": None}),
+            (7, {"resource_type": "model", "compiled": False}, {"compiled_code": None}),
+            (7, {"resource_type": "model"}, {}),
+            (6, {"resource_type": "model", "compiled": True}, {"compiled_sql": None}),
+            (6, {"resource_type": "model"}, {}),
+        ],
+    )
+    def test_missing_compiled_sql(self, version, node, expected):
+        metadata = {"dbt_schema_version": f"https://schemas.getdbt.com/dbt/manifest/v{version}.json"} if version else {}
+        manifest = ManifestView({"metadata": metadata, "nodes": {"x": node}, "sources": {"y": {}}}, path="manifest")
+        for attribute in ("compiled_sql", "compiled_code"):
+            assert getattr(manifest.nodes["x"], attribute, "missing") == expected.get(attribute, "missing")
+            assert not hasattr(manifest.sources["y"], attribute)
+
+    def test_mapping_protocol(self, manifest):
+        assert len(manifest.nodes) == 2
+        assert "model.dummy.orders" in manifest.nodes
+        assert list(manifest.nodes.keys()) == ["model.dummy.orders", "test.dummy.relationships"]
+        assert next(iter(manifest.nodes.values())).name == "orders"
+        assert len(manifest.sources) == 0
+
+    def test_enum_value(self, manifest):
+        entity = manifest.semantic_models["semantic_model.dummy.orders"].entities[0]
+        assert entity.name == "order"
+        assert entity.type.value == "primary"
+
+    def test_validation_error(self, manifest):
+        test_node = manifest.nodes["test.dummy.relationships"]
+        assert test_node.test_metadata.name == "relationships"
+        with pytest.raises(ArtifactValidationError) as exc_info:
+            _ = test_node.test_metadata.kwargs
+        assert exc_info.value.path == "manifest.nodes['test.dummy.relationships'].test_metadata.kwargs"
+        assert "expected object, got int" in str(exc_info.value)
+
+    def test_pickle(self, manifest):
+        node = manifest.nodes["model.dummy.orders"]
+        unpickled = pickle.loads(pickle.dumps(node))
+        assert isinstance(unpickled, NodeView)
+        assert repr(unpickled) == repr(node)
+        assert unpickled.columns["id"].data_type == "int"
+
+    def get_metadata(self, generated_at, version=None):
+        metadata = {"generated_at": generated_at}
+        if version:
+            metadata["dbt_schema_version"] = f"https://schemas.getdbt.com/dbt/manifest/v{version}.json"
+        return ManifestView({"metadata": metadata}, path="manifest").metadata
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2022-12-20T02:59:25.949509Z",
+            "2022-12-20T02:59:25.949Z",
+            "2022-12-20T02:59:25",
+            "2022-12-20 02:59:25.949509+00:00",
+            "2022-12-20T02:59:25.5-0530",
+        ],
+    )
+    def test_generated_at_matches_the_pydantic_parsing(self, value):
+        pydantic = pytest.importorskip("pydantic")
+        expected = pydantic.TypeAdapter(datetime).validate_python(value)
+        generated_at = self.get_metadata(value, version=7).generated_at
+        assert generated_at == expected
+        assert str(generated_at) == str(expected)
+
+    @pytest.mark.parametrize("value", ["2022-12-20", "yesterday", 1671505165])
+    def test_generated_at_validation_error(self, value):
+        with pytest.raises(ArtifactValidationError, match="manifest.metadata.generated_at"):
+            _ = self.get_metadata(value, version=7).generated_at
+
+    @pytest.mark.parametrize("version", [11, 12, None])
+    def test_generated_at_kept_as_string(self, version):
+        assert self.get_metadata("2024-07-28T01:54:24.620460Z", version=version).generated_at == (
+            "2024-07-28T01:54:24.620460Z"
+        )
+
+    @pytest.mark.parametrize("sample", ["facebookad", "dbtresto", "jaffle-shop"])
+    def test_drawdb_date_matches_across_parse_modes(self, sample):
+        artifacts_dir = str(Path(__file__).parents[3] / "samples" / sample)
+        manifests = [
+            file_handlers.read_manifest(path=artifacts_dir),
+            file_handlers.read_manifest_view(path=artifacts_dir),
+            file_handlers.read_manifest_stream(path=artifacts_dir),
+        ]
+        outputs = {DrawdbAdapter().build_erd(tables=[], relationships=[], manifest=x) for x in manifests}
+        assert len(outputs) == 1
+        assert '"date": "20' in outputs.pop()
+
+    def get_raw_sqls(self, artifacts_dir):
+        artifacts = [
+            (file_handlers.read_manifest(path=artifacts_dir), file_handlers.read_catalog(path=artifacts_dir)),
+            (
+                file_handlers.read_manifest_view(path=artifacts_dir),
+                file_handlers.read_catalog_index(path=artifacts_dir),
+            ),
+            (
+                file_handlers.read_manifest_stream(path=artifacts_dir),
+                file_handlers.read_catalog_index(path=artifacts_dir, stream=True),
+            ),
+        ]
+        raw_sqls = [
+            {
+                x.node_name: x.raw_sql
+                for x in TestRelationshipAlgo().get_tables(
+                    manifest=manifest, catalog=catalog, entity_name_format="database.schema.table"
+                )
+            }
+            for manifest, catalog in artifacts
+        ]
+        assert raw_sqls[1] == raw_sqls[0]
+        assert raw_sqls[2] == raw_sqls[0]
+        return raw_sqls[0]
+
+    @pytest.mark.parametrize("sample", ["dbtresto", "jaffle-shop"])
+    def test_raw_sql_matches_across_parse_modes(self, sample):
+        raw_sqls = self.get_raw_sqls(str(Path(__file__).parents[3] / "samples" / sample))
+        assert not any(".undefined" in x for name, x in raw_sqls.items() if name.startswith("model."))
+
+    @pytest.mark.parametrize("sample", ["dbtresto", "dbt-constraints", "jaffle-shop"])
+    def test_raw_sql_of_uncompiled_nodes_matches_across_parse_modes(self, tmp_path, sample):
+        samples_dir = Path(__file__).parents[3] / "samples" / sample
+        manifest = json.loads((samples_dir / "manifest.json").read_text(encoding="utf-8"))
+        for node in manifest["nodes"].values():
+            node.pop("compiled_code", None)
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+        shutil.copy(samples_dir / "catalog.json", tmp_path / "catalog.json")
+
+        raw_sqls = self.get_raw_sqls(str(tmp_path))
+        assert {name: x for name, x in raw_sqls.items() if name.startswith("model.")} == {
+            name: None for name in raw_sqls if name.startswith("model.")
+        }
+
+    def test_catalog_view(self):
+        catalog = CatalogView(
+            {"nodes": {"model.dummy.orders": {"columns": {"ID": {"name": "ID", "type": "INT", "comment": None}}}}},
+            path="catalog",
+        )
+        assert catalog.nodes["model.dummy.orders"].columns["ID"].type == "INT"
+        with pytest.raises(ArtifactValidationError):
+            _ = CatalogView({"sources": []}, path="catalog").sources
+
+    def test_catalog_index(self):
+        data = {
+            "metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/catalog/v1.json"},
+            "nodes": {
+                "model.dummy.orders": {
+                    "columns": {"ID": {"name": "ID", "type": "INT", "index": 1, "comment": None}},
+                    "stats": {"has_stats": {"value": False}},
+                },
+                "model.dummy.customers": {"columns": {"name": {"type": "text", "comment": "Name"}}},
+            },
+            "sources": {"source.dummy.raw.orders": {"columns": {}}},
+        }
+        catalog = CatalogIndex.from_catalog(data)
+        assert catalog.nodes == {
+            "model.dummy.orders": [("id", "int", "")],
+            "model.dummy.customers": [("name", "text", "Name")],
+        }
+        assert catalog.sources == {"source.dummy.raw.orders": []}
+
+        catalog = CatalogIndex.from_catalog(data, unique_ids={"model.dummy.orders"})
+        assert list(catalog.nodes) == ["model.dummy.orders"]
+        assert catalog.sources == {}
+        catalog = CatalogIndex.from_catalog(data, resource_types=["source"])
+        assert catalog.nodes == {}
+        assert list(catalog.sources) == ["source.dummy.raw.orders"]
+        assert CatalogIndex.from_catalog({}).nodes == {}
+
+    def test_catalog_index_validation_error(self):
+        with pytest.raises(ArtifactValidationError) as exc_info:
+            CatalogIndex.from_catalog({"nodes": {"model.dummy.orders": {"columns": {"ID": {"type": 1}}}}})
+        assert exc_info.value.path == "catalog.nodes['model.dummy.orders'].columns['ID'].type"
+
+    def test_get_catalog_projection(self):
+        assert get_catalog_projection()["nodes"] == {"*": {"columns": {"*": {"type": True, "comment": True}}}}
+        assert list(get_catalog_projection(["model.dummy.orders"])["sources"]) == ["model.dummy.orders"]
+        assert list(get_catalog_projection(resource_types=["model", "seed"])["nodes"]) == ["model.*", "seed.*"]
+
+    def test_handle_view_errors(self):
+        with pytest.raises(click.FileError) as exc_info, cli_messaging.handle_view_errors():
+            _ = NodeView({"name": 1}, path="catalog.nodes['x']").name
+        assert exc_info.value.filename == "catalog.json"
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import sys
+from unittest import mock
+
+import pytest
+
+from dbterd.core.cache import CACHE_DIR_NAME, ArtifactCache, ParsedArtifacts, get_file_fingerprint
+from dbterd.core.models import Column, Ref, Table
+
+
+class TestArtifactCache:
+    @pytest.fixture
+    def artifacts_dir(self, tmp_path):
+        (tmp_path / "manifest.json").write_text('{"nodes": {}}')
+        (tmp_path / "catalog.json").write_text('{"nodes": {}}')
+        return tmp_path
+
+    @pytest.fixture
+    def parsed(self):
+        return ParsedArtifacts(
+            tables=[
+                Table(
+                    name="orders",
+                    database="db",
+                    schema="sch",
+                    columns=[Column(name="id", data_type="int")],
+                    node_name="model.dummy.orders",
+                    exposures=["dashboard"],
+                )
+            ],
+            relationships=[
+                Ref(
+                    name="test.dummy.relationships",
+                    table_map=["model.dummy.customers", "model.dummy.orders"],
+                    column_map=["id", "customer_id"],
+                )
+            ],
+            generated_at="2024-01-01T00:00:00Z",
+        )
+
+    def get_cache(self, artifacts_dir, **kwargs):
+        options = {"algo": "test_relationship", "resource_type": ["model"], "entity_name_format": "model"}
+        options.update(kwargs)
+        return ArtifactCache(
+            manifest_path=str(artifacts_dir / "manifest.json"),
+            catalog_path=str(artifacts_dir / "catalog.json"),
+            **options,
+        )
+
+    def test_get_file_fingerprint(self, artifacts_dir):
+        fingerprint = get_file_fingerprint(str(artifacts_dir / "manifest.json"))
+        assert fingerprint["size"] == len('{"nodes": {}}')
+        assert fingerprint["sha256"] == hashlib.sha256(b'{"nodes": {}}').hexdigest()
+        assert fingerprint["path"] == str(artifacts_dir / "manifest.json")
+
+    def test_save_and_load(self, artifacts_dir, parsed):
+        cache = self.get_cache(artifacts_dir)
+        assert cache.load() is None
+        cache.save(parsed)
+        assert cache.path.parent == artifacts_dir / CACHE_DIR_NAME
+        loaded = self.get_cache(artifacts_dir, target="mermaid", select=["orders"]).load()
+        assert loaded == parsed
+        assert loaded.tables[0].schema is sys.intern("sch")
+        assert loaded.tables[0].columns[0].data_type is sys.intern("int")
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"algo": "semantic"},
+            {"resource_type": ["model", "source"]},
+            {"entity_name_format": "schema.table"},
+            {"fast_parse": True},
+        ],
+    )
+    def test_key_depends_on_extraction_options(self, artifacts_dir, options):
+        assert self.get_cache(artifacts_dir).key != self.get_cache(artifacts_dir, **options).key
+
+    def test_key_depends_on_artifact_content(self, artifacts_dir):
+        key = self.get_cache(artifacts_dir).key
+        (artifacts_dir / "catalog.json").write_text('{"nodes": {"x": {}}}')
+        assert self.get_cache(artifacts_dir).key != key
+
+    def test_load_corrupted_entry(self, artifacts_dir):
+        cache = self.get_cache(artifacts_dir)
+        cache.cache_dir.mkdir()
+        cache.path.write_text('{"tables": [{"unknown": 1}]}')
+        assert cache.load() is None
+
+    def test_save_prunes_old_entries(self, artifacts_dir, parsed):
+        cache_dir = artifacts_dir / CACHE_DIR_NAME
+        cache_dir.mkdir()
+        for idx in range(10):
+            (cache_dir / f"old{idx}.json").write_text(json.dumps({}))
+        with mock.patch("dbterd.core.cache.CACHE_MAX_ENTRIES", 3):
+            cache = self.get_cache(artifacts_dir)
+            cache.save(parsed)
+        assert len(list(cache_dir.glob("*.json"))) == 3
+        assert cache.path.is_file()
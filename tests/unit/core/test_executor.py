@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 import contextlib
 from pathlib import Path
 from unittest import mock
@@ -6,7 +7,11 @@ import click
 import pytest
 
 from dbterd import default
+from dbterd.adapters.algos.test_relationship import TestRelationshipAlgo
+from dbterd.core.artifact_view import CatalogIndex, ManifestView
+from dbterd.core.cache import ParsedArtifacts
 from dbterd.core.executor import Executor
+from dbterd.helpers import file as file_handlers, json_backend
 from dbterd.plugins.dbt_core.dbt_invocation import DbtInvocation
 
 
@@ -18,14 +23,14 @@ class TestBase:
         mock_evaluate_kwargs.assert_called_once()
         mock_run_metadata_by_strategy.assert_called_once()
 
-    @mock.patch("dbterd.core.executor.DbtCloudMetadata.query_erd_data")
+    @mock.patch("dbterd.plugins.dbt_cloud.discovery.DbtCloudMetadata.query_erd_data")
     @mock.patch("dbterd.core.executor.Executor._save_result")
     def test___run_metadata_by_strategy(self, mock_query_erd_data, mock_save_result, dummy_executor):
         dummy_executor._run_metadata_by_strategy(target="dbml", algo="test_relationship")
         mock_query_erd_data.assert_called_once()
         mock_save_result.assert_called_once()
 
-    @mock.patch("dbterd.core.executor.DbtCloudMetadata.query_erd_data")
+    @mock.patch("dbterd.plugins.dbt_cloud.discovery.DbtCloudMetadata.query_erd_data")
     @mock.patch("dbterd.core.executor.Executor._save_result")
     def test___run_metadata_by_strategy_with_not_implemented_algo(
         self, mock_save_result, mock_query_erd_data, dummy_executor
@@ -41,7 +46,7 @@ class TestBase:
         dummy_executor._save_result(path="irrelevant", data=("file_name", {}))
         mock_open.assert_called_once_with("irrelevant/file_name", "w", encoding="utf-8")
 
-    @mock.patch("dbterd.core.executor.DbtCloudArtifact.get")
+    @mock.patch("dbterd.plugins.dbt_cloud.administrative.DbtCloudArtifact.get")
     @mock.patch("dbterd.core.executor.Executor._read_manifest")
     @mock.patch("dbterd.core.executor.Executor._read_catalog")
     @mock.patch("dbterd.core.executor.Executor._save_result")
@@ -107,15 +112,252 @@ class TestBase:
             mock_default_catalog_version.assert_called_once_with(artifacts_dir=Path.cwd())
         else:
             assert mock_default_catalog_version.call_count == 0
-        mock_read_catalog.assert_called_once_with(path=Path.cwd(), version=expected_version, enable_compat_patch=False)
+        mock_read_catalog.assert_called_once_with(
+            path=Path.cwd(), version=expected_version, enable_compat_patch=False, data=None
+        )
 
-    @mock.patch("dbterd.core.executor.DbtInvocation.get_selection", return_value="dummy")
+    def test___read_manifest_fast_parse(self, dummy_executor):
+        with contextlib.ExitStack() as stack:
+            mock_read_manifest = stack.enter_context(mock.patch("dbterd.helpers.file.read_manifest"))
+            mock_read_manifest_view = stack.enter_context(
+                mock.patch("dbterd.helpers.file.read_manifest_view", return_value={})
+            )
+            mock_check_existence = stack.enter_context(mock.patch("dbterd.helpers.cli_messaging.check_existence"))
+            mock_default_manifest_version = stack.enter_context(mock.patch("dbterd.default.default_manifest_version"))
+            assert dummy_executor._read_manifest(mp=Path.cwd(), fast_parse=True) == {}
+        mock_check_existence.assert_called_once_with(Path.cwd(), "manifest.json")
+        mock_read_manifest_view.assert_called_once_with(path=Path.cwd())
+        assert mock_read_manifest.call_count == 0
+        assert mock_default_manifest_version.call_count == 0
+
+    def test___read_manifest_stream_parse(self, dummy_executor):
+        with contextlib.ExitStack() as stack:
+            mock_read_manifest_view = stack.enter_context(mock.patch("dbterd.helpers.file.read_manifest_view"))
+            mock_read_manifest_stream = stack.enter_context(
+                mock.patch("dbterd.helpers.file.read_manifest_stream", return_value={})
+            )
+            mock_check_existence = stack.enter_context(mock.patch("dbterd.helpers.cli_messaging.check_existence"))
+            assert dummy_executor._read_manifest(mp=Path.cwd(), fast_parse=True, stream_parse=True) == {}
+        mock_check_existence.assert_called_once_with(Path.cwd(), "manifest.json")
+        mock_read_manifest_stream.assert_called_once_with(path=Path.cwd())
+        assert mock_read_manifest_view.call_count == 0
+
+    @pytest.mark.parametrize("fast_parse, stream_parse", [(True, False), (False, True), (True, True)])
+    def test___read_catalog_fast_parse(self, fast_parse, stream_parse, dummy_executor):
+        with contextlib.ExitStack() as stack:
+            mock_read_catalog = stack.enter_context(mock.patch("dbterd.helpers.file.read_catalog"))
+            mock_read_catalog_index = stack.enter_context(
+                mock.patch("dbterd.helpers.file.read_catalog_index", return_value={})
+            )
+            mock_check_existence = stack.enter_context(mock.patch("dbterd.helpers.cli_messaging.check_existence"))
+            assert (
+                dummy_executor._read_catalog(
+                    cp=Path.cwd(), fast_parse=fast_parse, stream_parse=stream_parse, unique_ids={"model.x.y"}
+                )
+                == {}
+            )
+        mock_check_existence.assert_called_once_with(Path.cwd(), "catalog.json")
+        mock_read_catalog_index.assert_called_once_with(
+            path=Path.cwd(), data=None, unique_ids={"model.x.y"}, stream=stream_parse
+        )
+        assert mock_read_catalog.call_count == 0
+
+    @pytest.mark.parametrize(
+        "resource_type, expected",
+        [
+            (None, None),
+            ([], None),
+            (["model"], {"model.x.a"}),
+            (["model", "source"], {"model.x.a", "source.x.s.c"}),
+        ],
+    )
+    def test___get_catalog_unique_ids(self, resource_type, expected, dummy_executor):
+        manifest = ManifestView(
+            {
+                "nodes": {"model.x.a": {}, "seed.x.b": {}, "test.x.t": {}},
+                "sources": {"source.x.s.c": {}},
+            },
+            path="manifest",
+        )
+        assert dummy_executor._get_catalog_unique_ids(manifest, resource_type=resource_type) == expected
+
+    @pytest.mark.parametrize(
+        "read_concurrency, cpu_count, file_size, expected",
+        [
+            (None, 4, 64 * 1024 * 1024, False),
+            ("off", 4, 64 * 1024 * 1024, False),
+            ("on", 1, 1024, True),
+            ("auto", 4, 64 * 1024 * 1024, True),
+            ("auto", 4, 1024, False),
+            ("auto", 1, 64 * 1024 * 1024, False),
+        ],
+    )
+    def test___use_read_concurrency(self, read_concurrency, cpu_count, file_size, expected, dummy_executor):
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch("os.cpu_count", return_value=cpu_count))
+            stack.enter_context(mock.patch("os.path.isfile", return_value=True))
+            stack.enter_context(mock.patch("os.path.getsize", return_value=file_size))
+            assert (
+                dummy_executor._use_read_concurrency(artifacts_dir="/path", read_concurrency=read_concurrency)
+                is expected
+            )
+
+    @pytest.mark.parametrize(
+        "artifacts_dir, has_data",
+        [(str(Path(__file__).parents[3] / "samples" / "jaffle-shop"), True), ("/path/not/found", False)],
+    )
+    def test___read_artifacts_concurrently(self, artifacts_dir, has_data, dummy_executor):
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch("dbterd.core.executor.Executor._read_manifest", return_value="manifest"))
+            mock_read_catalog = stack.enter_context(
+                mock.patch("dbterd.core.executor.Executor._read_catalog", return_value="catalog")
+            )
+            assert dummy_executor._read_artifacts(artifacts_dir=artifacts_dir, read_concurrency="on") == (
+                "manifest",
+                "catalog",
+            )
+        data = mock_read_catalog.call_args.kwargs["data"]
+        if has_data:
+            assert data["metadata"]["dbt_schema_version"].endswith(".json")
+        else:
+            assert data is None
+
+    @pytest.mark.parametrize("parse_mode", ["fast_parse", "stream_parse"])
+    def test___read_artifacts_concurrently_indexes_the_catalog(self, parse_mode, dummy_executor):
+        artifacts_dir = str(Path(__file__).parents[3] / "samples" / "jaffle-shop")
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch("dbterd.core.executor.Executor._read_manifest", return_value="manifest"))
+            mock_read_catalog = stack.enter_context(mock.patch("dbterd.core.executor.Executor._read_catalog"))
+            manifest, catalog = dummy_executor._read_artifacts(
+                artifacts_dir=artifacts_dir, read_concurrency="on", **{parse_mode: True}
+            )
+        assert manifest == "manifest"
+        assert isinstance(catalog, CatalogIndex)
+        assert catalog.nodes == file_handlers.read_catalog_index(path=artifacts_dir).nodes
+        assert mock_read_catalog.call_count == 0
+
+    @pytest.mark.parametrize("parse_mode", ["fast_parse", "stream_parse"])
+    def test___read_artifacts_concurrently_follows_the_resource_types(self, parse_mode, dummy_executor):
+        artifacts_dir = str(Path(__file__).parents[3] / "samples" / "jaffle-shop")
+        kwargs = {"artifacts_dir": artifacts_dir, "resource_type": ["source"], parse_mode: True}
+        _, expected = dummy_executor._read_artifacts(**kwargs)
+        with mock.patch("dbterd.core.executor.ProcessPoolExecutor", ThreadPoolExecutor):
+            _, catalog = dummy_executor._read_artifacts(read_concurrency="on", **kwargs)
+        assert catalog.nodes == expected.nodes == {}
+        assert catalog.sources == expected.sources
+        assert catalog.sources
+
+    def test___read_artifacts_concurrently_streams_the_catalog(self, dummy_executor):
+        artifacts_dir = str(Path(__file__).parents[3] / "samples" / "jaffle-shop")
+        with contextlib.ExitStack() as stack:
+            # Run the worker in this process so that the full decoding can be detected
+            stack.enter_context(mock.patch("dbterd.core.executor.ProcessPoolExecutor", ThreadPoolExecutor))
+            stack.enter_context(mock.patch("dbterd.core.executor.Executor._read_manifest", return_value="manifest"))
+            mock_open_json = stack.enter_context(mock.patch("dbterd.helpers.file.open_json"))
+            _, catalog = dummy_executor._read_artifacts(
+                artifacts_dir=artifacts_dir, read_concurrency="on", stream_parse=True
+            )
+        assert isinstance(catalog, CatalogIndex)
+        assert catalog.nodes
+        assert mock_open_json.call_count == 0
+
+    def test___get_artifacts_reuses_the_same_artifacts(self, tmp_path, dummy_executor):
+        for filename in ("manifest.json", "catalog.json"):
+            (tmp_path / filename).write_text("{}")
+        with mock.patch(
+            "dbterd.core.executor.Executor._read_artifacts", side_effect=lambda **kwargs: (object(), object())
+        ) as mock_read_artifacts:
+            manifest, catalog, indexes = dummy_executor._get_artifacts(artifacts_dir=str(tmp_path))
+            assert indexes.manifest is manifest
+            assert dummy_executor._get_artifacts(artifacts_dir=str(tmp_path)) == (manifest, catalog, indexes)
+            assert mock_read_artifacts.call_count == 1
+
+            dummy_executor._get_artifacts(artifacts_dir=str(tmp_path), fast_parse=True)
+            assert mock_read_artifacts.call_count == 2
+
+            (tmp_path / "catalog.json").write_text('{"nodes": {}}')
+            dummy_executor._get_artifacts(artifacts_dir=str(tmp_path), fast_parse=True)
+            assert mock_read_artifacts.call_count == 3
+
+            dummy_executor._get_artifacts(artifacts_dir="/path/not/found")
+            dummy_executor._get_artifacts(artifacts_dir="/path/not/found")
+            assert mock_read_artifacts.call_count == 5
+
+    @pytest.mark.parametrize(
+        "kwargs, node_unique_id",
+        [
+            ({"cache": False, "algo": "test_relationship"}, None),
+            ({"cache": True, "algo": "test_relationship"}, "model.dummy.orders"),
+            ({"cache": True, "algo": "test_relationship", "artifacts_dir": "/path/not/found"}, None),
+        ],
+    )
+    def test___get_artifact_cache_skipped(self, kwargs, node_unique_id, dummy_executor):
+        assert dummy_executor._get_artifact_cache(node_unique_id=node_unique_id, **kwargs) is None
+
+    def test___get_artifact_cache_follows_the_algo_support(self, dummy_executor):
+        class ExtendedAlgo(TestRelationshipAlgo):
+            def extract_artifacts(self, manifest, catalog, **kwargs):
+                return super().extract_artifacts(manifest=manifest, catalog=catalog, **kwargs)
+
+        class UncachedAlgo(TestRelationshipAlgo):
+            supports_artifact_cache = False
+
+        kwargs = {
+            "cache": True,
+            "algo": "custom",
+            "artifacts_dir": str(Path(__file__).parents[3] / "samples" / "jaffle-shop"),
+        }
+        with mock.patch("dbterd.core.executor.PluginRegistry.get_algo", return_value=ExtendedAlgo):
+            assert dummy_executor._get_artifact_cache(**kwargs) is not None
+        with mock.patch("dbterd.core.executor.PluginRegistry.get_algo", return_value=UncachedAlgo):
+            assert dummy_executor._get_artifact_cache(**kwargs) is None
+
+    def test___run_by_strategy_with_cache_hit(self, dummy_executor):
+        parsed = ParsedArtifacts(tables=["t"], relationships=["r"], generated_at="2024-01-01 00:00:00+00:00")
+        mock_cache = mock.Mock()
+        mock_cache.load.return_value = parsed
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                mock.patch("dbterd.core.executor.Executor._get_artifact_cache", return_value=mock_cache)
+            )
+            mock_read_manifest = stack.enter_context(mock.patch("dbterd.core.executor.Executor._read_manifest"))
+            mock_load_algo = stack.enter_context(mock.patch("dbterd.core.executor.Executor.load_algo"))
+            mock_load_algo.return_value.select_parsed.return_value = (["t"], ["r"])
+            mock_load_target = stack.enter_context(mock.patch("dbterd.core.executor.Executor.load_target"))
+            mock_load_target.return_value.run.return_value = ("file", "content")
+            assert dummy_executor._run_by_strategy(algo="test_relationship", target="dbml", api=True) == "content"
+        assert mock_read_manifest.call_count == 0
+        mock_load_algo.return_value.select_parsed.assert_called_once_with(
+            tables=["t"], relationships=["r"], algo="test_relationship", target="dbml", api=True
+        )
+        manifest = mock_load_target.return_value.run.call_args.kwargs["manifest"]
+        assert str(manifest.metadata.generated_at) == "2024-01-01 00:00:00+00:00"
+
+    def test___run_by_strategy_with_cache_miss(self, dummy_executor):
+        mock_cache = mock.Mock()
+        mock_cache.load.return_value = None
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                mock.patch("dbterd.core.executor.Executor._get_artifact_cache", return_value=mock_cache)
+            )
+            stack.enter_context(mock.patch("dbterd.core.executor.Executor._read_manifest", return_value=None))
+            stack.enter_context(mock.patch("dbterd.core.executor.Executor._read_catalog"))
+            mock_load_algo = stack.enter_context(mock.patch("dbterd.core.executor.Executor.load_algo"))
+            mock_load_algo.return_value.extract_artifacts.return_value = (["t"], ["r"])
+            mock_load_algo.return_value.select_parsed.return_value = (["t"], ["r"])
+            mock_load_target = stack.enter_context(mock.patch("dbterd.core.executor.Executor.load_target"))
+            mock_load_target.return_value.run.return_value = ("file", "content")
+            assert dummy_executor._run_by_strategy(algo="test_relationship", target="dbml", api=True) == "content"
+        mock_cache.save.assert_called_once_with(ParsedArtifacts(tables=["t"], relationships=["r"], generated_at=None))
+        assert mock_load_algo.return_value.parse.call_count == 0
+
+    @mock.patch("dbterd.plugins.dbt_core.dbt_invocation.DbtInvocation.get_selection", return_value="dummy")
     def test__get_selection(self, mock_dbt_invocation, dummy_executor):
         dummy_executor.dbt = DbtInvocation()
         assert dummy_executor._get_selection(select_rules=[], exclude_rules=[]) == "dummy"
         mock_dbt_invocation.assert_called_once()
 
-    @mock.patch("dbterd.core.executor.DbtInvocation.get_selection", return_value="dummy")
+    @mock.patch("dbterd.plugins.dbt_core.dbt_invocation.DbtInvocation.get_selection", return_value="dummy")
     def test__get_selection__error(self, mock_dbt_invocation, dummy_executor):
         with pytest.raises(click.UsageError):
             dummy_executor._get_selection()
@@ -191,7 +433,7 @@ class TestBase:
     @mock.patch("dbterd.core.executor.Executor._check_if_any_unsupported_selection")
     @mock.patch("dbterd.core.executor.Executor._get_dir")
     @mock.patch("dbterd.core.executor.Executor._get_selection")
-    @mock.patch("dbterd.core.executor.DbtInvocation.get_artifacts_for_erd")
+    @mock.patch("dbterd.plugins.dbt_core.dbt_invocation.DbtInvocation.get_artifacts_for_erd")
     def test_evaluate_kwargs(
         self,
         mock_get_artifacts_for_erd,
@@ -217,14 +459,39 @@ class TestBase:
         else:
             assert mock_get_artifacts_for_erd.called_count == 0
 
+    @mock.patch("dbterd.core.executor.Executor._get_dir", return_value=("/path/ad", "/path/dpd"))
+    def test_evaluate_kwargs_json_backend(self, mock_get_dir, dummy_executor):
+        with mock.patch("dbterd.helpers.json_backend._current", None):
+            dummy_executor.evaluate_kwargs(select=[], exclude=[], json_backend="json")
+            assert json_backend.get_backend().name == "json"
+
+            with (
+                mock.patch.dict("dbterd.helpers.json_backend._BACKENDS", {}, clear=True),
+                pytest.raises(click.UsageError, match="is not installed"),
+            ):
+                dummy_executor.evaluate_kwargs(select=[], exclude=[], json_backend="orjson")
+
+    @mock.patch("dbterd.core.executor.Executor._get_dir", return_value=("/path/ad", "/path/dpd"))
+    def test_evaluate_kwargs_algo_rule(self, mock_get_dir, dummy_executor):
+        dummy_executor.evaluate_kwargs(select=[], exclude=[], algo="test_relationship:(name:foreign_key)")
+        assert dummy_executor.algo_adapters["test_relationship:(name:foreign_key)"].rule.name == "foreign_key"
+
+        with pytest.raises(click.UsageError, match="Invalid algo rule"):
+            dummy_executor.evaluate_kwargs(select=[], exclude=[], algo="test_relationship:(name:)")
+
     @pytest.mark.parametrize(
         "kwargs, mock_isfile_se, expected",
         [
             (
                 {"artifacts_dir": Path.cwd(), "dbt_project_dir": Path.cwd()},
-                [False],
+                [False, False, False],
                 (str(f"{Path.cwd()}/target"), str(Path.cwd())),
             ),
+            (
+                {"artifacts_dir": Path.cwd(), "dbt_project_dir": Path.cwd()},
+                [False, True],
+                (str(Path.cwd()), str(Path.cwd())),
+            ),
             (
                 {"artifacts_dir": Path.cwd(), "dbt_project_dir": Path.cwd()},
                 [True],
@@ -268,6 +535,21 @@ class TestBase:
             **{"algo": "test_relationship"},
         ) == {"algo": "test_relationship", "select": ["irr"], "exclude": []}
         assert mock_find_related_nodes_by_id.call_count == 1
+        assert mock_find_related_nodes_by_id.call_args.kwargs["depth"] == 1
+
+        assert dummy_executor._set_single_node_selection(
+            manifest="irrelevant",
+            node_unique_id="irrelevant",
+            **{"algo": "test_relationship", "select_neighbors": 3},
+        ) == {"algo": "test_relationship", "select": ["irr"], "exclude": []}
+        assert mock_find_related_nodes_by_id.call_args.kwargs["depth"] == 3
+
+        dummy_executor._set_single_node_selection(
+            manifest="irrelevant",
+            node_unique_id="irrelevant",
+            **{"algo": "test_relationship", "select_neighbors": None},
+        )
+        assert mock_find_related_nodes_by_id.call_args.kwargs["depth"] is None
 
     @mock.patch("dbterd.core.executor.Executor.load_algo")
     @mock.patch("dbterd.core.executor.Executor.load_target")
@@ -286,7 +568,7 @@ class TestBase:
         mock_parent = mock.Mock()
 
         # Mock the algo adapter
-        mock_algo_adapter = mock.Mock()
+        mock_algo_adapter = mock.MagicMock()
         mock_algo_adapter.parse.return_value = ([], [])
         mock_load_algo.return_value = mock_algo_adapter
         mock_parent.attach_mock(mock_load_algo, "mock_load_algo")
@@ -308,16 +590,27 @@ class TestBase:
             "i": "irr"
         }
         assert mock_parent.mock_calls == [
-            mock.call.mock_read_manifest(mp=None, mv=None, bypass_validation=None),
-            mock.call.mock_read_catalog(cp=None, cv=None, bypass_validation=None),
-            mock.call.mock_set_single_node_selection(
-                manifest={}, node_unique_id="irr", algo="test_relationship", target="dbml"
+            mock.call.mock_read_manifest(mp=None, mv=None, bypass_validation=None, fast_parse=None, stream_parse=None),
+            mock.call.mock_read_catalog(
+                cp=None,
+                cv=None,
+                bypass_validation=None,
+                fast_parse=None,
+                stream_parse=None,
+                data=None,
+                unique_ids=None,
             ),
             mock.call.mock_load_algo(name="test_relationship"),
             mock.call.mock_load_target(name="dbml"),
+            mock.call.mock_load_algo().use_manifest_indexes(mock.ANY),
+            mock.call.mock_load_algo().use_manifest_indexes().__enter__(),
+            mock.call.mock_set_single_node_selection(
+                manifest={}, node_unique_id="irr", algo="test_relationship", target="dbml"
+            ),
             mock.call.mock_load_algo().parse(
                 manifest={}, catalog={}, api=True, algo="test_relationship", target="dbml"
             ),
+            mock.call.mock_load_algo().use_manifest_indexes().__exit__(None, None, None),
             mock.call.mock_load_target().run(
                 tables=[], relationships=[], manifest={}, api=True, algo="test_relationship", target="dbml"
             ),
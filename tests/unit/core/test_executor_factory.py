@@ -1,7 +1,7 @@
 import click
 import pytest
 
-from dbterd.adapters.algos.test_relationship import TestRelationshipAlgo
+from dbterd.adapters.algos.test_relationship import AlgoRule, TestRelationshipAlgo
 from dbterd.adapters.targets.dbml import DbmlAdapter
 from dbterd.core.executor import Executor
 
@@ -30,5 +30,12 @@ class TestFactory:
         assert isinstance(adapter, TestRelationshipAlgo)
 
     def test_load_algo_with_rule_suffix(self, executor):
-        adapter = executor.load_algo(name="test_relationship:relationships_table")
+        adapter = executor.load_algo(name="test_relationship:(name:foreign_key|c_to:pk_column_name)")
         assert isinstance(adapter, TestRelationshipAlgo)
+        assert adapter.rule == AlgoRule(name="foreign_key", c_to="pk_column_name")
+        assert executor.load_algo(name="test_relationship:(name:foreign_key|c_to:pk_column_name)") is adapter
+
+    def test_load_algo_with_malformed_rule(self, executor):
+        with pytest.raises(click.UsageError) as exc_info:
+            executor.load_algo(name="test_relationship:relationships_table")
+        assert "Invalid algo rule [test_relationship:relationships_table]" in str(exc_info.value)
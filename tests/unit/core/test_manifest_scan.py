@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from dbterd.adapters.algos.semantic import SemanticAlgo
+from dbterd.core.manifest_scan import ManifestIndexes, ManifestScan
+
+
+def get_manifest(**mappings) -> SimpleNamespace:
+    return SimpleNamespace(**{name: dict.fromkeys(unique_ids) for name, unique_ids in mappings.items()})
+
+
+class TestManifestScan:
+    def test_classifies_the_node_ids_in_the_manifest_order(self):
+        manifest = get_manifest(
+            nodes=[
+                "seed.pkg.s1",
+                "test.pkg.relationships_t1",
+                "model.pkg.m1",
+                "analysis.pkg.a1",
+                "snapshot.pkg.sn1",
+                "operation.pkg.o1",
+                "test.pkg.not_null_t1",
+                "model.pkg.m2",
+            ],
+            sources=["source.pkg.src.t1", "source.pkg.src.t2"],
+            exposures=["exposure.pkg.e1"],
+            semantic_models=["semantic_model.pkg.sm1"],
+        )
+
+        scan = ManifestScan(manifest=manifest)
+
+        assert scan.manifest is manifest
+        assert scan.tables == ["seed.pkg.s1", "model.pkg.m1", "snapshot.pkg.sn1", "model.pkg.m2"]
+        assert scan.tests == ["test.pkg.relationships_t1", "test.pkg.not_null_t1"]
+        assert scan.sources == ["source.pkg.src.t1", "source.pkg.src.t2"]
+        assert scan.exposures == ["exposure.pkg.e1"]
+        assert scan.semantic_models == ["semantic_model.pkg.sm1"]
+
+    def test_missing_mappings(self):
+        scan = ManifestScan(manifest=SimpleNamespace())
+
+        assert scan.tables == []
+        assert scan.tests == []
+        assert scan.sources == []
+        assert scan.exposures == []
+        assert scan.semantic_models is None
+
+    def test_get_manifest_scan_is_kept_in_the_manifest_indexes(self):
+        algo = SemanticAlgo()
+        manifest = get_manifest(nodes=["model.pkg.m1"], semantic_models=[])
+
+        with algo.use_manifest_indexes(ManifestIndexes(manifest=manifest)):
+            scan = algo.get_manifest_scan(manifest=manifest)
+
+            assert algo.get_semantic_nodes(manifest=manifest) == []
+            assert algo.get_manifest_scan(manifest=manifest) is scan
+            assert algo.get_manifest_scan(manifest=get_manifest(nodes=[])) is not scan
+            with algo.use_manifest_indexes(ManifestIndexes(manifest=manifest)):
+                assert algo.get_manifest_scan(manifest=manifest) is scan
+
+        assert algo.get_manifest_scan(manifest=manifest) is not scan
+
+
+class TestManifestIndexes:
+    def test_builds_each_index_once(self):
+        indexes = ManifestIndexes(manifest=get_manifest())
+        build = mock.Mock(side_effect=object)
+
+        index = indexes.get("index", build)
+
+        assert indexes.get("index", build) is index
+        assert indexes.get("other", build) is not index
+        assert build.call_count == 2
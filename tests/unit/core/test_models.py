@@ -0,0 +1,114 @@
+import copy
+import pickle
+import sys
+from unittest import mock
+
+import pytest
+
+from dbterd.core.models import Column, ColumnIndex, LazyValue, Ref, RelationshipGraph, Table
+
+
+class TestColumnIndex:
+    def test_lookup_is_case_insensitive_and_first_wins(self):
+        columns = [Column(name="ID"), Column(name="name"), Column(name="id")]
+        index = ColumnIndex(columns)
+        assert "id" in index
+        assert "Name" in index
+        assert "other" not in index
+        assert index.get("Id") is columns[0]
+        assert index.get("other") is None
+        assert index.position("NAME") == 1
+        assert index.position("other") is None
+        assert index.positions() == {"id": 0, "name": 1}
+
+    def test_append_keeps_the_column_order(self):
+        columns = [Column(name="id")]
+        index = ColumnIndex(columns)
+        added = index.append(Column(name="Customer_ID"))
+        index.append(Column(name="ID"))
+
+        assert index.columns is columns
+        assert [x.name for x in columns] == ["id", "Customer_ID", "ID"]
+        assert len(index) == 3
+        assert index.get("customer_id") is added
+        assert index.positions() == {"id": 0, "customer_id": 1}
+
+    def test_empty(self):
+        index = ColumnIndex()
+        assert index.columns == []
+        assert len(index) == 0
+        assert index.positions() == {}
+
+
+class TestRelationshipGraph:
+    def test_get_neighborhood(self):
+        graph = RelationshipGraph()
+        graph.link("a", "b")
+        graph.link("b", "c")
+        graph.link("c", "d")
+        graph.link("x", "y")
+
+        assert graph.get_neighborhood(["b"], depth=0) == ["b"]
+        assert graph.get_neighborhood(["b"]) == ["b", "a", "c"]
+        assert graph.get_neighborhood(["b"], depth=2) == ["b", "a", "c", "d"]
+        assert graph.get_neighborhood(["a"], depth=None) == ["a", "b", "c", "d"]
+        assert graph.get_neighborhood(["a", "y"], depth=1) == ["a", "y", "b", "x"]
+        assert graph.get_neighborhood(["other"], depth=None) == ["other"]
+
+    def test_link(self):
+        graph = RelationshipGraph()
+        graph.link("a", "b", "c")
+        graph.link("a", "b")
+        graph.link("a", "a")
+
+        assert len(graph) == 3
+        assert "a" in graph
+        assert "other" not in graph
+        assert graph.neighbors("a") == ["b", "c"]
+        assert graph.neighbors("c") == ["a", "b"]
+        assert graph.neighbors("other") == []
+
+    def test_from_relationships(self):
+        relationships = [
+            Ref(name="r1", table_map=("a", "b"), column_map=("id", "id")),
+            Ref(name="r2", table_map=("c", "b"), column_map=("id", "id")),
+        ]
+        assert RelationshipGraph.from_relationships(relationships).neighbors("b") == ["a", "c"]
+
+        graph = RelationshipGraph.from_relationships(relationships, nodes={"a", "b"})
+        assert graph.neighbors("b") == ["a"]
+        assert "c" not in graph
+
+
+class TestTable:
+    def test_lazy_raw_sql(self):
+        resolve = mock.Mock(return_value="select 1")
+        table = Table(name="t", database="db", schema="sch", raw_sql=LazyValue(resolve))
+        copied = table.replace(columns=[Column(name="id")])
+        assert resolve.call_count == 0
+
+        assert table.raw_sql == "select 1"
+        assert table.raw_sql == "select 1"
+        assert resolve.call_count == 1
+
+        assert copied.columns == [Column(name="id")]
+        assert copied.raw_sql == "select 1"
+        assert resolve.call_count == 2
+
+    def test_lazy_raw_sql_in_copies(self):
+        table = Table(name="t", database="db", schema="sch", raw_sql=LazyValue(lambda: "select 1"))
+        copies = [copy.copy(table), copy.deepcopy(table), pickle.loads(pickle.dumps(table))]
+        assert not hasattr(table, "_lazy_raw_sql")
+        assert all(x.raw_sql == "select 1" and not hasattr(x, "_lazy_raw_sql") for x in copies)
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots require Python 3.10+")
+    def test_slots(self):
+        table = Table(name="t", database="db", schema="sch", raw_sql=LazyValue(lambda: "select 1"))
+        assert not hasattr(table, "__dict__")
+        with pytest.raises(AttributeError, match="'Table' object has no attribute 'unknown'"):
+            _ = table.unknown
+
+    def test_lazy_raw_sql_in_comparison(self):
+        table = Table(name="t", database="db", schema="sch", raw_sql=LazyValue(lambda: "select 1"))
+        assert table == Table(name="t", database="db", schema="sch", raw_sql="select 1")
+        assert Table(name="t", database="db", schema="sch").raw_sql is None
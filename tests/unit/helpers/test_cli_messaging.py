@@ -18,6 +18,15 @@ class TestCliMessaging:
         with pytest.raises(click.FileError):
             cli_messaging.check_existence(path_str=str(Path.cwd()), filename="dummy")
 
+    def test_check_existence_compressed_file(self, tmp_path):
+        (tmp_path / "manifest.json.gz").write_bytes(b"")
+        cli_messaging.check_existence(path_str=str(tmp_path), filename="manifest.json")
+
+    def test_handle_read_errors_compressed_file(self, tmp_path):
+        (tmp_path / "manifest.json.gz").write_bytes(b"not gzip")
+        with pytest.raises(click.FileError), cli_messaging.handle_read_errors("manifest.json"):
+            file.open_json(f"{tmp_path}/manifest.json.gz")
+
     @mock.patch("dbterd.helpers.file.open_json")
     def test_handle_read_errors(self, mock_file_open_json):
         mock_file_open_json.return_value = "not json"
@@ -1,9 +1,24 @@
 import contextlib
+import gzip
+from pathlib import Path
 from unittest import mock
 
 import pytest
 
-from dbterd.helpers import file
+from dbterd.helpers import file, json_backend
+
+
+def write_artifact(path: Path, content: bytes, frames: int = 1) -> None:
+    """Write an artifact file, compressed according to its suffix, in several zstd frames if asked."""
+    if path.suffix == ".gz":
+        path.write_bytes(gzip.compress(content))
+    elif path.suffix == ".zst":
+        zstandard = pytest.importorskip("zstandard")
+        size = -(-len(content) // frames)
+        compressor = zstandard.ZstdCompressor()
+        path.write_bytes(b"".join(compressor.compress(content[x : x + size]) for x in range(0, len(content), size)))
+    else:
+        path.write_bytes(content)
 
 
 class TestFile:
@@ -38,6 +53,55 @@ class TestFile:
             assert file.load_file_contents(path="path/to/open", strip=False) == "data with trailing space "
             mock_file.assert_called_with("path/to/open", "rb")
 
+    @pytest.mark.parametrize("content", ['{"data": "dümmy"}\n', ""])
+    def test_load_file_contents_memory_map(self, tmp_path, content):
+        path = tmp_path / "manifest.json"
+        path.write_text(content, encoding="utf-8")
+        assert file.load_file_contents(path=str(path), strip=False, memory_map=True) == content
+
+    @mock.patch("dbterd.helpers.json_backend._current", json_backend.resolve_backend("json"))
+    def test_open_json_memory_map(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(' {"data": "dümmy"}\n', encoding="utf-8")
+        with mock.patch("dbterd.helpers.file.read_mapped_text", wraps=file.read_mapped_text) as mock_read_mapped_text:
+            assert file.open_json(str(path)) == {"data": "dümmy"}
+        mock_read_mapped_text.assert_called_once()
+
+    @pytest.mark.parametrize("backend", json_backend.get_available_backends())
+    @pytest.mark.parametrize("suffix", ["", ".gz", ".zst"])
+    def test_open_json_backend(self, tmp_path, backend, suffix):
+        content = ' {"data": ["dümmy", 1, 1.5, null, true]}\n'
+        path = tmp_path / f"manifest.json{suffix}"
+        write_artifact(path, content.encode("utf-8"))
+        with mock.patch("dbterd.helpers.json_backend._current", json_backend.resolve_backend(backend)):
+            assert file.open_json(str(path)) == {"data": ["dümmy", 1, 1.5, None, True]}
+
+    def test_sniff_artifact_version(self, tmp_path):
+        artifact_path = tmp_path / "manifest.json"
+        artifact_path.write_text(
+            '{"metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json"}, "nodes": {'
+        )
+        assert file.sniff_artifact_version(str(artifact_path)) == "12"
+
+    def test_sniff_artifact_version_outside_head(self, tmp_path):
+        artifact_path = tmp_path / "manifest.json"
+        artifact_path.write_text(
+            '{"nodes": {}, "metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json"}}'
+        )
+        assert file.sniff_artifact_version(str(artifact_path), size=16) is None
+
+    @pytest.mark.parametrize(
+        "artifact, expected",
+        [
+            ({"metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v11.json"}}, 11),
+            ({"metadata": {}}, None),
+            ({}, None),
+        ],
+    )
+    def test_get_artifact_version(self, artifact, expected):
+        assert file.get_artifact_version(artifact) == expected
+
+    @mock.patch("dbterd.helpers.json_backend._current", json_backend.resolve_backend("json"))
     @mock.patch("dbterd.helpers.file.load_file_contents")
     def test_open_json(self, mock_load_file_contents):
         json_data = '{"data": "dummy"}'
@@ -73,6 +137,63 @@ class TestFile:
         mock_supports_long_paths.assert_called_once()
         mock_win_prepare_path.assert_called_with(path_250_noprefix)
 
+    @pytest.mark.parametrize(
+        "filenames, expected",
+        [
+            (["manifest.json", "manifest.json.gz"], "manifest.json"),
+            (["manifest.json.zst", "manifest.json.gz"], "manifest.json.gz"),
+            (["manifest.json.zst"], "manifest.json.zst"),
+            (["catalog.json"], None),
+        ],
+    )
+    def test_find_artifact_file(self, tmp_path, filenames, expected):
+        for filename in filenames:
+            (tmp_path / filename).write_text("{}")
+        found = file.find_artifact_file(str(tmp_path), "manifest.json")
+        assert found == (f"{tmp_path}/{expected}" if expected else None)
+        assert file.get_artifact_path(str(tmp_path), "manifest.json") == f"{tmp_path}/{expected or 'manifest.json'}"
+
+    def test_read_compressed_artifact(self, tmp_path):
+        content = (
+            '{"metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json"}, '
+            '"nodes": {"model.x.y": {"name": "y", "raw_code": "select 1"}}}'
+        )
+        with gzip.open(tmp_path / "manifest.json.gz", "wt", encoding="utf-8") as handle:
+            handle.write(content)
+
+        assert file.sniff_artifact_version(f"{tmp_path}/manifest.json.gz") == "12"
+        assert file.open_json(f"{tmp_path}/manifest.json.gz")["nodes"]["model.x.y"]["name"] == "y"
+        assert file.read_manifest_view(path=str(tmp_path)).nodes["model.x.y"].raw_code == "select 1"
+        assert file.read_manifest_stream(path=str(tmp_path))._data["nodes"] == {"model.x.y": {"name": "y"}}
+
+    @pytest.mark.parametrize("backend", json_backend.get_available_backends())
+    def test_read_zstd_artifacts(self, tmp_path, backend):
+        samples = Path(__file__).parents[3] / "samples" / "jaffle-shop"
+        for filename in ("manifest.json", "catalog.json"):
+            write_artifact(tmp_path / f"{filename}.zst", (samples / filename).read_bytes(), frames=2)
+        paths = [str(samples), str(tmp_path)]
+
+        with mock.patch("dbterd.helpers.json_backend._current", json_backend.resolve_backend(backend)):
+            for filename in ("manifest.json", "catalog.json"):
+                plain, compressed = (file.open_json(file.get_artifact_path(x, filename)) for x in paths)
+                assert compressed == plain
+            plain, compressed = (file.read_manifest(path=x) for x in paths)
+            assert compressed == plain
+            plain, compressed = (file.read_catalog(path=x) for x in paths)
+            assert compressed == plain
+            plain, compressed = (file.read_manifest_view(path=x) for x in paths)
+            assert compressed._data == plain._data
+
+        plain, compressed = (file.read_manifest_stream(path=x) for x in paths)
+        assert compressed._data == plain._data
+        for stream in (False, True):
+            plain, compressed = (file.read_catalog_index(path=x, stream=stream, backend=backend) for x in paths)
+            assert (compressed.nodes, compressed.sources) == (plain.nodes, plain.sources)
+
+    def test_open_artifact_zstd_not_installed(self):
+        with mock.patch("dbterd.helpers.file.zstandard", None), pytest.raises(ImportError, match="zstandard"):
+            file.open_artifact("path/to/manifest.json.zst")
+
     @pytest.mark.parametrize("version", [(-1), (1)])
     @mock.patch("dbterd.helpers.file.open_json")
     def test_read_manifest_error(self, mock_open_json, version):
@@ -89,6 +210,70 @@ class TestFile:
             file.read_manifest(path="path/to/manifest", version=12, enable_compat_patch=True)
         mock_patch.assert_called_once_with(artifact="manifest", artifact_version=12)
 
+    @mock.patch("dbterd.helpers.file.parse_artifact")
+    @mock.patch("dbterd.helpers.file.patch_parser_compatibility")
+    @mock.patch("dbterd.helpers.file.open_json")
+    def test_read_manifest_detects_version_from_decoded_dict(self, mock_open_json, mock_patch, mock_parse_artifact):
+        manifest_dict = {"metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json"}}
+        mock_open_json.return_value = manifest_dict
+        file.read_manifest(path="path/to/manifest", enable_compat_patch=True)
+        mock_open_json.assert_called_once_with("path/to/manifest/manifest.json")
+        mock_patch.assert_called_once_with(artifact="manifest", artifact_version=12)
+        mock_parse_artifact.assert_called_once_with(artifact="manifest", data=manifest_dict, version=12)
+
+    @pytest.mark.parametrize("version", [None, 1, 99])
+    def test_parse_artifact(self, version):
+        catalog = file.open_json(str(Path(__file__).parents[3] / "samples" / "jaffle-shop" / "catalog.json"))
+        with mock.patch("dbterd.helpers.file.get_artifact_schema", wraps=file.get_artifact_schema) as mock_get_schema:
+            assert type(file.parse_artifact(artifact="catalog", data=catalog, version=version)).__name__ == "CatalogV1"
+        assert mock_get_schema.call_args == mock.call("catalog", 1)
+
+    @pytest.mark.parametrize(
+        "data, version, message",
+        [
+            ({"metadata": {}}, None, "Not a manifest.json"),
+            ({"metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v99.json"}}, None, "Not a"),
+            ({"metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json"}}, 11, "v11"),
+        ],
+    )
+    def test_parse_artifact_error(self, data, version, message):
+        with pytest.raises(ValueError, match=message):
+            file.parse_artifact(artifact="manifest", data=data, version=version)
+
+    def test_read_manifest_stream(self, tmp_path):
+        (tmp_path / "manifest.json").write_text(
+            '{"metadata": {"dbt_schema_version": "v12", "env": {}}, "macros": {"macro.x": {}}, '
+            '"nodes": {"model.x.y": {"name": "y", "raw_code": "{{ x }}", "compiled_code": "select 1"}, '
+            '"test.x.t": {"name": "t", "compiled_code": "select 2"}, "analysis.x.z": {"name": "z"}}}'
+        )
+        manifest = file.read_manifest_stream(path=str(tmp_path))
+        assert manifest._data == {
+            "metadata": {"dbt_schema_version": "v12"},
+            "nodes": {"model.x.y": {"name": "y", "compiled_code": "select 1"}, "test.x.t": {"name": "t"}},
+        }
+        assert manifest.nodes["model.x.y"].name == "y"
+        assert manifest.nodes["model.x.y"].compiled_code == "select 1"
+        assert not hasattr(manifest.nodes["model.x.y"], "raw_code")
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_read_catalog_index(self, tmp_path, stream):
+        (tmp_path / "catalog.json").write_text(
+            '{"metadata": {"dbt_schema_version": "v1"}, "errors": null, '
+            '"nodes": {"model.x.y": {"metadata": {"type": "VIEW"}, "stats": {}, '
+            '"columns": {"ID": {"type": "INT", "index": 1, "name": "ID", "comment": "Key"}}}, '
+            '"model.x.z": {"columns": {"a": {"type": "TEXT", "comment": null}}}}, "sources": {}}'
+        )
+        catalog = file.read_catalog_index(path=str(tmp_path), stream=stream)
+        assert catalog.nodes == {"model.x.y": [("id", "int", "Key")], "model.x.z": [("a", "text", "")]}
+        assert catalog.sources == {}
+
+        catalog = file.read_catalog_index(path=str(tmp_path), unique_ids={"model.x.z"}, stream=stream)
+        assert catalog.nodes == {"model.x.z": [("a", "text", "")]}
+
+    def test_read_catalog_index_from_data(self):
+        data = {"nodes": {"model.x.y": {"columns": {"ID": {"type": "INT", "comment": None}}}}}
+        assert file.read_catalog_index(path="path/to/catalog", data=data).nodes == {"model.x.y": [("id", "int", "")]}
+
     @pytest.mark.parametrize("version", [(-1), (1)])
     @mock.patch("dbterd.helpers.file.open_json")
     def test_read_catalog_error(self, mock_open_json, version):
@@ -105,6 +290,10 @@ class TestFile:
             file.read_catalog(path="path/to/catalog", version=1, enable_compat_patch=True)
         mock_patch.assert_called_once_with(artifact="catalog", artifact_version=1)
 
+    def test_write_artifact(self, tmp_path):
+        file.write_artifact(data=b'{"nodes": {}}', path=str(tmp_path / "manifest.json"))
+        assert (tmp_path / "manifest.json").read_bytes() == b'{"nodes": {}}'
+
     @mock.patch("builtins.open")
     def test_write_json(self, mock_open):
         file.write_json(data={}, path="path/to/catalog/catalog.json")
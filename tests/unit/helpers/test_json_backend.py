@@ -0,0 +1,41 @@
+import json
+from unittest import mock
+
+import pytest
+
+from dbterd.helpers import json_backend
+
+
+class TestJsonBackend:
+    def test_resolve_backend_auto(self):
+        expected = json_backend.get_available_backends()[0]
+        assert json_backend.resolve_backend("auto").name == expected
+        assert json_backend.resolve_backend(None).name == expected
+        assert json_backend.get_available_backends()[-1] == "json"
+
+    def test_resolve_backend_unknown(self):
+        with pytest.raises(ValueError, match="Unknown JSON backend"):
+            json_backend.resolve_backend("simplejson")
+
+    def test_resolve_backend_not_installed(self):
+        with (
+            mock.patch.dict(json_backend._BACKENDS, {}, clear=True),
+            pytest.raises(ValueError, match="is not installed"),
+        ):
+            json_backend.resolve_backend("orjson")
+
+    def test_use_backend(self):
+        with mock.patch("dbterd.helpers.json_backend._current", None):
+            assert json_backend.use_backend("json").name == "json"
+            assert json_backend.get_backend().name == "json"
+            assert json_backend.loads(b'{"a": 1}') == {"a": 1}
+
+    @pytest.mark.parametrize("backend", json_backend.get_available_backends())
+    @pytest.mark.parametrize("pretty", [False, True])
+    def test_dumps(self, backend, pretty):
+        obj = {"name": "dümmy", "columns": [{"id": 1, "x": 1.5, "note": None, "pk": True}], "notes": []}
+        with mock.patch("dbterd.helpers.json_backend._current", json_backend.resolve_backend(backend)):
+            result = json_backend.dumps(obj, pretty=pretty)
+            assert json_backend.loads(result.encode("utf-8")) == obj
+        assert json.loads(result) == obj
+        assert ("\n  " in result) is pretty
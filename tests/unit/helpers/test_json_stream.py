@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from dbterd.helpers import json_stream
+
+
+DOCUMENT = {
+    "metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json", "env": {"a": "b"}},
+    "nodes": {
+        "model.dummy.orders": {
+            "name": "orders",
+            "compiled_code": 'select "}" as x, \'{[\' as y -- \\" escaped',
+            "columns": {"id": {"name": "id", "data_type": None, "tags": ["pk"]}},
+        },
+        "operation.dummy.hook": {"name": "hook"},
+        "test.dummy.relé": {"name": "relé", "test_metadata": {"kwargs": {"to": "ref('x')"}}},
+    },
+    "macros": {"macro.dummy.m": {"macro_sql": "{% macro m() %}[{}]{% endmacro %}"}},
+    "flag": True,
+    "count": -1.5e3,
+}
+
+
+class TestJsonStream:
+    @pytest.fixture
+    def document_path(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps(DOCUMENT, indent=2, ensure_ascii=False), encoding="utf-8")
+        return str(path)
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, json_stream.STREAM_CHUNK_SIZE])
+    def test_load_projection_keep_all(self, document_path, chunk_size):
+        assert json_stream.load_projection(document_path, spec={"*": True}, chunk_size=chunk_size) == DOCUMENT
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, json_stream.STREAM_CHUNK_SIZE])
+    def test_load_projection(self, document_path, chunk_size):
+        spec = {
+            "metadata": {"dbt_schema_version": True},
+            "nodes": {
+                "model.*": {"name": True, "columns": {"*": {"name": True, "data_type": True}}},
+                "test.*": {"test_metadata": True},
+            },
+            "count": True,
+        }
+        assert json_stream.load_projection(document_path, spec=spec, chunk_size=chunk_size) == {
+            "metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json"},
+            "nodes": {
+                "model.dummy.orders": {"name": "orders", "columns": {"id": {"name": "id", "data_type": None}}},
+                "test.dummy.relé": {"test_metadata": {"kwargs": {"to": "ref('x')"}}},
+            },
+            "count": -1500.0,
+        }
+
+    def test_load_projection_literal_key_before_pattern(self, document_path):
+        spec = {"nodes": {"model.dummy.orders": {"name": True}, "*": False}}
+        assert json_stream.load_projection(document_path, spec=spec) == {
+            "nodes": {"model.dummy.orders": {"name": "orders"}}
+        }
+
+    def test_load_projection_non_object_value(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text('{"nodes": null, "sources": [1, 2]}')
+        spec = {"nodes": {"*": True}, "sources": {"*": True}}
+        assert json_stream.load_projection(str(path), spec=spec) == {"nodes": None, "sources": [1, 2]}
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "",
+            "[1]",
+            '{"a": 1',
+            '{"a" 1}',
+            '{"a": "x}',
+            '{"a": 1} x',
+            '{"a": 1,, "b": 2}',
+            '{"a": {"b": 1}',
+        ],
+    )
+    @pytest.mark.parametrize("spec", [{"*": True}, {}])
+    def test_load_projection_malformed(self, tmp_path, content, spec):
+        path = tmp_path / "manifest.json"
+        path.write_text(content)
+        with pytest.raises(json.JSONDecodeError):
+            json_stream.load_projection(str(path), spec=spec, chunk_size=2)
@@ -11,6 +11,7 @@ class MockResponse:
     def __init__(self, status_code, data=None) -> None:
         self.status_code = status_code
         self.data = data
+        self.content = json.dumps(data).encode("utf-8")
 
     def json(self):
         return self.data
@@ -95,43 +96,48 @@ class TestDbtCloudArtifact:
         dbt_cloud = DbtCloudArtifact(**kwargs)
         assert dbt_cloud.api_endpoint == endpoint
 
-    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_json")
+    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_artifact")
     @mock.patch("dbterd.plugins.dbt_cloud.administrative.requests.get")
-    def test_download_artifact_ok(self, mock_requests_get, mock_write_json, dbt_cloud_artifact):
+    def test_download_artifact_ok(self, mock_requests_get, mock_write_artifact, dbt_cloud_artifact):
         mock_requests_get.return_value = MockResponse(status_code=200, data={})
         assert dbt_cloud_artifact.download_artifact(artifact="manifest", artifacts_dir="/irrelevant/path")
-        mock_write_json.assert_called_once_with(
-            data=json.dumps({}, indent=2),
-            path="/irrelevant/path/manifest.json",
-        )
+        mock_write_artifact.assert_called_once_with(data=b"{}", path="/irrelevant/path/manifest.json")
+
+    @mock.patch("dbterd.plugins.dbt_cloud.administrative.requests.get")
+    def test_download_artifact_writes_the_content_as_is(self, mock_requests_get, dbt_cloud_artifact, tmp_path):
+        response = MockResponse(status_code=200)
+        response.content = b'{"metadata": {"dbt_schema_version": "v12"}, "nodes": {}}'
+        mock_requests_get.return_value = response
+        assert dbt_cloud_artifact.download_artifact(artifact="manifest", artifacts_dir=str(tmp_path))
+        assert (tmp_path / "manifest.json").read_bytes() == response.content
 
-    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_json")
-    def test_download_artifact_bad_parameters(self, mock_write_json, dbt_cloud_artifact):
+    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_artifact")
+    def test_download_artifact_bad_parameters(self, mock_write_artifact, dbt_cloud_artifact):
         with pytest.raises(AttributeError):
             dbt_cloud_artifact.download_artifact(artifact="irrelevant", artifacts_dir="/irrelevant/path")
-        assert mock_write_json.call_count == 0
+        assert mock_write_artifact.call_count == 0
 
-    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_json")
+    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_artifact")
     @mock.patch("dbterd.plugins.dbt_cloud.administrative.requests.get")
-    def test_download_artifact_network_failed(self, mock_requests_get, mock_write_json, dbt_cloud_artifact):
+    def test_download_artifact_network_failed(self, mock_requests_get, mock_write_artifact, dbt_cloud_artifact):
         mock_requests_get.side_effect = requests.exceptions.ConnectionError()
         assert not dbt_cloud_artifact.download_artifact(artifact="manifest", artifacts_dir="/irrelevant/path")
-        assert mock_write_json.call_count == 0
+        assert mock_write_artifact.call_count == 0
 
-    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_json")
+    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_artifact")
     @mock.patch("dbterd.plugins.dbt_cloud.administrative.requests.get")
-    def test_download_artifact_failed_to_save_file(self, mock_requests_get, mock_write_json, dbt_cloud_artifact):
+    def test_download_artifact_failed_to_save_file(self, mock_requests_get, mock_write_artifact, dbt_cloud_artifact):
         mock_requests_get.return_value = MockResponse(status_code=200, data={})
-        mock_write_json.side_effect = OSError("any error")
+        mock_write_artifact.side_effect = OSError("any error")
         assert not dbt_cloud_artifact.download_artifact(artifact="manifest", artifacts_dir="/irrelevant/path")
-        assert mock_write_json.call_count == 1
+        assert mock_write_artifact.call_count == 1
 
-    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_json")
+    @mock.patch("dbterd.plugins.dbt_cloud.administrative.file.write_artifact")
     @mock.patch("dbterd.plugins.dbt_cloud.administrative.requests.get")
-    def test_download_artifact_status_not_ok(self, mock_requests_get, mock_write_json, dbt_cloud_artifact):
+    def test_download_artifact_status_not_ok(self, mock_requests_get, mock_write_artifact, dbt_cloud_artifact):
         mock_requests_get.return_value = MockResponse(status_code=999)
         assert not dbt_cloud_artifact.download_artifact(artifact="manifest", artifacts_dir="/irrelevant/path")
-        assert mock_write_json.call_count == 0
+        assert mock_write_artifact.call_count == 0
 
     @mock.patch("dbterd.plugins.dbt_cloud.administrative.DbtCloudArtifact.download_artifact")
     def test_get(self, mock_download_artifact, dbt_cloud_artifact):
@@ -101,3 +101,13 @@ class TestDefault:
         catalog_path.write_text('{"metadata": {}}')
 
         assert default.default_catalog_version(str(tmp_path)) is None
+
+    def test_default_manifest_version_reads_file_head_only(self, tmp_path, monkeypatch):
+        """Test default_manifest_version does not need the whole manifest to be valid JSON."""
+        monkeypatch.delenv("DBTERD_MANIFEST_VERSION", raising=False)
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(
+            '{"metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v12.json"}, "nodes": {'
+        )
+
+        assert default.default_manifest_version(str(tmp_path)) == "12"
@@ -0,0 +1,49 @@
+"""Tests for the CLI startup cost: the heavy modules are only imported when a command needs them."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+LAZY_MODULES = [
+    "dbt_artifacts_parser",
+    "pydantic",
+    "dbt.cli",
+    "requests",
+    "dbterd.adapters.algos",
+    "dbterd.adapters.targets",
+]
+"""Modules only imported when the parsed artifact version, the invoked command or the selected adapter needs them."""
+
+IMPORT_TIME_BUDGET_US = 1_000_000
+"""Cumulative import time allowed for the CLI entrypoint, in microseconds, checked with `DBTERD_TEST_IMPORT_TIME`."""
+
+
+def run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    """Run Python code in a fresh interpreter."""
+    return subprocess.run([sys.executable, *args, "-c", code], capture_output=True, text=True, check=True)
+
+
+@pytest.fixture(scope="module")
+def imported_modules() -> list[str]:
+    result = run_python("import json, sys; import dbterd.main; print(json.dumps(sorted(sys.modules)))")
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_lazy_imports(imported_modules, module):
+    assert not [x for x in imported_modules if x == module or x.startswith(f"{module}.")]
+
+
+@pytest.mark.skipif(not os.environ.get("DBTERD_TEST_IMPORT_TIME"), reason="Timing depends on the machine")
+def test_import_time_budget():
+    result = run_python("import dbterd.main", "-X", "importtime")
+    times = {}
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1])
+    assert times["dbterd.main"] < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,69 @@
+"""Tests for the memory footprint of the parsed tables, measured with `tracemalloc` on a synthetic catalog."""
+
+import gc
+import json
+import sys
+import tracemalloc
+
+import pytest
+
+from dbterd.adapters.algos.test_relationship import TestRelationshipAlgo
+from dbterd.core.artifact_view import CatalogIndex, ManifestView
+
+
+TABLE_COUNT = 200
+COLUMN_COUNT = 100
+DATA_TYPES = ["integer", "varchar", "timestamp", "boolean", "numeric(38,2)", "date"]
+
+COLUMN_BYTES_BUDGET = 100
+"""Memory allowed per parsed catalog column, in bytes, the Table objects and their lists included."""
+
+
+def get_synthetic_artifacts() -> tuple[dict, dict]:
+    """Build raw manifest & catalog dicts, decoded from JSON as the artifact files would be."""
+    manifest = {"nodes": {}, "sources": {}, "exposures": {}}
+    catalog = {"nodes": {}, "sources": {}}
+    for i in range(TABLE_COUNT):
+        unique_id = f"model.pkg.table_{i}"
+        manifest["nodes"][unique_id] = {
+            "unique_id": unique_id,
+            "database": "Analytics",
+            "schema": "Marts",
+            "identifier": f"table_{i}",
+            "description": "",
+            "meta": {},
+            "columns": {},
+        }
+        catalog["nodes"][unique_id] = {
+            "columns": {
+                f"Column_{j}": {"type": DATA_TYPES[j % len(DATA_TYPES)].upper(), "comment": None}
+                for j in range(COLUMN_COUNT)
+            }
+        }
+    return json.loads(json.dumps(manifest)), json.loads(json.dumps(catalog))
+
+
+@pytest.fixture(scope="module")
+def column_bytes() -> float:
+    manifest_data, catalog_data = get_synthetic_artifacts()
+    manifest = ManifestView(manifest_data, path="manifest")
+    algo = TestRelationshipAlgo()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        catalog = CatalogIndex.from_catalog(catalog_data)
+        tables = algo.get_tables(manifest=manifest, catalog=catalog, entity_name_format="resource.package.model")
+        del catalog
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert sum(len(x.columns) for x in tables) == TABLE_COUNT * COLUMN_COUNT
+    return retained / (TABLE_COUNT * COLUMN_COUNT)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="Parsed objects are only slotted from Python 3.10")
+def test_column_memory_budget(column_bytes):
+    assert column_bytes < COLUMN_BYTES_BUDGET